@@ -1,11 +1,22 @@
+import argparse
 import pandas as pd
-import joblib
+from forest_compile import load_model
+from feature_store import FEATURE_FILE, join_keys, read_feature_table
+from inference_service import CATEGORY_MODELS, predict_with_service
+from instrumentation import current_span, span
+from projection_store import build_projections, write_projections
+from prop_probability import add_probabilities
+from table_schema import parquet_path, read_table, write_table
 
-def generate_projections(data_file, model_file, output_file):
+def generate_projections(data_file, model_file, output_file, category=None, model=None, slate_projections=None):
     print(f"📂 Loading data from: {data_file}")
 
-    # Load data
-    df = pd.read_csv(data_file)
+    # Load data (the feature table holds every category, so keep only this one)
+    if category:
+        df = read_feature_table(data_file)
+        df = df[df["category"] == category].reset_index(drop=True)
+    else:
+        df = read_table(data_file, "features")
     print(f"✅ Data loaded! Shape: {df.shape}")
 
     # Ensure numeric conversion
@@ -16,31 +27,83 @@ def generate_projections(data_file, model_file, output_file):
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce')
 
-    # Load model
-    print(f"📊 Data for prediction: {df.shape}")
-    model = joblib.load(model_file)
-    print(f"✅ Model loaded: {model_file}")
+    # Props that didn't join to the player's stats (or have no line) would reach the model as NaN: report and drop them
+    required = [col for col in ["best_over_odds", "best_under_odds", "best_point", "average"] if col in df.columns]
+    unjoined = df[required].isna().any(axis=1)
+    if unjoined.any():
+        names = sorted(df.loc[unjoined, "player"].astype(str).unique())
+        print(f"⚠️ {unjoined.sum()} props without stats or a line aren't projected: {', '.join(names[:10])}"
+              f"{f' (+{len(names) - 10} more)' if len(names) > 10 else ''}")
+        current_span().count("unjoined_props", int(unjoined.sum()))
+        current_span().note("unjoined_props", names)
+        df = df[~unjoined].reset_index(drop=True)
 
     # Select only numeric columns for prediction
+    print(f"📊 Data for prediction: {df.shape}")
     feature_cols = [col for col in numeric_cols if col in df.columns]
     df_features = df[feature_cols]
 
-    # Ensure feature names match (based on model training)
-    if hasattr(model, "feature_names_in_"):
-        model_features = model.feature_names_in_
-        df_features = df_features[model_features]  # Reorder to match training
+    # Projections already made for the whole slate (multi_model.predict_slate) are looked up by (category, player ID)
+    if slate_projections is not None:
+        projections = slate_projections.reindex(join_keys(df["category"], df["player_id"])).to_numpy()
+        print(f"⚡ Projections from the multi-output model: {category}")
+    else:
+        # Use the warm inference service when it's running (it picks the model's features itself),
+        # unless the caller already holds the model in memory
+        projections = predict_with_service(model_file, df_features) if model is None else None
+        current_span().cache("inference_service", projections is not None)
+
+        if projections is not None:
+            print(f"⚡ Projections from the inference service: {model_file}")
+
+    if projections is None:
+        # Load model
+        if model is None:
+            model = load_model(model_file)
+            print(f"✅ Model loaded: {model_file}")
+
+        # Ensure feature names match (based on model training)
+        if hasattr(model, "feature_names_in_"):
+            model_features = model.feature_names_in_
+            df_features = df_features[model_features]  # Reorder to match training
+
+        projections = model.predict(df_features)
 
     # Generate AI projections
-    df["AI_Projection"] = model.predict(df_features)
+    df["AI_Projection"] = projections
 
     # Calculate AI Edge
     df["AI_Edge"] = df["AI_Projection"] - df["best_point"]
 
+    # Over/under probabilities from simulated games, against the book's and with the EV of each side
+    df = add_probabilities(df)
+
     # Save the updated file
-    df.to_csv(output_file, index=False)
-    print(f"🚀 AI projections saved as: {output_file}")
+    write_table(df, output_file, "projections")
+    current_span().rows(rows_in=len(df) + int(unjoined.sum()), rows_out=len(df))
+    print(f"🚀 AI projections saved as: {parquet_path(output_file)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project every prop on the slate.")
+    parser.add_argument("--multi", action="store_true", help="Use the multi-output model (one predict call for the slate)")
+    args = parser.parse_args()
+
+    # The multi-output model predicts every category of every player at once
+    # (players without a line in every category fall back to the category models)
+    slate_projections = None
+    if args.multi:
+        from multi_model import MULTI_MODEL_FILE, predict_slate
+
+        with span("predict:multi"):
+            slate_projections = predict_slate(load_model(MULTI_MODEL_FILE), read_feature_table(FEATURE_FILE), CATEGORY_MODELS)
+            print(f"✅ Multi-output model loaded: {MULTI_MODEL_FILE}")
+
+    # Run for all three categories
+    for category in ["Rebounds", "Assists", "Points"]:
+        with span(f"predict:{category}"):
+            generate_projections(FEATURE_FILE, f"AI_Model_{category}.pkl", f"AI_Projections_{category}.csv", category,
+                                 slate_projections=slate_projections)
 
-# Run for all three categories
-generate_projections("Merged_Rebounds.csv", "AI_Model_Rebounds.pkl", "AI_Projections_Rebounds.csv")
-generate_projections("Merged_Assists.csv", "AI_Model_Assists.pkl", "AI_Projections_Assists.csv")
-generate_projections("Merged_Points.csv", "AI_Model_Points.pkl", "AI_Projections_Points.csv")
\ No newline at end of file
+    # Refresh the file the app reads
+    with span("projections"):
+        write_projections(build_projections())
\ No newline at end of file
@@ -1,4 +1,7 @@
 import pandas as pd
+from instrumentation import current_span, span
+from player_index import report_unmatched, resolve_ids
+from table_schema import read_table
 
 # List of input files and their corresponding L10 stats files
 files = {
@@ -11,7 +14,7 @@ files = {
 def process_projection(odds_file, l10_file, output_file):
     try:
         # Load the cleaned odds file
-        df_odds = pd.read_csv(odds_file)
+        df_odds = read_table(odds_file, "cleaned_odds")
 
         # Load the L10 file
         df_l10 = pd.read_csv(l10_file)
@@ -24,8 +27,14 @@ def process_projection(odds_file, l10_file, output_file):
         if "average" not in df_l10.columns:
             raise KeyError(f"'average' column not found in {l10_file}")
 
-        # Merge both datasets on player name
-        merged_df = df_odds.merge(df_l10[['player', 'average']], left_on='player', right_on='player', how='left')
+        # Join on the player ID (resolved when the odds were cleaned, here for the L10 names)
+        if "player_id" not in df_odds.columns:
+            df_odds["player_id"] = resolve_ids(df_odds["player"])
+        df_l10["player_id"] = resolve_ids(df_l10["player"])
+        report_unmatched(df_l10["player"], df_l10["player_id"], l10_file)
+
+        df_l10 = df_l10.dropna(subset=["player_id"]).drop_duplicates("player_id").set_index("player_id")
+        merged_df = df_odds.join(df_l10[["average"]], on="player_id")
 
         # Convert average column to numeric
         merged_df["average"] = pd.to_numeric(merged_df["average"], errors="coerce")
@@ -42,9 +51,12 @@ def process_projection(odds_file, l10_file, output_file):
         print(f"✅ Projection file saved as: {output_file}")
 
     except Exception as e:
+        current_span().count("failed_files")
         print(f"❌ Error processing {odds_file}: {e}")
 
-# Loop through all three categories (Rebounds, Assists, Points)
-for odds_file, l10_file in files.items():
-    output_file = f"Projections_{odds_file.split('_')[-1]}"  # Naming output file dynamically
-    process_projection(odds_file, l10_file, output_file)
+if __name__ == "__main__":
+    # Loop through all three categories (Rebounds, Assists, Points)
+    for odds_file, l10_file in files.items():
+        output_file = f"Projections_{odds_file.split('_')[-1]}"  # Naming output file dynamically
+        with span(f"projection:{odds_file.split('_')[-1].split('.')[0]}"):
+            process_projection(odds_file, l10_file, output_file)
@@ -1,14 +1,15 @@
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 import joblib
+from forest_compile import forest_path, save_compiled
+from table_schema import read_table
 
 # Function to train an AI model for projections
 def train_ai_model(input_file, model_file):
     # Load the merged dataset
-    df = pd.read_csv(input_file)
+    df = read_table(input_file, "features")
 
     # Select relevant features
     features = ["average", "best_point", "best_over_odds", "best_under_odds"]
@@ -34,6 +35,7 @@ def train_ai_model(input_file, model_file):
 
     # Save the trained model
     joblib.dump(model, model_file)
+    save_compiled(model, forest_path(model_file))
 
     print(f"✅ Model trained and saved: {model_file}")
 
@@ -1,19 +1,14 @@
 import pandas as pd
-import joblib
+from feature_store import read_feature_table
+from forest_compile import load_model
+from inference_service import predict_with_service
 
-# Load trained AI model
 model_filename = "AI_Projection_Model.pkl"
-try:
-    model = joblib.load(model_filename)
-    print(f"✅ Loaded trained model: {model_filename}")
-except FileNotFoundError:
-    print(f"❌ Error: {model_filename} not found. Train the model first by running aitrain.py.")
-    exit()
 
 # Load today's data
 data_filename = "AI_Model_Data.csv"
 try:
-    df_today = pd.read_csv(data_filename)
+    df_today = read_feature_table(data_filename)
     print(f"✅ Loaded today's data: {data_filename}")
 except FileNotFoundError:
     print(f"❌ Error: {data_filename} not found. Ensure the file is in the directory.")
@@ -32,8 +27,23 @@ df_today[features] = df_today[features].apply(pd.to_numeric, errors="coerce")
 # Drop rows with NaN values
 df_today = df_today.dropna(subset=features)
 
-# Generate AI predictions
-df_today["AI_Projection"] = model.predict(df_today[features])
+# Generate AI predictions (from the warm inference service when it's running)
+projections = predict_with_service(model_filename, df_today[features])
+
+if projections is not None:
+    print(f"⚡ Projections from the inference service: {model_filename}")
+else:
+    # Load trained AI model
+    try:
+        model = load_model(model_filename)
+        print(f"✅ Loaded trained model: {model_filename}")
+    except FileNotFoundError:
+        print(f"❌ Error: {model_filename} not found. Train the model first by running aitrain.py.")
+        exit()
+
+    projections = model.predict(df_today[features])
+
+df_today["AI_Projection"] = projections
 
 # Calculate AI Edge (AI Projection - Vegas Line)
 df_today["AI_Edge"] = df_today["AI_Projection"] - df_today["best_point"]
@@ -1,12 +1,14 @@
 import pandas as pd
+from feature_store import read_feature_table
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
 import joblib  # To save and load the trained model
+from forest_compile import forest_path, save_compiled
 
 # Load AI training data
 try:
-    df = pd.read_csv("AI_Model_Data.csv")
+    df = read_feature_table("AI_Model_Data.csv")
     print("✅ AI_Model_Data.csv successfully loaded!")
 except FileNotFoundError:
     print("❌ Error: AI_Model_Data.csv not found. Make sure the file exists in the directory.")
@@ -46,3 +48,4 @@ print(f"✅ Model Trained! Mean Absolute Error: {mae:.2f}")
 # Save the trained model for future predictions
 joblib.dump(model, "AI_Projection_Model.pkl")
 print("✅ Model saved as AI_Projection_Model.pkl")
+save_compiled(model, forest_path("AI_Projection_Model.pkl"))
@@ -1,5 +1,9 @@
 import streamlit as st
 import pandas as pd
+from instrumentation import span
+from player_search import PlayerSearch
+from projection_store import artifact_version, load_projections
+from ranked_views import THRESHOLDS, RankedViews
 
 # Set page title and layout
 st.set_page_config(page_title="@Solar CTB AI", page_icon="🤖", layout="wide")
@@ -21,31 +25,37 @@ st.markdown(
 page = st.sidebar.radio("Navigation", ["Player Search", "Hot/Cold", "🤖 AI Props"])
 
 # --- Function to Load Data ---
-@st.cache_data
-def load_data():
-    df = pd.concat(
-        [
-            pd.read_csv("AI_Projections_Points.csv"),
-            pd.read_csv("AI_Projections_Rebounds.csv"),
-            pd.read_csv("AI_Projections_Assists.csv"),
-        ],
-        ignore_index=True,
-    )
-
-    # Convert columns to numeric and round to 1 decimal place
-    df["AI_Projection"] = pd.to_numeric(df["AI_Projection"], errors="coerce").round(1)
-    df["best_point"] = pd.to_numeric(df["best_point"], errors="coerce").round(1)
-
-    # Calculate Edge column (AI Projection - Line)
-    df["Edge"] = (df["AI_Projection"] - df["best_point"]).round(1)
-
-    return df
+# One shared, read-only frame for every session, keyed on the artifact's version
+# so a fresh pipeline run shows up on the next rerun without restarting the server
+@st.cache_resource(max_entries=1)
+def load_data(version):
+    with span("app:load_data"):
+        return load_projections()
+
+@st.cache_resource(max_entries=1)
+def load_search(version):
+    with span("app:load_search"):
+        return PlayerSearch(load_data(version)["player"].to_numpy())
+
+@st.cache_resource
+def views_holder():
+    return {}
+
+@st.cache_resource(max_entries=1)
+def load_views(version):
+    # Reuse the previous version's rankings for categories the pipeline didn't change
+    holder = views_holder()
+    with span("app:load_views"):
+        holder["views"] = RankedViews(load_data(version), previous=holder.get("views"))
+    return holder["views"]
 
 # Load the dataset
-df = load_data()
+version = artifact_version()
+df = load_data(version)
+views = load_views(version)
 
 # Define thresholds for Hot/Cold streaks
-thresholds = {"Points": 15, "Rebounds": 4, "Assists": 4}
+thresholds = THRESHOLDS
 
 # --- Function to Display Data with Correct Formatting ---
 def format_dataframe(data):
@@ -60,7 +70,15 @@ if page == "Player Search":
     player_name = st.text_input("Search for a player:", "")
 
     if player_name:
-        results = df[df["player"].str.contains(player_name, case=False, na=False)]
+        matches = load_search(version).search(player_name)
+
+        # Autocomplete: narrow the results to one of the matched players
+        if len(matches) > 1:
+            choice = st.selectbox("Did you mean:", ["All matches"] + matches)
+            if choice != "All matches":
+                matches = [choice]
+
+        results = df.iloc[load_search(version).row_positions(matches)]
 
         if not results.empty:
             st.markdown("### Player Stats")
@@ -77,13 +95,8 @@ if page == "Player Search":
 elif page == "Hot/Cold":
     st.title("Hot & Cold Streaks")
 
-    hot_players = df[
-        (df["AI_Projection"] > df["best_point"]) & (df["best_point"] >= df["category"].map(thresholds))
-    ].nlargest(2, "Edge")
-
-    cold_players = df[
-        (df["AI_Projection"] < df["best_point"]) & (df["best_point"] >= df["category"].map(thresholds))
-    ].nsmallest(2, "Edge")
+    hot_players = df.iloc[views.across("hot", thresholds, k=2)]
+    cold_players = df.iloc[views.across("cold", thresholds, k=2)]
 
     # Display results
     st.subheader("🔥 Hot Players")
@@ -114,7 +127,7 @@ elif page == "🤖 AI Props":
 
     best_picks = []
     for category, threshold in thresholds.items():
-        best_pick = df[(df["category"] == category) & (df["best_point"] >= threshold)].nlargest(1, "Edge")
+        best_pick = df.iloc[views.ranked(category, "top", threshold, k=1)]
         if not best_pick.empty:
             best_picks.append(best_pick)
 
@@ -0,0 +1,170 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+import pandas as pd
+from feature_store import CATEGORY_STATS, ODDS_FILES, GameHistory, build_feature_table
+from instrumentation import current_span, span, traced
+from parlay import american_to_decimal
+
+# One folder per slate (YYYY-MM-DD) holding that day's Cleaned_Best_Odds_<Category>.csv files
+ARCHIVE_DIR = "odds_archive"
+
+# |edge| buckets the results are broken down by
+EDGE_BUCKETS = [0, 0.5, 1, 2, 3, 5, np.inf]
+
+# Model variant compared by default: name -> model file pattern
+DEFAULT_VARIANTS = {"current": "AI_Model_{category}.pkl"}
+
+# Per-process state set up once by _init_worker: the season's games, their history arrays and the models
+_worker = {}
+
+def slate_days(archive_dir=ARCHIVE_DIR, start=None, end=None):
+    """ Archived slate dates (folder names), oldest first. """
+    days = sorted(name for name in os.listdir(archive_dir) if os.path.isdir(os.path.join(archive_dir, name)))
+    return [day for day in days if (not start or day >= start) and (not end or day <= end)]
+
+def _init_worker(cache_file, season, season_type, variants, archive_dir):
+    from forest_compile import load_model
+    from gamelog_cache import GameLogCache
+
+    games = GameLogCache(cache_file).game_table(season, season_type).reset_index(drop=True)
+    _worker["history"] = GameHistory.from_game_table(games)
+    _worker["results"] = {day: rows.set_index("PLAYER_ID") for day, rows in games.groupby("GAME_DATE")}
+    _worker["archive_dir"] = archive_dir
+
+    _worker["models"] = {
+        variant: {
+            category: load_model(pattern.format(category=category))
+            for category in CATEGORY_STATS if os.path.exists(pattern.format(category=category))
+        }
+        for variant, pattern in variants.items()
+    }
+
+def backtest_day(day):
+    """ Every variant's picks for one slate: features as of that morning, graded against that day's box scores. """
+    odds_files = {
+        category: os.path.join(_worker["archive_dir"], day, os.path.basename(odds_file))
+        for category, odds_file in ODDS_FILES.items()
+    }
+    odds_files = {category: path for category, path in odds_files.items() if os.path.exists(path)}
+    results = _worker["results"].get(pd.Timestamp(day))
+    if not odds_files or results is None:
+        return pd.DataFrame()
+
+    table = build_feature_table(_worker["history"].as_of(day), odds_files)
+    current_span().count("props", len(table))
+    table = table[table["player_id"].isin(results.index)]
+
+    picks = []
+    for variant, models in _worker["models"].items():
+        for category, rows in table.groupby("category", observed=True):
+            if category not in models:
+                continue
+
+            model = models[category]
+            features = rows[list(model.feature_names_in_)].apply(pd.to_numeric, errors="coerce")
+            rows, features = rows[features.notna().all(axis=1)], features.dropna()
+            if rows.empty:
+                continue
+
+            picks.append(pd.DataFrame({
+                "variant": variant,
+                "date": day,
+                "category": category,
+                "player": rows["player"].astype(str).to_numpy(),
+                "line": rows["best_point"].to_numpy(dtype=float),
+                "over_odds": rows["best_over_odds"].to_numpy(dtype=float),
+                "under_odds": rows["best_under_odds"].to_numpy(dtype=float),
+                "projection": model.predict(features),
+                "actual": results.loc[rows["player_id"].to_numpy(dtype=np.int64), CATEGORY_STATS[category]].to_numpy(dtype=float)
+            }))
+
+    picks = pd.concat(picks, ignore_index=True) if picks else pd.DataFrame()
+    current_span().rows(rows_in=len(table), rows_out=len(picks))
+    return picks
+
+def grade_picks(picks):
+    """ Bets the side the edge points to and settles it at the best price (1 unit stakes, pushes refunded). """
+    picks = picks.dropna(subset=["actual", "projection", "line"]).copy()
+    picks["edge"] = picks["projection"] - picks["line"]
+    picks["side"] = np.where(picks["edge"] >= 0, "Over", "Under")
+
+    over = picks["side"] == "Over"
+    odds = np.where(over, picks["over_odds"], picks["under_odds"])
+    won = np.where(over, picks["actual"] > picks["line"], picks["actual"] < picks["line"])
+    push = picks["actual"] == picks["line"]
+
+    picks["result"] = np.select([push, won], ["push", "win"], "loss")
+    picks["profit"] = np.select([push, won], [0.0, american_to_decimal(odds) - 1], -1.0)
+    return picks.dropna(subset=["profit"])
+
+def summarize(picks):
+    """ Picks, hit rate (pushes excluded) and ROI per variant, category and |edge| bucket. """
+    picks = picks.assign(bucket=pd.cut(picks["edge"].abs(), EDGE_BUCKETS, right=False))
+    overall = picks.assign(category="All")
+
+    summary = pd.concat([picks, overall]).groupby(["variant", "category", "bucket"], observed=True).agg(
+        picks=("result", "size"),
+        wins=("result", lambda r: (r == "win").sum()),
+        losses=("result", lambda r: (r == "loss").sum()),
+        profit=("profit", "sum")
+    ).reset_index()
+
+    summary["hit_rate"] = summary["wins"] / (summary["wins"] + summary["losses"]).replace(0, np.nan)
+    summary["roi"] = summary["profit"] / summary["picks"]
+    return summary
+
+def run_backtest(cache_file, season, season_type="Regular Season", variants=DEFAULT_VARIANTS,
+                 archive_dir=ARCHIVE_DIR, start=None, end=None, workers=None):
+    """ Fans the archived slates out over a process pool and returns (graded picks, summary). """
+    days = slate_days(archive_dir, start, end)
+    workers = workers or os.cpu_count() or 1
+    began = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_file, season, season_type, variants, archive_dir)) as pool:
+        frames = list(pool.map(partial(traced, "backtest:day", backtest_day), days,
+                               chunksize=max(1, len(days) // (workers * 4))))
+
+    picks = grade_picks(pd.concat(frames, ignore_index=True)) if any(len(f) for f in frames) else pd.DataFrame()
+    print(f"✅ Backtested {len(days)} slates ({len(picks)} picks) in {time.perf_counter() - began:.1f}s with {workers} workers")
+
+    return picks, summarize(picks) if len(picks) else pd.DataFrame()
+
+def parse_variants(specs):
+    """ ["name=AI_Model_{category}.pkl", ...] -> {name: pattern} """
+    variants = dict(spec.split("=", 1) for spec in specs)
+    for name, pattern in variants.items():
+        if "{category}" not in pattern:
+            raise ValueError(f"Variant {name}: model pattern needs a {{category}} placeholder")
+    return variants
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of edge picks over archived odds snapshots.")
+    parser.add_argument("--cache", default="gamelog_cache.sqlite", help="Game-log cache with the season's box scores")
+    parser.add_argument("--season", default="2024-25")
+    parser.add_argument("--season-type", default="Regular Season")
+    parser.add_argument("--archive", default=ARCHIVE_DIR)
+    parser.add_argument("--start", default=None, help="First slate (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="Last slate (YYYY-MM-DD)")
+    parser.add_argument("--variant", action="append", default=None,
+                        help="name=model pattern with {category}, e.g. new=models/v2_{category}.pkl (repeatable)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="backtest_picks.csv", help="Where to write every graded pick")
+    args = parser.parse_args()
+
+    variants = parse_variants(args.variant) if args.variant else DEFAULT_VARIANTS
+    with span("backtest", season=args.season, variants=list(variants)):
+        picks, summary = run_backtest(args.cache, args.season, args.season_type, variants,
+                                      args.archive, args.start, args.end, args.workers)
+
+    if len(picks):
+        picks.to_csv(args.output, index=False)
+        print(f"✅ Picks saved as: {args.output}")
+
+        # Variants side by side
+        print(summary.pivot_table(index=["category", "bucket"], columns="variant", values=["picks", "hit_rate", "roi"],
+                                  observed=True).round(3).to_string())
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import players
+from backtest import run_backtest
+from feature_store import CATEGORY_STATS, ODDS_FILES
+from gamelog_cache import GameLogCache
+from stub_stats_server import GAME_LOG_HEADERS, make_game_logs
+
+SEASON = "2024-25"
+
+def make_season(workdir, n_players=200, n_games=82, seed=42):
+    """
+    Writes a synthetic season to workdir: a game-log cache (half the players
+    play on even days, half on odd days, so there's a slate every day) and
+    one archived odds snapshot per day with lines near each player's average.
+    """
+    rng = np.random.default_rng(seed)
+    roster = sorted(players.get_active_players(), key=lambda p: p["id"])[:n_players]
+
+    frames = []
+    for i, player in enumerate(roster):
+        df = pd.DataFrame(make_game_logs(player["id"], SEASON, n_games), columns=GAME_LOG_HEADERS)
+        df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"]) + pd.Timedelta(days=i % 2)
+        df["PLAYER_NAME"] = player["full_name"]
+        frames.append(df)
+    games = pd.concat(frames, ignore_index=True)
+
+    cache = GameLogCache(os.path.join(workdir, "gamelog_cache.sqlite"))
+    cache.store(games, SEASON, "Regular Season", [p["id"] for p in roster])
+
+    archive = os.path.join(workdir, "odds_archive")
+    for day, slate in games.groupby("GAME_DATE"):
+        day_dir = os.path.join(archive, day.strftime("%Y-%m-%d"))
+        os.makedirs(day_dir)
+        for category, column in CATEGORY_STATS.items():
+            means = games[games["PLAYER_ID"].isin(slate["PLAYER_ID"])].groupby("PLAYER_NAME")[column].mean()
+            pd.DataFrame({
+                "Player": means.index,
+                "Best_Over_Odds": rng.choice([-135, -125, -115, -110, 100, 105], len(means)),
+                "Best_Under_Odds": rng.choice([-135, -125, -115, -110, 100, 105], len(means)),
+                "Best_Point": np.floor(means.to_numpy() + rng.normal(0, 1.5, len(means))) + 0.5
+            }).to_csv(os.path.join(day_dir, os.path.basename(ODDS_FILES[category])), index=False)
+
+    return games["GAME_DATE"].nunique()
+
+if __name__ == "__main__":
+    workers = [int(w) for w in sys.argv[1:]] or sorted({1, os.cpu_count() or 1})
+    models = {"current": os.path.abspath("AI_Model_{category}.pkl")}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        n_days = make_season(workdir)
+        print(f"📊 Synthetic season: {n_days} slates")
+
+        for n_workers in workers:
+            start = time.perf_counter()
+            picks, summary = run_backtest(os.path.join(workdir, "gamelog_cache.sqlite"), SEASON, variants=models,
+                                          archive_dir=os.path.join(workdir, "odds_archive"), workers=n_workers)
+            print(f"⏱️ {n_workers} workers: {time.perf_counter() - start:.1f}s")
+
+    print(summary[summary["category"] == "All"].round(3).to_string(index=False))
@@ -0,0 +1,56 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from best_odds import ODDS_COLUMNS, get_best_odds
+
+# Function kept as-is from the old scripts so we can compare speed and output
+def legacy_get_best_odds(df):
+    def get_best_odds(group):
+        best_over = group[group["label"] == "Over"].nsmallest(1, "price")  # Most negative Over
+        best_under = group[group["label"] == "Under"]
+        best_under = best_under.loc[best_under["price"].abs().idxmin()] if not best_under.empty else None  # Closest to 0 Under
+
+        return pd.DataFrame({
+            "Player": [group["description"].iloc[0]],
+            "Best_Over_Odds": [best_over["price"].values[0] if not best_over.empty else None],
+            "Best_Under_Odds": [best_under["price"] if best_under is not None else None],
+            "Best_Point": [group["point"].iloc[0]]
+        })
+
+    return df.groupby("description", group_keys=False).apply(get_best_odds).reset_index(drop=True)
+
+def make_odds_dump(n_lines, n_players, seed=42):
+    """ Builds a synthetic multi-book odds dump with the same layout as "NBA STATS - *.csv". """
+    rng = np.random.default_rng(seed)
+
+    player_ids = rng.integers(0, n_players, n_lines)
+    lines = np.round(rng.uniform(2, 35, n_players)) + 0.5
+
+    return pd.DataFrame({
+        "label": np.where(rng.random(n_lines) < 0.5, "Over", "Under"),
+        "description": np.char.add("Player ", player_ids.astype(str)),
+        "price": rng.integers(-200, 150, n_lines).astype(float),
+        "point": lines[player_ids] + rng.choice([-1.0, 0.0, 0.0, 1.0], n_lines)
+    })[ODDS_COLUMNS]
+
+def time_it(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_players = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    print(f"🧪 Building synthetic dump: {n_lines:,} lines, {n_players:,} players")
+    df = make_odds_dump(n_lines, n_players)
+
+    new_df, new_time = time_it(get_best_odds, df)
+    print(f"⚡ Vectorized get_best_odds: {new_time:.2f}s")
+
+    old_df, old_time = time_it(legacy_get_best_odds, df)
+    print(f"🐢 Legacy groupby().apply: {old_time:.2f}s")
+
+    pd.testing.assert_frame_equal(new_df, old_df, check_dtype=False)
+    print(f"✅ Outputs match! Speedup: {old_time / new_time:.1f}x")
@@ -0,0 +1,60 @@
+import sys
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from forest_compile import CompiledForest, forest_path, save_compiled
+from table_schema import read_table
+
+MODEL_FILES = ["AI_Model_Rebounds.pkl", "AI_Model_Assists.pkl", "AI_Model_Points.pkl", "AI_Projection_Model.pkl"]
+
+def best_of(func, repeats=5):
+    """ Fastest of a few runs (seconds) and the last result. """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def make_batch(model, data, n_rows, seed=42):
+    """ Resamples real feature rows (with a little noise) up to the batch size, for timing. """
+    rng = np.random.default_rng(seed)
+    features = data[list(model.feature_names_in_)].apply(pd.to_numeric, errors="coerce").dropna()
+    batch = features.iloc[rng.integers(0, len(features), n_rows)].reset_index(drop=True)
+    return batch + rng.normal(0, 0.5, batch.shape)
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    slate_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    # Typed like the pipeline's feature table (float32 odds, float64 averages)
+    data = read_table("AI_Model_Data.csv", "features")
+
+    for model_file in MODEL_FILES:
+        print(f"\n📦 {model_file}")
+        compiled_file = forest_path(model_file)
+
+        pickle_load, model = best_of(lambda: joblib.load(model_file))
+        save_compiled(model, compiled_file)
+        compiled_load, compiled = best_of(lambda: CompiledForest(compiled_file))
+
+        # A re-projection after a line move: load + predict one slate
+        slate = make_batch(model, data, slate_rows)
+        sklearn_slate, _ = best_of(lambda: joblib.load(model_file).predict(slate))
+        compiled_slate, _ = best_of(lambda: CompiledForest(compiled_file).predict(slate))
+
+        batch = make_batch(model, data, n_rows)
+        sklearn_time, _ = best_of(lambda: model.predict(batch), repeats=3)
+        compiled_time, _ = best_of(lambda: compiled.predict(batch), repeats=3)
+
+        # Exactness on the real rows, unperturbed: slate values repeat training values, so ties at
+        # the split thresholds have to go the same way as in sklearn
+        rows = data[list(model.feature_names_in_)].dropna()
+        expected, actual = model.predict(rows), compiled.predict(rows)
+        max_diff = np.abs(expected - actual).max()
+        mismatches = (~np.isclose(expected, actual, rtol=1e-9, atol=1e-9)).sum()
+
+        print(f"  load:    joblib {pickle_load * 1000:8.1f} ms | compiled {compiled_load * 1000:8.2f} ms ({pickle_load / compiled_load:.0f}x)")
+        print(f"  slate:   joblib + predict {sklearn_slate * 1000:6.1f} ms | compiled {compiled_slate * 1000:6.1f} ms ({slate_rows} rows)")
+        print(f"  predict: sklearn {n_rows / sklearn_time:10,.0f} rows/s | compiled {n_rows / compiled_time:10,.0f} rows/s")
+        print(f"  {'✅' if mismatches == 0 else '⚠️'} max |diff| = {max_diff:.2e} on {len(rows)} real rows, rows outside tolerance: {mismatches}")
@@ -0,0 +1,69 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from bench_suite import roster
+from line_history import LineHistory
+
+BOOKS = ["dk", "fd", "mgm", "czr", "espn", "br", "fan", "hr"]
+
+# One snapshot every 5 minutes over a 12-hour betting day
+SNAPSHOT_SECONDS = 300
+SNAPSHOTS_PER_DAY = 144
+
+def time_per_call(func, repeats=50):
+    """ Mean time per call (ms). """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+if __name__ == "__main__":
+    # Days of snapshots, players on the board and the share of lines that move between snapshots
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    n_players = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    move_rate = 0.02
+    rng = np.random.default_rng(42)
+
+    names = roster(n_players)
+    board = pd.DataFrame({
+        "Player": np.repeat(names, len(BOOKS)),
+        "Book": np.tile(BOOKS, len(names)),
+        "Best_Point": np.repeat(np.round(rng.uniform(2, 30, len(names))) + 0.5, len(BOOKS)),
+        "Best_Over_Odds": rng.integers(-135, -100, len(names) * len(BOOKS)),
+        "Best_Under_Odds": rng.integers(-135, -100, len(names) * len(BOOKS))
+    })
+
+    workdir = tempfile.mkdtemp()
+    history = LineHistory(workdir)
+    start_ts, appended = 1_735_700_000, 0.0
+    try:
+        for day in range(n_days):
+            for snapshot in range(SNAPSHOTS_PER_DAY):
+                moved = rng.random(len(board)) < move_rate
+                board.loc[moved, "Best_Point"] += rng.choice([-1.0, 1.0], moved.sum())
+                board.loc[moved, "Best_Over_Odds"] = rng.integers(-135, -100, moved.sum())
+
+                ts = start_ts + day * 86400 + snapshot * SNAPSHOT_SECONDS
+                began = time.perf_counter()
+                history.append("Points", board, ts)
+                appended += time.perf_counter() - began
+
+        folder = os.path.join(workdir, "Points")
+        size = sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+        raw = n_days * SNAPSHOTS_PER_DAY * len(board) * 18
+        print(f"📊 {n_days} days x {SNAPSHOTS_PER_DAY} snapshots of {len(board):,} lines: "
+              f"{size / 2 ** 20:.1f} MB on disk (every snapshot in full: {raw / 2 ** 20:.0f} MB)")
+        print(f"  append            {appended / (n_days * SNAPSHOTS_PER_DAY) * 1000:7.2f} ms per snapshot")
+
+        fresh = LineHistory(workdir)
+        end = start_ts + (n_days - 1) * 86400 + SNAPSHOTS_PER_DAY * SNAPSHOT_SECONDS
+        middle = start_ts + n_days // 2 * 86400 + 6 * 3600
+        print(f"  line at T         {time_per_call(lambda: fresh.line_at('Points', middle)):7.2f} ms")
+        print(f"  moves, last 60min {time_per_call(lambda: fresh.largest_moves('Points', 60, end)):7.2f} ms")
+        print(f"  opening vs now    {time_per_call(lambda: fresh.opening_vs_current('Points')):7.2f} ms")
+    finally:
+        shutil.rmtree(workdir)
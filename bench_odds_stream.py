@@ -0,0 +1,57 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from best_odds import get_best_odds
+from odds_stream import BEST_COLUMNS, OddsTracker
+
+BOOKS = ["dk", "fd", "mgm", "czr", "espn", "br", "fan", "hr"]
+
+def make_feed(n_players, rng):
+    """ One Over and one Under line per player and book. """
+    n = n_players * len(BOOKS) * 2
+    return pd.DataFrame({
+        "label": np.tile(["Over", "Under"], n // 2),
+        "description": np.repeat([f"Player {i}" for i in range(n_players)], len(BOOKS) * 2),
+        "price": rng.integers(-135, -100, n).astype(float),
+        "point": np.repeat(np.round(rng.uniform(2, 30, n_players)) + 0.5, len(BOOKS) * 2),
+        "book": np.tile(np.repeat(BOOKS, 2), n_players)
+    })
+
+if __name__ == "__main__":
+    # Players on the board and size of each update batch
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = np.random.default_rng(42)
+
+    feed = make_feed(n_players, rng)
+    tracker = OddsTracker()
+    start = time.perf_counter()
+    tracker.ingest(feed)
+    print(f"📊 Board: {len(feed):,} lines, {n_players:,} players (loaded in {(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    # Every book pulls one player's lines: the player comes back once with NaN odds, then is off the board
+    pulled = feed[feed["description"] == "Player 0"].assign(price=np.nan, point=np.nan)
+    changed = tracker.ingest(pulled)
+    assert changed["Player"].tolist() == ["Player 0"] and changed[BEST_COLUMNS[1:]].isna().all(axis=None), changed
+    assert "Player 0" not in tracker.players and tracker.ingest(pulled).empty
+    assert tracker.best_odds().equals(get_best_odds(tracker.snapshot_rows()).reset_index(drop=True)[BEST_COLUMNS])
+    print("✅ Pulled lines reported as NaN rows; best odds match get_best_odds on the live rows")
+
+    # Re-price random lines, batch by batch
+    incremental, full, rounds = 0.0, 0.0, 20
+    for _ in range(rounds):
+        update = feed.sample(batch, random_state=rng.integers(1 << 31)).assign(
+            price=lambda d: rng.integers(-135, -100, len(d)).astype(float))
+
+        start = time.perf_counter()
+        tracker.ingest(update)
+        incremental += time.perf_counter() - start
+
+        snapshot = tracker.snapshot_rows()
+        start = time.perf_counter()
+        get_best_odds(snapshot)
+        full += time.perf_counter() - start
+
+    print(f"  {batch} updates: incremental {incremental / rounds * 1000:7.2f} ms | "
+          f"get_best_odds over the board {full / rounds * 1000:7.2f} ms")
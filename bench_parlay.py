@@ -0,0 +1,24 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from parlay import best_parlays
+from projection_store import load_projections
+
+if __name__ == "__main__":
+    # Grow today's slate to ~1,000 props with distinct players and jittered projections
+    n_props = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    slate = load_projections()
+    copies = -(-n_props // len(slate))
+    df = pd.concat([slate.assign(player=slate["player"] + f" #{i}") for i in range(copies)], ignore_index=True)[:n_props]
+    df["AI_Projection"] += np.random.default_rng(42).normal(0, 2, len(df))
+    print(f"📊 Slate: {len(df):,} props")
+
+    for n_legs in range(2, 7):
+        start = time.perf_counter()
+        parlays = best_parlays(df, n_legs, n_legs, top_n=10)
+        print(f"  {n_legs} legs: {(time.perf_counter() - start) * 1000:7.1f} ms | best EV {parlays['ev'].max():+.2f}")
+
+    start = time.perf_counter()
+    best_parlays(df, 2, 6, top_n=10)
+    print(f"⏱️ 2-6 legs, top 10 each: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,32 @@
+import sys
+import time
+import pandas as pd
+from player_search import PlayerSearch
+from projection_store import load_projections
+
+QUERIES = ["a", "an", "anthony", "gilgeus", "luca donchic", "booker devin", "xyz"]
+
+def time_per_call(func, repeats=1000):
+    """ Mean time per call (ms). """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+if __name__ == "__main__":
+    # Repeat today's slate into a multi-day, multi-book history table (default: 60 days x 8 books)
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 480
+    df = pd.concat([load_projections()] * copies, ignore_index=True)
+    print(f"📊 Table: {len(df):,} rows, {df['player'].nunique()} players")
+
+    start = time.perf_counter()
+    search = PlayerSearch(df["player"].to_numpy())
+    print(f"🔨 Index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for query in QUERIES:
+        matches = search.search(query)
+        scan = time_per_call(lambda: df[df["player"].str.contains(query, case=False, na=False)], repeats=5)
+        indexed = time_per_call(lambda: search.row_positions(search.search(query)))
+        with_rows = time_per_call(lambda: df.iloc[search.row_positions(search.search(query))])
+        print(f"  {query!r:<16} str.contains {scan:7.2f} ms | index {indexed:6.3f} ms "
+              f"(+ df.iloc {with_rows - indexed:5.2f} ms) | {len(matches)} players")
@@ -0,0 +1,78 @@
+import gzip
+import http.client
+import json
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from projection_api import ProjectionAPI, make_handler
+from projection_store import load_projections
+from ranked_views import THRESHOLDS, RankedViews
+
+PATHS = ["/categories", "/players", "/players?q=jokic", "/top?category=Points", "/hot", "/cold", "/top?page=2&per_page=20"]
+
+def check(api):
+    """ The API's lists hold the same rows the app shows; ETags, gzip and pagination behave. """
+    df = load_projections()
+    views = RankedViews(df)
+
+    def items(path):
+        status, headers, body = api.get(path)
+        assert status == 200, (path, status, body)
+        return json.loads(body)
+
+    for kind in ("hot", "cold"):
+        expected = df.iloc[views.across(kind, THRESHOLDS, k=2)]["player"].tolist()
+        assert [row["player"] for row in items(f"/{kind}")["items"]] == expected, kind
+
+    top = items("/top?category=Points&per_page=500")
+    assert [row["player"] for row in top["items"]] == df.iloc[views.ranked("Points", "top", THRESHOLDS["Points"])]["player"].tolist()
+
+    pages = [items(f"/players?per_page=40&page={page}") for page in range(1, items("/players?per_page=40")["pages"] + 1)]
+    assert sum(len(page["items"]) for page in pages) == len(df) == pages[0]["total"]
+
+    status, headers, body = api.get("/players", {"Accept-Encoding": "gzip"})
+    assert headers.get("Content-Encoding") == "gzip" and json.loads(gzip.decompress(body))["total"] == len(df)
+    assert api.get("/players", {"If-None-Match": headers["ETag"]})[0] == 304
+
+    assert api.get("/nope")[0] == 404
+    assert api.get("/top?category=Steals")[0] == 404
+    assert api.get("/players?per_page=x")[0] == 400
+    print("✅ Responses match the app's views (hot/cold/top, pagination, gzip, ETag)")
+
+def requests_per_second(func, seconds=2.0):
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for path in PATHS:
+            func(path)
+        count += len(PATHS)
+    return count / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    start = time.perf_counter()
+    api = ProjectionAPI()
+    api.current()
+    print(f"🔨 Snapshot built and default pages serialized in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    check(api)
+
+    print(f"  in-process              {requests_per_second(api.get, seconds):9,.0f} req/s")
+    etags = {path: api.get(path)[1]["ETag"] for path in PATHS}
+    print(f"  in-process, 304         {requests_per_second(lambda p: api.get(p, {'If-None-Match': etags[p]}), seconds):9,.0f} req/s")
+
+    # Same requests over a local socket (one keep-alive connection)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(api))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+
+    def fetch(path, headers={"Accept-Encoding": "gzip"}):
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+    print(f"  HTTP, gzip              {requests_per_second(fetch, seconds):9,.0f} req/s")
+    print(f"  HTTP, 304               {requests_per_second(lambda p: fetch(p, {'If-None-Match': etags[p]}), seconds):9,.0f} req/s")
+    server.shutdown()
@@ -0,0 +1,29 @@
+import sys
+import time
+import tracemalloc
+import numpy as np
+from prop_probability import METHODS, N_SIMULATIONS, simulate_probabilities
+
+def make_slate(n_props, seed=42):
+    """ Projections, lines and L10 games (a few missing) for a synthetic slate. """
+    rng = np.random.default_rng(seed)
+    means = rng.uniform(2, 30, n_props)
+    games = rng.negative_binomial(5, 5 / (5 + means[:, None]), (n_props, 10)).astype(float)
+    games[rng.random(games.shape) < 0.05] = np.nan
+    projection = means * rng.uniform(0.9, 1.1, n_props)
+    return projection, np.round(means) + 0.5, games
+
+if __name__ == "__main__":
+    n_props = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_simulations = int(sys.argv[2]) if len(sys.argv) > 2 else N_SIMULATIONS
+    projection, line, games = make_slate(n_props)
+
+    print(f"📊 {n_props:,} props x {n_simulations:,} simulations")
+    for method in METHODS:
+        tracemalloc.start()
+        start = time.perf_counter()
+        simulate_probabilities(projection, line, games, n_simulations, method)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {method:<10} {seconds:6.2f}s  peak {peak / 2 ** 20:6.1f} MB")
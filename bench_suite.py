@@ -0,0 +1,244 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import players
+import player_index
+from feature_store import GAME_COLUMNS
+
+# Size of the sample files in the repo that scale 1 reproduces
+BASE_PLAYERS = 80
+BASE_LINES = 860
+
+# Raw dump, L10 file and typical stat range per category
+CATEGORIES = {
+    "Rebounds": ("NBA STATS - REBOUNDS.csv", "rebounds_L10.csv", (0, 15)),
+    "Assists": ("NBA STATS - ASSISTS.csv", "assists_L10.csv", (0, 12)),
+    "Points": ("NBA STATS - POINTS.csv", "points_L10.csv", (2, 40))
+}
+
+RESULTS_DIR = "bench_results"
+
+# --- Generators ---
+
+def roster(n_players):
+    """ Real player names (active first), so name resolution does the same work as on a real slate. """
+    everyone = sorted(players.get_players(), key=lambda p: (not p["is_active"], p["id"]))
+    return [p["full_name"] for p in everyone[:n_players]]
+
+def make_raw_odds(names, lines_per_player, stat_range, rng):
+    """ Raw odds dump like "NBA STATS - *.csv": Over/Under row pairs per book, no header. """
+    n_books = max(1, lines_per_player // 2)
+    base = np.round(rng.uniform(*stat_range, len(names))) + 0.5
+
+    player = np.repeat(np.arange(len(names)), 2 * n_books)
+    return pd.DataFrame({
+        "label": np.tile(["Over", "Under"], len(names) * n_books),
+        "description": np.asarray(names, dtype=object)[player],
+        "price": rng.integers(-135, -100, len(player)),
+        "point": base[player] + np.repeat(rng.choice([-1.0, 0.0, 0.0, 1.0], len(names) * n_books), 2)
+    })
+
+def make_l10(names, stat_range, rng):
+    """ L10 table like "points_L10.csv": Player, Game 1..10 and their Average. """
+    games = rng.integers(stat_range[0], stat_range[1] + 1, (len(names), 10))
+    df = pd.DataFrame(games, columns=[col.title() for col in GAME_COLUMNS])
+    df.insert(0, "Player", names)
+    df["Average"] = games.mean(axis=1).round(1)
+    return df
+
+def write_inputs(workdir, scale, seed=42):
+    """
+    Writes every category's raw dump and L10 file at `scale` times the sample
+    size. Players stop growing at the size of the real roster; past that the
+    extra lines go to more books per player. Returns the sizes.
+    """
+    rng = np.random.default_rng(seed)
+    names = roster(BASE_PLAYERS * scale)
+    lines_per_player = -(-BASE_LINES * scale // len(names))
+
+    sizes = {}
+    for category, (odds_file, l10_file, stat_range) in CATEGORIES.items():
+        raw = make_raw_odds(names, lines_per_player, stat_range, rng)
+        raw.to_csv(os.path.join(workdir, odds_file), index=False, header=False)
+        make_l10(names, stat_range, rng).to_csv(os.path.join(workdir, l10_file), index=False)
+        sizes[category] = len(raw)
+
+    return {"players": len(names), "odds_lines": sizes}
+
+# --- Stages (each one runs every category, reading the previous stage's files) ---
+
+def stage_clean():
+    from cleanup import clean_odds
+    for category, (odds_file, _, _) in CATEGORIES.items():
+        clean_odds(odds_file, f"Cleaned_Best_Odds_{category}.csv")
+
+def stage_combine():
+    from combine import merge_odds_l10
+    for category, (_, l10_file, _) in CATEGORIES.items():
+        merge_odds_l10(f"Cleaned_Best_Odds_{category}.csv", l10_file, f"Merged_{category}.csv", category)
+
+def stage_kut():
+    from Kut import process_projection
+    for category, (_, l10_file, _) in CATEGORIES.items():
+        process_projection(f"Cleaned_Best_Odds_{category}.csv", l10_file, f"Projections_{category}.csv")
+
+def stage_features():
+    from pipeline import merge_stage
+    for category, (_, l10_file, _) in CATEGORIES.items():
+        merge_stage([f"Cleaned_Best_Odds_{category}.csv", l10_file], [f"Merged_{category}.csv"], category)
+
+def stage_predict(models_dir):
+    from AIPRun import generate_projections
+    for category in CATEGORIES:
+        generate_projections(f"Merged_{category}.csv", os.path.join(models_dir, f"AI_Model_{category}.pkl"),
+                             f"AI_Projections_{category}.csv")
+
+def stage_app_build():
+    from projection_store import build_projections, write_projections
+    write_projections(build_projections())
+
+def stage_app_read():
+    from projection_store import read_projections
+    read_projections()
+
+def stages(models_dir):
+    return [
+        ("clean", stage_clean),
+        ("combine", stage_combine),
+        ("kut", stage_kut),
+        ("features", stage_features),
+        ("predict", lambda: stage_predict(models_dir)),
+        ("app_build", stage_app_build),
+        ("app_read", stage_app_read)
+    ]
+
+# --- Measuring ---
+
+def measure(func, repeats):
+    """ Best wall time of a few quiet runs, then one more run under tracemalloc for the peak memory (MB). """
+    times = []
+    for _ in range(repeats):
+        player_index._resolve.cache_clear()  # Every run starts with cold name lookups, like a fresh process
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        times.append(time.perf_counter() - start)
+
+    player_index._resolve.cache_clear()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return min(times), peak / 2 ** 20
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(scales=(10, 100, 1000), repeats=3, only=None):
+    """ Runs every stage at every scale in a scratch directory. Returns the results document. """
+    repo_dir = os.getcwd()
+    player_index.load_index(os.path.join(repo_dir, player_index.INDEX_FILE), os.path.join(repo_dir, player_index.ALIASES_FILE))
+
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "repeats": repeats
+        },
+        "results": []
+    }
+
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as workdir:
+            sizes = write_inputs(workdir, scale)
+            print(f"\n📊 Scale {scale}x: {sizes['players']:,} players, {sum(sizes['odds_lines'].values()):,} odds lines")
+
+            os.chdir(workdir)
+            try:
+                for name, func in stages(repo_dir):
+                    if only and name not in only:
+                        continue
+                    seconds, peak_mb = measure(func, repeats)
+                    document["results"].append({"scale": scale, "stage": name, "seconds": seconds, "peak_mb": peak_mb, **sizes})
+                    print(f"  {name:<10} {seconds:8.3f}s  {peak_mb:8.1f} MB")
+            finally:
+                os.chdir(repo_dir)
+
+    return document
+
+def save_results(document, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = document["meta"]["timestamp"].replace(":", "").replace("-", "").replace("+0000", "Z")
+    output_file = os.path.join(results_dir, f"suite-{stamp}-{document['meta']['commit'] or 'nogit'}.json")
+
+    with open(output_file, "w") as file:
+        json.dump(document, file, indent=2)
+
+    print(f"\n✅ Results saved as: {output_file}")
+    return output_file
+
+def compare(document, baseline_file, tolerance=0.2, min_seconds=0.02, min_mb=1.0):
+    """
+    Prints every stage against a saved run and returns the ones more than
+    `tolerance` slower or bigger (ignoring changes under min_seconds / min_mb, which are noise).
+    """
+    with open(baseline_file, "r") as file:
+        baseline = json.load(file)
+
+    old = {(r["scale"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+
+    print(f"\n🔍 Against {baseline_file} (commit {baseline['meta'].get('commit')}):")
+    for result in document["results"]:
+        before = old.get((result["scale"], result["stage"]))
+        if not before:
+            continue
+
+        time_ratio = result["seconds"] / max(before["seconds"], 1e-9)
+        memory_ratio = result["peak_mb"] / max(before["peak_mb"], 1e-9)
+        slower = time_ratio > 1 + tolerance and result["seconds"] - before["seconds"] > min_seconds
+        bigger = memory_ratio > 1 + tolerance and result["peak_mb"] - before["peak_mb"] > min_mb
+        regressed = slower or bigger
+        if regressed:
+            regressions.append(result)
+
+        print(f"  {'❌' if regressed else '✅'} {result['scale']:>5}x {result['stage']:<10} "
+              f"time {time_ratio:5.2f}x  memory {memory_ratio:5.2f}x")
+
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile every pipeline stage on synthetic slates.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000], help="Multiples of the sample files' size")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage (the best one is kept)")
+    parser.add_argument("--stages", nargs="+", default=None, help="Only run these stages")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown/growth before a stage is flagged")
+    args = parser.parse_args()
+
+    document = run_suite(args.scales, args.repeats, args.stages)
+    save_results(document)
+
+    if args.compare and compare(document, args.compare, args.tolerance):
+        sys.exit(1)
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+from projection_store import load_projections
+from table_schema import GAME_COLUMNS, read_table, write_table
+
+# The CSV path as the stages had it: parse, then pd.to_numeric every numeric column
+NUMERIC_COLUMNS = ["best_over_odds", "best_under_odds", "best_point", "average"] + GAME_COLUMNS
+
+def csv_round_trip(df, path):
+    df.to_csv(path, index=False)
+    back = pd.read_csv(path)
+    for col in NUMERIC_COLUMNS:
+        back[col] = pd.to_numeric(back[col], errors="coerce")
+    return back
+
+def best_time(func, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+if __name__ == "__main__":
+    # Copies of today's projections table: one slate, a busy multi-book slate, a season of slates
+    scales = [int(arg) for arg in sys.argv[1:]] or [1, 100, 1000]
+    base = load_projections().drop(columns=["Edge"], errors="ignore")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_file = os.path.join(workdir, "table.csv")
+        table_file = os.path.join(workdir, "table.parquet")
+
+        for scale in scales:
+            df = pd.concat([base] * scale, ignore_index=True)
+            write_csv, _ = best_time(lambda: df.to_csv(csv_file, index=False))
+            read_csv, from_csv = best_time(lambda: csv_round_trip(df, csv_file))
+            read_csv -= write_csv
+            write_parquet, _ = best_time(lambda: write_table(df, table_file, "projections", csv=False))
+            read_parquet, from_parquet = best_time(lambda: read_table(table_file))
+
+            csv_mb = from_csv.memory_usage(deep=True).sum() / 2 ** 20
+            parquet_mb = from_parquet.memory_usage(deep=True).sum() / 2 ** 20
+            print(f"📊 {len(df):>9,} rows | write CSV {write_csv:8.1f} ms  Parquet {write_parquet:7.1f} ms | "
+                  f"read CSV {read_csv:8.1f} ms  Parquet {read_parquet:7.1f} ms | "
+                  f"file {os.path.getsize(csv_file) / 2 ** 20:6.1f} / {os.path.getsize(table_file) / 2 ** 20:5.1f} MB | "
+                  f"frame {csv_mb:6.1f} / {parquet_mb:5.1f} MB")
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from table_schema import read_table
+from train_models import CATEGORY_DATA, FEATURES, train_all
+
+def make_training_set(input_file, n_rows, seed=42):
+    """ Resamples a category's rows (with noise) to the size of a multi-season training set. """
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(input_file).dropna(subset=FEATURES)
+    df = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    df[FEATURES] += rng.normal(0, 1, (n_rows, len(FEATURES)))
+    return df
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    sources = {category: read_table(f, "features") for category, f in CATEGORY_DATA.items()}
+
+    # Work in a scratch directory so the real model files are left alone
+    with tempfile.TemporaryDirectory() as workdir:
+        for category, df in sources.items():
+            df.to_csv(os.path.join(workdir, "source.csv"), index=False)
+            make_training_set(os.path.join(workdir, "source.csv"), n_rows).to_csv(
+                os.path.join(workdir, CATEGORY_DATA[category]), index=False)
+        os.chdir(workdir)
+        print(f"📊 {n_rows:,} rows per category")
+
+        # Like ai2025.py: one category after another, one thread per forest
+        _, sequential = train_all(workers=1, n_jobs=1)
+        _, parallel = train_all()
+
+        # A nightly retrain: 5% new rows, warm-started
+        for category, input_file in CATEGORY_DATA.items():
+            df = pd.read_csv(input_file)
+            new_rows = make_training_set(input_file, n_rows // 20, seed=7)
+            pd.concat([df, new_rows], ignore_index=True).to_csv(input_file, index=False)
+        _, warm = train_all(warm_start=True)
+
+    print(f"\n🏁 sequential {sequential:.2f}s | parallel {parallel:.2f}s ({sequential / parallel:.1f}x) | "
+          f"warm start {warm:.2f}s ({sequential / warm:.1f}x)")
@@ -0,0 +1,80 @@
+import pandas as pd
+from instrumentation import current_span
+from player_index import report_unmatched, resolve_ids
+from table_schema import parquet_path, write_table
+
+# Column layout of the raw odds dumps ("NBA STATS - *.csv")
+ODDS_COLUMNS = ["label", "description", "price", "point"]
+
+def _best_price(rows, key):
+    """ Returns the first price per player with the smallest sort key. """
+    # A stable sort keeps the original row order for ties (same as nsmallest/idxmin)
+    rows = rows.assign(_key=key).dropna(subset=["_key"]).sort_values("_key", kind="stable")
+    return rows.drop_duplicates("description").set_index("description")["price"]
+
+def get_best_odds(df):
+    """
+    Picks the best Over, the best Under and the line for every player in one pass.
+
+    Best Over is the most negative Over price, best Under is the Under price
+    closest to 0 and the line is the point of the player's first row.
+    """
+    over = df[df["label"] == "Over"]
+    under = df[df["label"] == "Under"]
+
+    # One row per player, sorted by name like groupby("description")
+    first_rows = df.dropna(subset=["description"]).drop_duplicates("description")
+    first_rows = first_rows.set_index("description").sort_index()
+
+    best_over = _best_price(over, over["price"])
+    best_under = _best_price(under, under["price"].abs())
+
+    return pd.DataFrame({
+        "Player": first_rows.index,
+        "Best_Over_Odds": best_over.reindex(first_rows.index).to_numpy(dtype=float),
+        "Best_Under_Odds": best_under.reindex(first_rows.index).to_numpy(dtype=float),
+        "Best_Point": first_rows["point"].to_numpy()
+    })
+
+def format_best_odds(cleaned_df):
+    """ Formats the best odds the way the Cleaned_Best_Odds files store them. """
+    cleaned_df = cleaned_df.copy()
+
+    # Ensure "Best_Point" has exactly 1 decimal place
+    cleaned_df["Best_Point"] = cleaned_df["Best_Point"].apply(lambda x: f"{x:.1f}" if pd.notna(x) else "")
+
+    # Ensure odds are formatted correctly (integers stay as integers)
+    cleaned_df["Best_Over_Odds"] = cleaned_df["Best_Over_Odds"].apply(lambda x: f"{int(x)}" if pd.notna(x) and x % 1 == 0 else f"{x}")
+    cleaned_df["Best_Under_Odds"] = cleaned_df["Best_Under_Odds"].apply(lambda x: f"{int(x)}" if pd.notna(x) and x % 1 == 0 else f"{x}")
+
+    return cleaned_df
+
+def add_player_ids(cleaned_df, source):
+    """ Resolves every player to its ID once, at ingestion, so later joins are on integers (misses are reported). """
+    cleaned_df.insert(1, "player_id", resolve_ids(cleaned_df["Player"]).to_numpy())
+    report_unmatched(cleaned_df["Player"], cleaned_df["player_id"], source)
+    return cleaned_df
+
+def clean_odds_file(file_path, output_file):
+    """ Reads a raw odds dump, picks the best lines and saves the Cleaned_Best_Odds file (Parquet, CSV optional). """
+    # Load the CSV file with manual column names
+    df = pd.read_csv(file_path, names=ODDS_COLUMNS, header=None)
+
+    # Standardize column names
+    df.columns = df.columns.str.strip().str.lower()
+
+    # Concatenated dumps repeat the header line mid-file; it isn't a player
+    df = df[df["label"] != "label"]
+
+    # Ensure price column is numeric
+    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    df["point"] = pd.to_numeric(df["point"], errors="coerce")  # Convert point column to float
+
+    # Pick the best lines for every player in one vectorized pass
+    cleaned_df = add_player_ids(get_best_odds(df), file_path)
+
+    # Typed for the next stage; the formatting is only for the optional CSV copy
+    write_table(cleaned_df, output_file, "cleaned_odds", csv_format=format_best_odds)
+    current_span().rows(rows_in=len(df), rows_out=len(cleaned_df))
+
+    print(f"✅ Cleaned file saved as: {parquet_path(output_file)}")
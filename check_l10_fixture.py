@@ -0,0 +1,44 @@
+import json
+import sys
+from datetime import datetime
+from nba_stats_to_csv import build_stat_rows, last_n_games, load_league_logs
+
+# League-wide playergamelogs response recorded from stub_stats_server.py (3 players, games up to 12/15/2024)
+FIXTURE_FILE = "fixtures/league_game_logs_2024-25.json"
+
+# L10 cutoff inside the fixture, so the date filter is exercised too
+UP_TO_DATE = datetime(2024, 11, 30)
+
+# Nikola Jokic's L10 points up to the cutoff, newest first, and their average (read off the fixture by hand)
+JOKIC_ID = 203999
+JOKIC_POINTS = [4, 30, 11, 6, 6, 14, 33, 27, 4, 36]
+JOKIC_AVERAGE = 17.1
+
+def expected_l10(data, player_id, up_to_date, n_games=10):
+    """ The player's last N games straight from the raw rows: filter, sort newest first, take N. """
+    result = data["resultSets"][0]
+    rows = [dict(zip(result["headers"], row)) for row in result["rowSet"]]
+    rows = [row for row in rows if row["PLAYER_ID"] == player_id and row["GAME_DATE"][:10] <= up_to_date.strftime("%Y-%m-%d")]
+    return sorted(rows, key=lambda row: row["GAME_DATE"], reverse=True)[:n_games]
+
+if __name__ == "__main__":
+    fixture = sys.argv[1] if len(sys.argv) > 1 else FIXTURE_FILE
+    with open(fixture, "r") as file:
+        data = json.load(file)
+
+    # The offline bulk path: recorded response -> PLAYER_ID-indexed table -> each player's L10
+    game_table = load_league_logs(fixture=fixture)
+    player_ids = sorted({row[1] for row in data["resultSets"][0]["rowSet"]})
+
+    for player_id in player_ids:
+        games_df = last_n_games(game_table, player_id, UP_TO_DATE)
+        expected = expected_l10(data, player_id, UP_TO_DATE)
+        for column in ("PTS", "REB", "AST"):
+            assert games_df[column].tolist() == [row[column] for row in expected], (player_id, column)
+
+    # Pinned values, so a change to both paths at once still shows up
+    stats_data = {"points": [], "assists": [], "rebounds": []}
+    build_stat_rows("Nikola Jokic", last_n_games(game_table, JOKIC_ID, UP_TO_DATE), stats_data)
+    assert stats_data["points"][0] == ["Nikola Jokic"] + JOKIC_POINTS + [JOKIC_AVERAGE], stats_data["points"][0]
+
+    print(f"✅ L10 from {fixture} matches the recorded games for {len(player_ids)} players")
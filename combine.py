@@ -1,9 +1,12 @@
 import pandas as pd
+from instrumentation import span
+from player_index import report_unmatched, resolve_ids
+from table_schema import parquet_path, read_table, write_table
 
 # Function to merge cleaned odds with L10 stats
 def merge_odds_l10(odds_file, l10_file, output_file, category):
     # Load the cleaned odds data
-    df_odds = pd.read_csv(odds_file)
+    df_odds = read_table(odds_file, "cleaned_odds")
 
     # Load the L10 stats
     df_l10 = pd.read_csv(l10_file)
@@ -12,18 +15,26 @@ def merge_odds_l10(odds_file, l10_file, output_file, category):
     df_odds.columns = df_odds.columns.str.strip().str.lower()
     df_l10.columns = df_l10.columns.str.strip().str.lower()
 
-    # Merge the datasets on "player"
-    merged_df = pd.merge(df_odds, df_l10, on="player", how="left")
+    # Join on the player ID (resolved when the odds were cleaned, here for the L10 names)
+    if "player_id" not in df_odds.columns:
+        df_odds["player_id"] = resolve_ids(df_odds["player"])
+    df_l10["player_id"] = resolve_ids(df_l10["player"])
+    report_unmatched(df_l10["player"], df_l10["player_id"], l10_file)
+
+    # Indexed join on the IDs (keeping the odds file's player name)
+    df_l10 = df_l10.dropna(subset=["player_id"]).drop_duplicates("player_id").set_index("player_id")
+    merged_df = df_odds.join(df_l10.drop(columns="player"), on="player_id")
 
     # Add category column
     merged_df["category"] = category
 
     # Save the merged dataset
-    merged_df.to_csv(output_file, index=False)
+    write_table(merged_df, output_file, "features")
 
-    print(f"✅ Merged file saved as: {output_file}")
+    print(f"✅ Merged file saved as: {parquet_path(output_file)}")
 
-# Process all three categories
-merge_odds_l10("Cleaned_Best_Odds_Rebounds.csv", "rebounds_l10.csv", "Merged_Rebounds.csv", "Rebounds")
-merge_odds_l10("Cleaned_Best_Odds_Points.csv", "points_l10.csv", "Merged_Points.csv", "Points")
-merge_odds_l10("Cleaned_Best_Odds_Assists.csv", "assists_l10.csv", "Merged_Assists.csv", "Assists")
+if __name__ == "__main__":
+    # Process all three categories
+    for category in ["Rebounds", "Points", "Assists"]:
+        with span(f"merge:{category}"):
+            merge_odds_l10(f"Cleaned_Best_Odds_{category}.csv", f"{category.lower()}_l10.csv", f"Merged_{category}.csv", category)
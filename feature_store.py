@@ -0,0 +1,221 @@
+import argparse
+import numpy as np
+import pandas as pd
+from instrumentation import current_span, span
+from player_index import report_unmatched, resolve_ids
+from table_schema import FEATURE_SCHEMA, GAME_COLUMNS, ODDS_COLUMNS, WINDOWS, parquet_path, read_table, write_table
+
+# The single feature table read by training (aitrain.py) and AIPRun.generate_projections
+FEATURE_FILE = "AI_Model_Data.parquet"
+
+# Box score column behind each prop category
+CATEGORY_STATS = {"Points": "PTS", "Rebounds": "REB", "Assists": "AST"}
+
+# Cleaned odds and L10 files per category
+ODDS_FILES = {
+    "Rebounds": "Cleaned_Best_Odds_Rebounds.csv",
+    "Points": "Cleaned_Best_Odds_Points.csv",
+    "Assists": "Cleaned_Best_Odds_Assists.csv"
+}
+L10_FILES = {"PTS": "points_L10.csv", "AST": "assists_L10.csv", "REB": "rebounds_L10.csv"}
+
+# EWMA span and the games behind recent_form (the rolling windows and columns are in table_schema)
+EWMA_SPAN = 5
+RECENT_GAMES = 3
+
+class GameHistory:
+    """ Every player's games as contiguous NumPy arrays: one (players x games) matrix per stat, newest game first. """
+
+    def __init__(self, player_ids, stats, dates=None):
+        self.player_ids = np.asarray(player_ids, dtype=np.int64)
+        self.stats = stats
+        self.dates = dates
+
+    @classmethod
+    def from_game_table(cls, game_table, max_games=82):
+        """ Builds the arrays from a PLAYER_ID-indexed game table (cache or league-wide pull). """
+        df = game_table.reset_index(drop=True).sort_values(["PLAYER_ID", "GAME_DATE"], ascending=[True, False])
+
+        # Row = player, column = games back from the newest one
+        player_ids, starts = np.unique(df["PLAYER_ID"].to_numpy(), return_index=True)
+        rows = np.repeat(np.arange(len(player_ids)), np.diff(np.append(starts, len(df))))
+        cols = np.arange(len(df)) - starts[rows]
+        keep = cols < max_games
+        width = int(cols[keep].max()) + 1 if keep.any() else 0
+
+        stats = {}
+        for column in ["MIN"] + list(CATEGORY_STATS.values()):
+            matrix = np.full((len(player_ids), width), np.nan)
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+            matrix[rows[keep], cols[keep]] = values[keep]
+            stats[column] = matrix
+
+        dates = np.full((len(player_ids), width), np.datetime64("NaT"), dtype="datetime64[ns]")
+        dates[rows[keep], cols[keep]] = df["GAME_DATE"].to_numpy(dtype="datetime64[ns]")[keep]
+
+        return cls(player_ids, stats, dates)
+
+    def as_of(self, day):
+        """ The history as it stood on the morning of `day`: games on or after it are dropped (needs dates). """
+        width = self.dates.shape[1]
+
+        # Newest first, so each player's games before `day` start after the ones being dropped
+        skip = (self.dates >= np.datetime64(pd.Timestamp(day), "ns")).sum(axis=1)
+        cols = skip[:, None] + np.arange(width)
+        valid = cols < width
+        cols = np.minimum(cols, max(width - 1, 0))
+
+        def shift(matrix, fill):
+            return np.where(valid, np.take_along_axis(matrix, cols, axis=1), fill)
+
+        stats = {column: shift(matrix, np.nan) for column, matrix in self.stats.items()}
+        return GameHistory(self.player_ids, stats, shift(self.dates, np.datetime64("NaT")))
+
+    @classmethod
+    def from_l10_files(cls, l10_files=L10_FILES):
+        """ Builds the arrays from the L10 CSV files (10 games, no minutes) when there's no cache. """
+        frames = {}
+        for column, file_path in l10_files.items():
+            df = pd.read_csv(file_path)
+            df.columns = df.columns.str.strip().str.lower()
+            df["player_id"] = resolve_ids(df["player"])
+            report_unmatched(df["player"], df["player_id"], file_path)
+            frames[column] = df.dropna(subset=["player_id"]).drop_duplicates("player_id")
+
+        player_ids = np.unique(np.concatenate([df["player_id"].to_numpy(dtype=np.int64) for df in frames.values()]))
+
+        stats = {"MIN": np.full((len(player_ids), 10), np.nan)}
+        for column, df in frames.items():
+            matrix = np.full((len(player_ids), 10), np.nan)
+            rows = np.searchsorted(player_ids, df["player_id"].to_numpy(dtype=np.int64))
+            matrix[rows] = df[GAME_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+            stats[column] = matrix
+
+        return cls(player_ids, stats)
+
+def _window_mean(matrix, n_games):
+    """ Mean of each player's last N games, ignoring missing games. """
+    window = matrix[:, :n_games]
+    counts = (~np.isnan(window)).sum(axis=1)
+    return np.where(counts > 0, np.nansum(window, axis=1) / np.maximum(counts, 1), np.nan)
+
+def _window_std(matrix, n_games):
+    """ Sample standard deviation of each player's last N games. """
+    window = matrix[:, :n_games]
+    counts = (~np.isnan(window)).sum(axis=1)
+    mean = _window_mean(matrix, n_games)
+    squares = np.nansum((window - mean[:, None]) ** 2, axis=1)
+    return np.where(counts > 1, np.sqrt(squares / np.maximum(counts - 1, 1)), np.nan)
+
+def _ewma(matrix, span=EWMA_SPAN):
+    """ Exponentially weighted mean with the newest game weighted most (pandas ewm(adjust=True)). """
+    alpha = 2 / (span + 1)
+    weights = (1 - alpha) ** np.arange(matrix.shape[1])
+    present = ~np.isnan(matrix)
+    total = (present * weights).sum(axis=1)
+    return np.where(total > 0, np.nansum(matrix * weights, axis=1) / np.where(total > 0, total, 1), np.nan)
+
+def _per36(matrix, minutes, n_games=10):
+    """ Stat per 36 minutes over the last N games that have both the stat and minutes. """
+    stat, mins = matrix[:, :n_games], minutes[:, :n_games]
+    both = ~np.isnan(stat) & ~np.isnan(mins)
+    total_minutes = np.where(both, mins, 0).sum(axis=1)
+    total_stat = np.where(both, stat, 0).sum(axis=1)
+    return np.where(total_minutes > 0, 36 * total_stat / np.where(total_minutes > 0, total_minutes, 1), np.nan)
+
+def compute_features(history):
+    """ Computes every rolling feature for every player and category in one batch pass. """
+    frames = []
+    for category, column in CATEGORY_STATS.items():
+        if column not in history.stats:
+            continue
+
+        matrix = history.stats[column]
+
+        # Pad to at least 10 columns so the game N columns always exist
+        if matrix.shape[1] < 10:
+            matrix = np.pad(matrix, ((0, 0), (0, 10 - matrix.shape[1])), constant_values=np.nan)
+
+        features = pd.DataFrame(matrix[:, :10], columns=GAME_COLUMNS)
+        features.insert(0, "player_id", history.player_ids)
+        features["category"] = category
+
+        # Same rounding as the L10 files' Average column
+        features["average"] = np.round(_window_mean(matrix, 10), 2)
+        for n_games in WINDOWS:
+            features[f"l{n_games}"] = _window_mean(matrix, n_games)
+        features["recent_form"] = _window_mean(matrix, RECENT_GAMES)
+        features["ewma"] = _ewma(matrix)
+        features["std"] = _window_std(matrix, 10)
+        features["per36"] = _per36(matrix, history.stats["MIN"])
+
+        frames.append(features)
+
+    return pd.concat(frames, ignore_index=True)
+
+def join_keys(categories, player_ids):
+    """ One int64 per (category, player ID) for integer joins; -1 where the player ID is missing. """
+    codes = pd.Series(categories).map({category: i for i, category in enumerate(CATEGORY_STATS)}).to_numpy(dtype=np.int64)
+    ids = pd.Series(player_ids, dtype="Int64").to_numpy(dtype=np.int64, na_value=-1)
+    return np.where(ids >= 0, codes << 32 | ids, -1)
+
+def build_feature_table(history, odds_files=ODDS_FILES):
+    """ Joins today's best odds to the rolling features and adds the odds-relative features (edge, projection). """
+    odds_frames = []
+    for category, odds_file in odds_files.items():
+        df = read_table(odds_file, "cleaned_odds")
+        df.columns = df.columns.str.strip().str.lower()
+        df["category"] = category
+
+        # Cleaned files carry the IDs resolved at ingestion; older (archived) ones get them here
+        if "player_id" not in df.columns:
+            df["player_id"] = resolve_ids(df["player"])
+            report_unmatched(df["player"], df["player_id"], odds_file)
+        odds_frames.append(df)
+
+    odds = pd.concat(odds_frames, ignore_index=True)
+    odds["player_id"] = odds["player_id"].astype("Int64")
+    for col in ODDS_COLUMNS:
+        odds[col] = pd.to_numeric(odds[col], errors="coerce")
+
+    # Integer-keyed lookup into the features (unique keys, so a left join is a reindex)
+    features = compute_features(history)
+    features.index = join_keys(features["category"], features["player_id"])
+    matched = features.drop(columns=["player_id", "category"]).reindex(join_keys(odds["category"], odds["player_id"]))
+    table = pd.concat([odds, matched.reset_index(drop=True)], axis=1)
+
+    stage = current_span()
+    stage.rows(rows_in=len(odds), rows_out=len(table))
+    stage.count("players_without_history", int(table["average"].isna().sum()))
+
+    # Line-relative features
+    table["edge"] = table["average"] - table["best_point"]
+    table["projection"] = (table["average"] + table["best_point"]) / 2
+
+    return table[list(FEATURE_SCHEMA)]
+
+def write_feature_table(table, output_file=FEATURE_FILE):
+    write_table(table, output_file, FEATURE_SCHEMA)
+    print(f"✅ Feature table saved as: {parquet_path(output_file)} ({len(table)} rows)")
+
+def read_feature_table(file_path=FEATURE_FILE):
+    """ Reads the feature table back with its column types. """
+    return read_table(file_path, FEATURE_SCHEMA)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the feature table from cached game logs (or the L10 files).")
+    parser.add_argument("--cache", nargs="?", const="gamelog_cache.sqlite", default=None,
+                        help="Read game history from the game-log cache instead of the L10 files")
+    parser.add_argument("--season", default="2024-25")
+    parser.add_argument("--season-type", default="Regular Season")
+    parser.add_argument("--output", default=FEATURE_FILE)
+    args = parser.parse_args()
+
+    with span("features", source="cache" if args.cache else "l10"):
+        if args.cache:
+            from gamelog_cache import GameLogCache
+            history = GameHistory.from_game_table(GameLogCache(args.cache).game_table(args.season, args.season_type))
+        else:
+            history = GameHistory.from_l10_files()
+
+        write_feature_table(build_feature_table(history), args.output)
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+# File layout: MAGIC, 8-byte header length, JSON header, then 64-byte aligned flat arrays
+MAGIC = b"NBAFOREST2\n"
+ALIGN = 64
+
+def forest_path(model_file):
+    """ AI_Model_Points.pkl -> AI_Model_Points.forest """
+    return os.path.splitext(model_file)[0] + ".forest"
+
+def _sibling_order(tree):
+    """ Breadth-first node order in which every right child sits right after its left child. """
+    order, level = [], np.array([0])
+    while len(level):
+        order.append(level)
+        internal = level[tree.children_left[level] >= 0]
+        level = np.column_stack([tree.children_left[internal], tree.children_right[internal]]).ravel()
+    return np.concatenate(order)
+
+def compile_model(model):
+    """
+    Flattens a Pipeline(StandardScaler, RandomForestRegressor) (or a bare forest)
+    into node arrays, keeping the scaler's mean and scale to apply at predict time.
+
+    Nodes are laid out so a right child is always left + 1, and leaves loop
+    back onto themselves (threshold +inf), so prediction needs no leaf checks.
+    """
+    scaler, forest = None, model
+    if hasattr(model, "named_steps"):
+        scaler, forest = model.steps[0][1], model.steps[-1][1]
+
+    n_features = forest.n_features_in_
+    scale, mean = np.ones(n_features), np.zeros(n_features)
+    if scaler is not None:
+        scale = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else scale
+        mean = scaler.mean_ if scaler.with_mean and scaler.mean_ is not None else mean
+
+    feature, threshold, left, missing_left, value, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        order = _sibling_order(tree)
+        position = np.empty(tree.node_count, dtype=np.int64)
+        position[order] = np.arange(tree.node_count) + offset
+
+        is_leaf = tree.children_left[order] < 0
+        tree_feature = np.where(is_leaf, 0, tree.feature[order])
+
+        # Thresholds stay on the scaled float32 values sklearn compares (folding the scaler
+        # into them flips ties, and slate values often equal training values exactly)
+        tree_threshold = tree.threshold[order]
+
+        tree_missing = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8))[order]
+
+        feature.append(tree_feature)
+        threshold.append(np.where(is_leaf, np.inf, tree_threshold))
+        left.append(np.where(is_leaf, position[order], position[np.maximum(tree.children_left[order], 0)]))
+        missing_left.append(np.where(is_leaf, 1, tree_missing))
+        value.append(tree.value[order, :, 0])
+        roots.append(offset)
+        offset += tree.node_count
+
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "missing_left": np.concatenate(missing_left).astype(np.uint8),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": np.array(roots, dtype=np.int32),
+        "mean": np.asarray(mean, dtype=np.float64),
+        "scale": np.asarray(scale, dtype=np.float64)
+    }
+    meta = {
+        "feature_names": [str(name) for name in getattr(model, "feature_names_in_", [])],
+        "max_depth": int(max(estimator.tree_.max_depth for estimator in forest.estimators_)),
+        "n_outputs": int(arrays["value"].shape[1])
+    }
+    return arrays, meta
+
+def save_compiled(model, output_file):
+    """ Writes the compiled forest as one memory-mappable file. """
+    arrays, meta = compile_model(model)
+
+    # Lay the arrays out back to back, each aligned, and describe them in the header
+    layout, position = {}, 0
+    for name, array in arrays.items():
+        layout[name] = {"offset": position, "dtype": array.dtype.str, "shape": list(array.shape)}
+        position += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps({**meta, "arrays": layout}).encode()
+
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+    with open(output_file, "wb") as file:
+        file.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for name, array in arrays.items():
+            file.seek(data_start + layout[name]["offset"])
+            file.write(np.ascontiguousarray(array).tobytes())
+
+    print(f"✅ Compiled forest saved as: {output_file} ({os.path.getsize(output_file) / 1024:.0f} KB)")
+
+class CompiledForest:
+    """ Memory-mapped flat forest with a NumPy predictor that walks every tree for the whole batch at once. """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a compiled forest file")
+            header_length = int.from_bytes(file.read(8), "little")
+            meta = json.loads(file.read(header_length))
+
+        data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGN) * ALIGN
+        for name, spec in meta["arrays"].items():
+            array = np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="r",
+                              offset=data_start + spec["offset"], shape=tuple(spec["shape"]))
+            setattr(self, name, array)
+
+        # The index arrays are small; as intp they're gathered with no per-step cast
+        self.feature = np.asarray(self.feature, dtype=np.intp)
+        self.left = np.asarray(self.left, dtype=np.intp)
+
+        self.feature_names_in_ = np.array(meta["feature_names"], dtype=object)
+        self.max_depth = meta["max_depth"]
+        self.n_outputs = meta["n_outputs"]
+
+    def predict(self, X, chunk_size=512):
+        if isinstance(X, pd.DataFrame) and len(self.feature_names_in_):
+            X = X[list(self.feature_names_in_)]
+
+        # As sklearn does: scale in the input's float type (float64 unless it's all float32),
+        # then the trees compare float32 values against the thresholds
+        X = np.asarray(X)
+        X = X if X.dtype == np.float32 else X.astype(np.float64)
+        X = ((X - self.mean.astype(X.dtype)) / self.scale.astype(X.dtype)).astype(np.float32).astype(np.float64)
+
+        # Chunks keep the (trees x samples) work arrays in cache
+        predictions = np.concatenate([
+            self._predict_chunk(X[start:start + chunk_size]) for start in range(0, len(X), chunk_size)
+        ]) if len(X) else np.empty((0, self.n_outputs))
+
+        return predictions[:, 0] if self.n_outputs == 1 else predictions
+
+    def _predict_chunk(self, X):
+        # One current node per (tree, sample); every step moves all of them one level down
+        X_t = np.ascontiguousarray(X.T)
+        has_nan = np.isnan(X_t).any()
+        nodes = np.repeat(np.asarray(self.roots)[:, None], len(X), axis=1)
+        samples = np.arange(len(X))[None, :]
+
+        for _ in range(self.max_depth):
+            x = X_t[self.feature[nodes], samples]
+            go_right = ~(x <= self.threshold[nodes])
+
+            if has_nan:
+                missing = np.isnan(x)
+                go_right[missing] = self.missing_left[nodes[missing]] == 0
+
+            nodes = self.left[nodes] + go_right
+
+        return self.value[nodes].mean(axis=0)
+
+def load_model(model_file):
+    """ Loads the compiled forest when it's at least as new as the pickle, otherwise the pickle itself. """
+    compiled = forest_path(model_file)
+
+    if os.path.exists(compiled) and os.path.getmtime(compiled) >= os.path.getmtime(model_file):
+        try:
+            return CompiledForest(compiled)
+        except ValueError:
+            # Compiled by an older version of this module: rerun forest_compile.py to refresh it
+            print(f"⚠️ {compiled} is out of date, loading {model_file} instead")
+
+    return joblib.load(model_file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile trained forest pickles into flat .forest files.")
+    parser.add_argument("models", nargs="*", default=["AI_Model_Rebounds.pkl", "AI_Model_Assists.pkl", "AI_Model_Points.pkl"])
+    args = parser.parse_args()
+
+    for model_file in args.models:
+        save_compiled(joblib.load(model_file), forest_path(model_file))
@@ -0,0 +1,160 @@
+import argparse
+import sqlite3
+from datetime import date
+import pandas as pd
+
+# Bump when the table layout changes so old cache files get rebuilt
+CACHE_VERSION = 1
+CACHE_FILE = "gamelog_cache.sqlite"
+
+# Fetch markers for league-wide pulls use this in place of a player ID
+LEAGUE = 0
+
+# Game log columns kept in the cache (besides the keys)
+STAT_COLUMNS = ["MIN", "PTS", "AST", "REB"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    season TEXT NOT NULL,
+    season_type TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    game_id TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    min NUMERIC, pts NUMERIC, ast NUMERIC, reb NUMERIC,
+    PRIMARY KEY (season, season_type, player_id, game_id)
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    season TEXT NOT NULL,
+    season_type TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    fetched_on TEXT NOT NULL,
+    PRIMARY KEY (season, season_type, player_id)
+);
+"""
+
+class GameLogCache:
+    """ Persistent game-log store (SQLite), keyed by season, player ID and game ID. """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            # Old layout (or a brand new file): start from scratch
+            self.conn.executescript("DROP TABLE IF EXISTS games; DROP TABLE IF EXISTS fetches;")
+            self.conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+
+        self.conn.executescript(SCHEMA)
+
+    def fetched_on(self, player_id, season, season_type):
+        """ Day (YYYY-MM-DD) this player was last fetched, counting league-wide pulls, or None. """
+        row = self.conn.execute(
+            "SELECT MAX(fetched_on) FROM fetches WHERE season = ? AND season_type = ? AND player_id IN (?, ?)",
+            (season, season_type, player_id, LEAGUE)
+        ).fetchone()
+        return row[0]
+
+    def newest_game_date(self, season, season_type, player_id=None):
+        """ Newest cached GAME_DATE for a player (or the whole league), or None. """
+        query = "SELECT MAX(game_date) FROM games WHERE season = ? AND season_type = ?"
+        params = [season, season_type]
+
+        if player_id is not None:
+            query += " AND player_id = ?"
+            params.append(player_id)
+
+        newest = self.conn.execute(query, params).fetchone()[0]
+        return pd.Timestamp(newest) if newest else None
+
+    def store(self, games_df, season, season_type, fetched_ids):
+        """ Upserts fetched games and marks the given player IDs (or LEAGUE) as fetched today. """
+        rows = []
+        if not games_df.empty:
+            rows = zip(
+                [season] * len(games_df), [season_type] * len(games_df),
+                games_df["PLAYER_ID"].astype(int), games_df["GAME_ID"].astype(str),
+                games_df["GAME_DATE"].dt.strftime("%Y-%m-%d"),
+                *[pd.to_numeric(games_df[col], errors="coerce").astype(object) for col in STAT_COLUMNS]
+            )
+
+        today = date.today().isoformat()
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?)",
+                [(season, season_type, int(player_id), today) for player_id in fetched_ids]
+            )
+
+    def game_table(self, season, season_type):
+        """ All cached games of a season as a PLAYER_ID-indexed table (newest games first). """
+        games_df = pd.read_sql_query(
+            "SELECT player_id AS PLAYER_ID, game_id AS GAME_ID, game_date AS GAME_DATE, "
+            "min AS MIN, pts AS PTS, ast AS AST, reb AS REB FROM games "
+            "WHERE season = ? AND season_type = ? ORDER BY player_id, game_date DESC",
+            self.conn, params=(season, season_type), parse_dates=["GAME_DATE"]
+        )
+        return games_df.set_index("PLAYER_ID", drop=False)
+
+    def check(self):
+        """ Runs the integrity checks. Returns a list of problems (empty when healthy). """
+        problems = []
+
+        result = self.conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            problems.append(f"SQLite integrity check failed: {result}")
+
+        bad_dates = self.conn.execute(
+            "SELECT COUNT(*) FROM games WHERE date(game_date) IS NULL OR date(game_date) != game_date"
+        ).fetchone()[0]
+        if bad_dates:
+            problems.append(f"{bad_dates} games have an invalid GAME_DATE")
+
+        future = self.conn.execute(
+            "SELECT COUNT(*) FROM games WHERE game_date > ?", (date.today().isoformat(),)
+        ).fetchone()[0]
+        if future:
+            problems.append(f"{future} games are dated in the future")
+
+        unfetched = self.conn.execute(
+            "SELECT COUNT(DISTINCT g.player_id) FROM games g LEFT JOIN fetches f "
+            "ON f.season = g.season AND f.season_type = g.season_type AND f.player_id IN (g.player_id, ?) "
+            "WHERE f.player_id IS NULL", (LEAGUE,)
+        ).fetchone()[0]
+        if unfetched:
+            problems.append(f"{unfetched} players have games but no fetch record")
+
+        return problems
+
+    def invalidate(self, season=None):
+        """ Deletes cached games and fetch markers (one season, or everything). """
+        with self.conn:
+            if season:
+                self.conn.execute("DELETE FROM games WHERE season = ?", (season,))
+                self.conn.execute("DELETE FROM fetches WHERE season = ?", (season,))
+            else:
+                self.conn.execute("DELETE FROM games")
+                self.conn.execute("DELETE FROM fetches")
+
+    def close(self):
+        self.conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check or invalidate the local game-log cache.")
+    parser.add_argument("command", choices=["check", "invalidate"])
+    parser.add_argument("--season", default=None, help="Only invalidate this season (default: everything)")
+    parser.add_argument("--cache", default=CACHE_FILE, help="Cache file")
+    args = parser.parse_args()
+
+    cache = GameLogCache(args.cache)
+
+    if args.command == "check":
+        problems = cache.check()
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print(f"✅ {args.cache} passed all integrity checks")
+    else:
+        cache.invalidate(args.season)
+        print(f"🗑️ Invalidated {args.season or 'all seasons'} in {args.cache}")
+
+    cache.close()
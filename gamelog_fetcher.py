@@ -0,0 +1,135 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from instrumentation import current_span
+
+# Base URL of the NBA Stats API (point it at a local stub server for testing)
+STATS_URL = "https://stats.nba.com/stats"
+
+# Responses worth retrying: rate limited or server-side errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """ Thread-safe token bucket: allows `rate` requests per second with bursts of up to `capacity`. """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """ Blocks until a token is available, then takes it. """
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+class GameLogFetcher:
+    """ Fetches game logs concurrently over one pooled keep-alive session. """
+
+    def __init__(self, headers, base_url=STATS_URL, workers=8, rate=5.0, burst=None,
+                 timeout=10.0, max_retries=4, backoff=1.0):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate, burst)
+
+        # One session shared by all workers, with a connection pool big enough for all of them
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _retry_delay(self, attempt, response=None):
+        """ Exponential backoff with full jitter (honors a numeric Retry-After header). """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    def get_json(self, endpoint, params):
+        """ GETs an endpoint with rate limiting and retries. Returns the JSON body or None. """
+        url = f"{self.base_url}/{endpoint}"
+        stage = current_span()
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            response = None
+            stage.count("http_requests")
+            start = time.perf_counter()
+
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = str(e)
+                stage.count("http_errors")
+            else:
+                stage.observe("http_latency_ms", (time.perf_counter() - start) * 1000)
+                stage.count(f"http_status_{response.status_code}")
+                if response.status_code == 200:
+                    return response.json()
+
+                error = f"Status Code: {response.status_code}"
+                if response.status_code not in RETRY_STATUSES:
+                    break
+
+            if attempt < self.max_retries:
+                stage.count("http_retries")
+                time.sleep(self._retry_delay(attempt, response))
+
+        stage.count("http_failures")
+        print(f"⚠️ API Request Failed for {endpoint} {params}! {error}")
+        return None
+
+    def fetch_player_logs(self, player_ids, season="2024-25", season_type="Regular Season", date_from=None):
+        """
+        Fetches the season game logs of every player at once. Returns {player_id: json or None}.
+
+        `date_from` optionally maps player IDs to a DateFrom (MM/DD/YYYY) for delta fetches.
+        """
+        def fetch(player_id):
+            params = {"PlayerID": player_id, "Season": season, "SeasonType": season_type}
+            if date_from and date_from.get(player_id):
+                params["DateFrom"] = date_from[player_id]
+            return player_id, self.get_json("playergamelogs", params)
+
+        # Each request runs in a copy of the caller's context so it records into the caller's span
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, fetch, player_id) for player_id in player_ids]
+            return dict(future.result() for future in futures)
+
+    def fetch_league_logs(self, season="2024-25", season_type="Regular Season", date_from=None, date_to=None):
+        """ Fetches every player's game logs for a season (or a date range) in one request. """
+        params = {"Season": season, "SeasonType": season_type}
+
+        if date_from:
+            params["DateFrom"] = date_from
+        if date_to:
+            params["DateTo"] = date_to
+
+        return self.get_json("playergamelogs", params)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import joblib
+import numpy as np
+import pandas as pd
+from instrumentation import span
+
+# Local address of the service (Streamlit already uses 8501)
+HOST = "127.0.0.1"
+PORT = 8502
+SERVICE_URL = f"http://{HOST}:{PORT}"
+
+# Models kept resident, by file name; rows can name a category instead of a model file
+CATEGORY_MODELS = {
+    "Rebounds": "AI_Model_Rebounds.pkl",
+    "Assists": "AI_Model_Assists.pkl",
+    "Points": "AI_Model_Points.pkl"
+}
+MODEL_FILES = list(CATEGORY_MODELS.values()) + ["AI_Projection_Model.pkl"]
+
+# How often the service checks the pickles for changes (seconds)
+RELOAD_INTERVAL = 1.0
+
+class UnknownModel(KeyError):
+    """ A request named a model file (or category) the service doesn't hold. """
+
+class ModelRegistry:
+    """
+    Keeps every model loaded and reloads a model when its pickle changes on disk.
+
+    Models are keyed by their file's real path, so a different file that shares
+    the name (another folder, a retrained copy) never gets a resident model's predictions.
+    """
+
+    def __init__(self, model_files=MODEL_FILES):
+        self.model_files = [os.path.realpath(f) for f in model_files if os.path.exists(f)]
+        self.models = {}
+        self.mtimes = {}
+        self.lock = threading.Lock()
+
+        for model_file in self.model_files:
+            self._load(model_file)
+
+    def _load(self, model_file):
+        """ Loads a model and checks it can tell us which features it expects. """
+        mtime = os.path.getmtime(model_file)
+        model = joblib.load(model_file)
+
+        if not hasattr(model, "feature_names_in_"):
+            raise ValueError(f"{model_file} has no feature_names_in_ (train it on a DataFrame)")
+
+        with self.lock:
+            self.models[model_file] = model
+            self.mtimes[model_file] = mtime
+
+        print(f"✅ Model loaded: {model_file} -> {list(model.feature_names_in_)}")
+
+    def reload_if_changed(self):
+        for model_file in self.model_files:
+            try:
+                if os.path.getmtime(model_file) != self.mtimes.get(model_file):
+                    print(f"♻️ {model_file} changed, reloading...")
+                    self._load(model_file)
+            except Exception as e:
+                # Keep serving the old model if the new pickle is half-written or broken
+                print(f"❌ Reload of {model_file} failed: {e}")
+
+    def watch(self, interval=RELOAD_INTERVAL):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def describe(self):
+        with self.lock:
+            return {
+                model_file: {
+                    "features": list(self.models[model_file].feature_names_in_),
+                    "mtime": self.mtimes[model_file]
+                }
+                for model_file in self.model_files
+            }
+
+    def predict(self, rows):
+        """
+        Predicts a batch of rows that may mix categories/models.
+
+        Each row is a dict of feature values plus "model" (a model file's real
+        path) or "category", and optionally "best_point" to get the edge back.
+        """
+        df = pd.DataFrame(rows)
+        if "model" not in df.columns:
+            df["model"] = None
+        if "category" in df.columns:
+            df["model"] = df["model"].fillna(df["category"].map({c: os.path.realpath(f) for c, f in CATEGORY_MODELS.items()}))
+
+        projections = np.full(len(df), np.nan)
+
+        with self.lock:
+            models = dict(self.models)
+
+        for model_file, group in df.groupby("model", dropna=False):
+            if model_file not in models:
+                raise UnknownModel(f"Unknown model or category: {model_file}")
+
+            model = models[model_file]
+            missing = [col for col in model.feature_names_in_ if col not in group.columns]
+            if missing:
+                raise KeyError(f"Rows for {model_file} are missing features: {missing}")
+
+            features = group[list(model.feature_names_in_)].apply(pd.to_numeric, errors="coerce")
+            projections[group.index.to_numpy()] = model.predict(features)
+
+        best_point = np.full(len(df), np.nan)
+        if "best_point" in df.columns:
+            best_point = pd.to_numeric(df["best_point"], errors="coerce").to_numpy(dtype=float)
+
+        return {"projections": projections.tolist(), "edges": (projections - best_point).tolist()}
+
+def make_handler(registry):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                return self._send(200, {"status": "ok", "models": registry.describe()})
+            return self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                return self._send(404, {"error": "not found"})
+
+            with span("inference:predict") as stage:
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    stage.rows(rows_in=len(body["rows"]))
+                    return self._send(200, registry.predict(body["rows"]))
+                except UnknownModel as e:
+                    stage.count("unknown_models")
+                    return self._send(404, {"error": str(e)})
+                except (KeyError, ValueError) as e:
+                    stage.count("bad_requests")
+                    return self._send(400, {"error": str(e)})
+
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet
+
+    return Handler
+
+def predict_with_service(model_file, features, url=SERVICE_URL, timeout=30):
+    """
+    Asks the running inference service for projections.
+
+    Returns an array of projections, or None when the service isn't running
+    (so callers can fall back to joblib.load + predict).
+    """
+    rows = features.assign(model=os.path.realpath(model_file)).to_dict("records")
+
+    request = urllib.request.Request(
+        f"{url}/predict", data=json.dumps({"rows": rows}).encode(),
+        headers={"Content-Type": "application/json"}, method="POST"
+    )
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return np.array(json.loads(response.read())["projections"], dtype=float)
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None  # The service doesn't hold this model file
+        print(f"⚠️ Inference service rejected the batch: {e.read().decode()}")
+        return None
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return None  # Service not running
+
+def serve(host=HOST, port=PORT, model_files=MODEL_FILES):
+    registry = ModelRegistry(model_files)
+    registry.watch()
+
+    server = ThreadingHTTPServer((host, port), make_handler(registry))
+    print(f"🚀 Inference service running at http://{host}:{port} (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep the AI models loaded and serve batched projections.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--models", nargs="+", default=MODEL_FILES, help="Model pickles to keep resident")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.models)
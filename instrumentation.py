@@ -0,0 +1,253 @@
+import argparse
+import contextvars
+import cProfile
+import fnmatch
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Where spans are appended as JSON lines ("" turns recording off)
+METRICS_FILE = os.environ.get("NBA_METRICS_FILE", "metrics.jsonl")
+
+# Spans to profile, as comma-separated name patterns (e.g. "predict:*,clean_odds"), and with what
+PROFILE_STAGES = [p for p in os.environ.get("NBA_PROFILE", "").split(",") if p]
+PROFILER = os.environ.get("NBA_PROFILER", "cprofile")
+PROFILE_DIR = os.environ.get("NBA_PROFILE_DIR", "profiles")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is everything slower
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# One ID per run, shared with worker processes through the environment
+RUN_ID = os.environ.setdefault("NBA_RUN_ID", uuid.uuid4().hex[:12])
+
+_current = contextvars.ContextVar("span", default=None)
+_write_lock = threading.Lock()
+_profiling = threading.Lock()
+
+def peak_rss_mb():
+    """ Peak resident set size of this process so far (None where the OS doesn't report it). """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # bytes on macOS, KB on Linux
+
+class Span:
+    """ Measurements of one stage: counters, latency histograms, cache hits and rows in/out. Thread-safe. """
+
+    def __init__(self, name, fields=None, parent=None):
+        self.name = name
+        self.fields = fields or {}
+        self.parent = parent
+        self.rows_in = None
+        self.rows_out = None
+        self.counters = {}
+        self.histograms = {}
+        self.caches = {}
+        self.lock = threading.Lock()
+
+    def rows(self, rows_in=None, rows_out=None):
+        if rows_in is not None:
+            self.rows_in = int(rows_in)
+        if rows_out is not None:
+            self.rows_out = int(rows_out)
+
+    def count(self, counter, n=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def observe(self, histogram, milliseconds):
+        """ Adds one latency sample (ms) to a histogram. """
+        with self.lock:
+            hist = self.histograms.setdefault(histogram, {
+                "count": 0, "sum_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            })
+            hist["count"] += 1
+            hist["sum_ms"] += milliseconds
+            hist["max_ms"] = max(hist["max_ms"], milliseconds)
+            hist["buckets"][sum(milliseconds > bound for bound in LATENCY_BUCKETS_MS)] += 1
+
+    def note(self, field, values):
+        """ Adds values to a list field written with the span (e.g. the names a stage couldn't match). """
+        with self.lock:
+            self.fields.setdefault(field, []).extend(values)
+
+    def cache(self, cache_name, hit):
+        """ Records one lookup in a cache as a hit or a miss. """
+        with self.lock:
+            hits, misses = self.caches.get(cache_name, (0, 0))
+            self.caches[cache_name] = (hits + bool(hit), misses + (not hit))
+
+    def record(self):
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "counters": self.counters,
+            "latency": {
+                name: {**hist, "mean_ms": hist["sum_ms"] / hist["count"], "bucket_bounds_ms": LATENCY_BUCKETS_MS}
+                for name, hist in self.histograms.items()
+            },
+            "caches": {
+                name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+                for name, (hits, misses) in self.caches.items()
+            }
+        }
+
+class _DetachedSpan(Span):
+    """ Stands in for the current span outside of any: measurements made there are dropped, so nothing piles up. """
+
+    def rows(self, rows_in=None, rows_out=None):
+        pass
+
+    def count(self, counter, n=1):
+        pass
+
+    def observe(self, histogram, milliseconds):
+        pass
+
+    def note(self, field, values):
+        pass
+
+    def cache(self, cache_name, hit):
+        pass
+
+_detached = _DetachedSpan("detached")
+
+def current_span():
+    """ The innermost open span, so library code can record into it without being handed it. """
+    return _current.get() or _detached
+
+def _should_profile(name):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in PROFILE_STAGES)
+
+def _start_profiler(name):
+    """ Starts cProfile (or pyinstrument) for a span picked by NBA_PROFILE; one profiled span at a time. """
+    if not PROFILE_STAGES or not _should_profile(name) or not _profiling.acquire(blocking=False):
+        return None
+
+    if PROFILER == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        except ImportError:
+            print("⚠️ pyinstrument isn't installed, using cProfile")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def _stop_profiler(profiler, name):
+    """ Stops the profiler and saves its output under PROFILE_DIR. Returns the file path. """
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(PROFILE_DIR, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}-{RUN_ID}-{os.getpid()}")
+
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            profiler.dump_stats(f"{stem}.prof")
+            return f"{stem}.prof"
+
+        profiler.stop()
+        with open(f"{stem}.html", "w") as file:
+            file.write(profiler.output_html())
+        return f"{stem}.html"
+    finally:
+        _profiling.release()
+
+def write_record(record, metrics_file=None):
+    metrics_file = METRICS_FILE if metrics_file is None else metrics_file
+    if not metrics_file:
+        return
+
+    line = json.dumps(record, default=str)
+    with _write_lock, open(metrics_file, "a") as file:
+        file.write(line + "\n")
+
+@contextmanager
+def span(name, **fields):
+    """
+    Measures a stage and appends it to the metrics file as one JSON line when it ends:
+    wall and CPU time, peak RSS, rows in/out, counters, latency histograms and cache
+    hit rates, plus the status (and error) and any extra fields given here.
+    """
+    parent = _current.get()
+    current = Span(name, fields, parent)
+    token = _current.set(current)
+    profiler = _start_profiler(name)
+
+    status, error = "ok", None
+    started = datetime.now(timezone.utc)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield current
+    except BaseException as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        profile_file = _stop_profiler(profiler, name) if profiler is not None else None
+        _current.reset(token)
+
+        write_record({
+            "run_id": RUN_ID,
+            "span": name,
+            "parent": parent.name if parent else None,
+            "started": started.isoformat(timespec="milliseconds"),
+            "status": status,
+            "error": error,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_rss_mb": peak_rss_mb(),
+            "pid": os.getpid(),
+            **current.fields,
+            **current.record(),
+            "profile": profile_file
+        })
+
+def traced(name, func, *args, **kwargs):
+    """ Calls func inside a span of its own (for pool.submit / pool.map targets). """
+    with span(name):
+        return func(*args, **kwargs)
+
+def read_metrics(metrics_file=METRICS_FILE):
+    with open(metrics_file, "r") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def summarize(records):
+    """ Per-span totals over the given records: runs, errors, wall/CPU time, rows and peak RSS. """
+    import pandas as pd
+
+    df = pd.DataFrame(records)
+    return df.groupby("span").agg(
+        runs=("span", "size"),
+        errors=("status", lambda s: (s == "error").sum()),
+        wall_s=("wall_s", "sum"),
+        cpu_s=("cpu_s", "sum"),
+        rows_in=("rows_in", "sum"),
+        rows_out=("rows_out", "sum"),
+        peak_rss_mb=("peak_rss_mb", "max")
+    ).sort_values("wall_s", ascending=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the spans in a metrics file.")
+    parser.add_argument("metrics_file", nargs="?", default=METRICS_FILE or "metrics.jsonl")
+    parser.add_argument("--run", default=None, help="Only this run ID (default: the latest run)")
+    args = parser.parse_args()
+
+    records = read_metrics(args.metrics_file)
+    run_id = args.run or records[-1]["run_id"]
+    print(f"📈 Run {run_id}:")
+    print(summarize([r for r in records if r["run_id"] == run_id]).round(3).to_string())
@@ -0,0 +1,336 @@
+import argparse
+import bisect
+import json
+import os
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from instrumentation import current_span, span
+from player_index import get_player_id, get_player_name
+from table_schema import parquet_path, read_table
+
+# One folder per category, one segment file per (UTC) day
+HISTORY_DIR = "line_history"
+
+# Book IDs (position in the list); "best" is the best line across books, as in the Cleaned_Best_Odds files
+BOOKS_FILE = "books.json"
+DEFAULT_BOOK = "best"
+
+# One fixed-size record per line change: 18 bytes, appended in time order
+RECORD_DTYPE = np.dtype([
+    ("ts", "<u4"),          # Unix seconds
+    ("player_id", "<i4"),
+    ("book", "u1"),
+    ("flags", "u1"),
+    ("point", "<f4"),
+    ("over", "<i2"),        # American odds, NO_PRICE when missing
+    ("under", "<i2")
+])
+
+NO_PRICE = np.iinfo(np.int16).min
+
+# Record flags: the line was pulled / the record repeats the previous day's state at the start of a segment
+REMOVED = 1
+CARRIED = 2
+
+def _key(records):
+    """ One int64 per (player ID, book). """
+    return records["player_id"].astype(np.int64) << 8 | records["book"]
+
+def _day(ts):
+    return datetime.fromtimestamp(int(ts), timezone.utc).strftime("%Y-%m-%d")
+
+def _day_start(day):
+    return int(datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+def _same_line(a, b):
+    same_point = (a["point"] == b["point"]) | (np.isnan(a["point"]) & np.isnan(b["point"]))
+    return same_point & (a["over"] == b["over"]) & (a["under"] == b["under"])
+
+def _to_frame(records):
+    return pd.DataFrame({
+        "player_id": records["player_id"].astype(np.int64),
+        "book": records["book"].astype(np.int64),
+        "point": records["point"].astype(float),
+        "over": np.where(records["over"] == NO_PRICE, np.nan, records["over"]),
+        "under": np.where(records["under"] == NO_PRICE, np.nan, records["under"]),
+        "ts": pd.to_datetime(records["ts"].astype(np.int64), unit="s", utc=True)
+    })
+
+def _last_per_key(records):
+    """ The latest record of every key (records in time order), pulled lines dropped. """
+    if len(records) == 0:
+        return records[:0]
+
+    _, last = np.unique(_key(records)[::-1], return_index=True)
+    latest = records[len(records) - 1 - last]
+    return latest[(latest["flags"] & REMOVED) == 0]
+
+def _first_per_key(records):
+    _, first = np.unique(_key(records), return_index=True)
+    return records[np.sort(first)]
+
+class LineHistory:
+    """
+    Append-only store of odds snapshots, keyed by (player ID, category, book).
+
+    Only changes are written: a snapshot adds one record per line that moved,
+    appeared or was pulled. Every day gets its own memory-mapped segment per
+    category that starts with the state carried over from the day before, so
+    "line at time T" reads one segment (binary search on the timestamps) and
+    never the whole season.
+    """
+
+    def __init__(self, path=HISTORY_DIR):
+        self.path = path
+        self.books = [DEFAULT_BOOK]
+        self._latest = {}
+
+        books_file = os.path.join(path, BOOKS_FILE)
+        if os.path.exists(books_file):
+            with open(books_file, "r") as file:
+                self.books = json.load(file)
+
+    # --- Segments ---
+
+    def days(self, category):
+        folder = os.path.join(self.path, category)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-4] for name in os.listdir(folder) if name.endswith(".bin"))
+
+    def segment_path(self, category, day):
+        return os.path.join(self.path, category, f"{day}.bin")
+
+    def segment(self, category, day):
+        """ A day's records as a read-only memory map (a trailing partial record from a crash is ignored). """
+        path = self.segment_path(category, day)
+        n_records = os.path.getsize(path) // RECORD_DTYPE.itemsize if os.path.exists(path) else 0
+        if n_records == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(n_records,))
+
+    def _segment_for(self, category, ts):
+        """ The segment holding the state at ts: that day's, or the last one before it. """
+        days = self.days(category)
+        position = bisect.bisect_right(days, _day(ts))
+        return (days[position - 1], self.segment(category, days[position - 1])) if position else (None, None)
+
+    # --- Writing ---
+
+    def book_id(self, book):
+        if book not in self.books:
+            if len(self.books) > np.iinfo(np.uint8).max:
+                raise ValueError(f"Too many books to add {book!r}")
+
+            self.books.append(book)
+            os.makedirs(self.path, exist_ok=True)
+            temp_file = os.path.join(self.path, f"{BOOKS_FILE}.tmp")
+            with open(temp_file, "w") as file:
+                json.dump(self.books, file)
+            os.replace(temp_file, os.path.join(self.path, BOOKS_FILE))
+
+        return self.books.index(book)
+
+    def latest(self, category):
+        """ Current state of a category as records (cached after the first read). """
+        if category not in self._latest:
+            days = self.days(category)
+            self._latest[category] = _last_per_key(np.array(self.segment(category, days[-1]))) if days else \
+                np.empty(0, dtype=RECORD_DTYPE)
+        return self._latest[category]
+
+    def _records(self, snapshot):
+        """ Cleaned-odds frame (Player[, player_id], Best_Over_Odds, Best_Under_Odds, Best_Point[, Book]) -> records. """
+        # The IDs resolved at ingestion, so history is keyed like the rest of the pipeline; names only where one is missing
+        player_ids = pd.to_numeric(snapshot["player_id"], errors="coerce").astype(float) if "player_id" in snapshot.columns \
+            else pd.Series(np.nan, index=snapshot.index)
+        missing = player_ids.isna()
+        if missing.any():
+            player_ids[missing] = snapshot.loc[missing, "Player"].map(get_player_id).astype(float)
+        resolved = snapshot[player_ids.notna()]
+        current_span().count("unresolved_players", int(player_ids.isna().sum()))
+
+        books = resolved["Book"] if "Book" in resolved.columns else pd.Series(DEFAULT_BOOK, index=resolved.index)
+        records = np.zeros(len(resolved), dtype=RECORD_DTYPE)
+        records["player_id"] = player_ids[resolved.index].to_numpy(dtype=np.int64)
+        records["book"] = books.map({book: self.book_id(book) for book in books.unique()}).to_numpy()
+        records["point"] = pd.to_numeric(resolved["Best_Point"], errors="coerce").to_numpy(dtype=float)
+        for field, column in (("over", "Best_Over_Odds"), ("under", "Best_Under_Odds")):
+            prices = pd.to_numeric(resolved[column], errors="coerce").round().to_numpy()
+            records[field] = np.where(np.isnan(prices), NO_PRICE, np.nan_to_num(prices))
+
+        # One line per key: the last one in the snapshot
+        return _last_per_key(records)
+
+    def append(self, category, snapshot, ts=None):
+        """
+        Records a snapshot of a category's lines taken at ts (Unix seconds, default now).
+        Lines missing from the snapshot for its books count as pulled. Returns the records written.
+        """
+        ts = int(time.time() if ts is None else ts)
+        new = self._records(snapshot)
+        new["ts"] = ts
+        old = self.latest(category)
+
+        days = self.days(category)
+        last_day = days[-1] if days else None
+        if last_day is not None and _day(ts) < last_day:
+            raise ValueError(f"{category} history already has {last_day}; snapshots must be appended in time order")
+        if len(old) and ts < int(old["ts"].max()):
+            raise ValueError(f"{category} snapshot at {ts} is older than the last one recorded")
+
+        # Changed or new lines: the key is new, or its point or a price differs
+        old_keys, new_keys = _key(old), _key(new)
+        matched = pd.Index(old_keys).get_indexer(new_keys)
+        same = matched >= 0
+        if len(old):
+            same &= _same_line(old[np.maximum(matched, 0)], new)
+        changed = new[~same]
+
+        # Pulled lines: known keys of the snapshot's books that aren't in it anymore
+        pulled = old[np.isin(old["book"], np.unique(new["book"])) & ~np.isin(old_keys, new_keys)].copy()
+        pulled["ts"], pulled["flags"] = ts, REMOVED
+        pulled["point"], pulled["over"], pulled["under"] = np.nan, NO_PRICE, NO_PRICE
+
+        records = np.concatenate([changed, pulled])
+        records = records[np.argsort(_key(records), kind="stable")]
+
+        # A new day starts its segment with the state it inherits
+        day = _day(ts)
+        if day != last_day and len(old):
+            carried = old.copy()
+            carried["ts"], carried["flags"] = _day_start(day), CARRIED
+            records = np.concatenate([carried, records])
+
+        if len(records):
+            os.makedirs(os.path.join(self.path, category), exist_ok=True)
+            with open(self.segment_path(category, day), "ab") as file:
+                # A crash mid-write can leave a partial record at the end: cut it off so the new ones stay aligned
+                partial = file.tell() % RECORD_DTYPE.itemsize
+                if partial:
+                    file.truncate(file.tell() - partial)
+                file.write(records.tobytes())
+
+        merged = np.concatenate([old[~np.isin(old_keys, _key(records))], _last_per_key(records)])
+        self._latest[category] = merged[np.argsort(_key(merged), kind="stable")]
+
+        current_span().rows(rows_in=len(snapshot), rows_out=len(changed) + len(pulled))
+        return len(changed) + len(pulled)
+
+    # --- Queries ---
+
+    def _frame(self, records):
+        df = _to_frame(records)
+        df["book"] = np.asarray(self.books, dtype=object)[df["book"].to_numpy()] if len(df) else df["book"]
+        return df
+
+    def _state_records(self, category, ts):
+        day, records = self._segment_for(category, ts)
+        if day is None:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return _last_per_key(records[:np.searchsorted(records["ts"], int(ts), side="right")])
+
+    def line_at(self, category, ts):
+        """ Every line as it stood at ts (Unix seconds), with the time it was last set. """
+        return self._frame(self._state_records(category, ts))
+
+    def changes(self, category, start, end):
+        """ Every recorded move, new line and pulled line between start and end (Unix seconds), oldest first. """
+        frames = []
+        for day in self.days(category):
+            if _day_start(day) + 86400 <= start or _day_start(day) > end:
+                continue
+
+            records = self.segment(category, day)
+            records = records[np.searchsorted(records["ts"], int(start), "left"):np.searchsorted(records["ts"], int(end), "right")]
+            records = records[(records["flags"] & CARRIED) == 0]
+            frame = self._frame(records)
+            frame["pulled"] = (records["flags"] & REMOVED) != 0
+            frames.append(frame)
+
+        return pd.concat(frames, ignore_index=True) if frames else self._frame(np.empty(0, dtype=RECORD_DTYPE))
+
+    def opening_vs_current(self, category, day=None, ts=None):
+        """
+        Each line's first value on a day (the state it started the day with, or when it was
+        posted) against its value at ts (default: the end of that day / now), with the move.
+        """
+        days = self.days(category)
+        day = day or (days[-1] if days else _day(time.time()))
+        ts = ts if ts is not None else min(_day_start(day) + 86399, int(time.time()))
+
+        records = self.segment(category, day)
+        records = records[:np.searchsorted(records["ts"], int(ts), side="right")]
+        opening = _first_per_key(records[(records["flags"] & REMOVED) == 0])
+        current = _last_per_key(records)
+
+        df = self._frame(opening).merge(self._frame(current), on=["player_id", "book"], suffixes=("_open", "_now"))
+        return _with_moves(df).sort_values(["move_abs", "price_move_abs"], ascending=False, ignore_index=True)
+
+    def largest_moves(self, category, minutes, ts=None, top=20):
+        """ Lines that moved the most in the last `minutes` before ts (default now): point first, then price. """
+        ts = int(time.time() if ts is None else ts)
+        before = self._frame(self._state_records(category, ts - minutes * 60))
+        after = self._frame(self._state_records(category, ts))
+
+        df = _with_moves(before.merge(after, on=["player_id", "book"], suffixes=("_open", "_now")))
+        df = df[(df["move_abs"] > 0) | (df["price_move_abs"] > 0)]
+        return df.sort_values(["move_abs", "price_move_abs"], ascending=False, ignore_index=True).head(top)
+
+def _with_moves(df):
+    df["move"] = df["point_now"] - df["point_open"]
+    df["move_abs"] = df["move"].abs()
+
+    # The bigger of the Over and Under price changes
+    df["price_move_abs"] = np.fmax((df["over_now"] - df["over_open"]).abs(), (df["under_now"] - df["under_open"]).abs())
+    df.insert(1, "player", df["player_id"].map(get_player_name))
+    return df
+
+def record_cleaned_files(odds_files, history_dir=HISTORY_DIR, ts=None):
+    """ Appends every category's Cleaned_Best_Odds file as one snapshot (taken at the file's mtime by default). """
+    history = LineHistory(history_dir)
+    for category, odds_file in odds_files.items():
+        snapshot = read_table(odds_file, "cleaned_odds")
+        taken = os.path.getmtime(parquet_path(odds_file) if os.path.exists(parquet_path(odds_file)) else odds_file)
+        written = history.append(category, snapshot, ts if ts is not None else taken)
+        print(f"📼 {category}: {written} line changes recorded")
+    return history
+
+def parse_time(value):
+    """ Unix seconds or an ISO timestamp (UTC unless it says otherwise) -> Unix seconds. """
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+
+    stamp = pd.Timestamp(value)
+    return int((stamp if stamp.tzinfo else stamp.tz_localize("UTC")).timestamp())
+
+if __name__ == "__main__":
+    from feature_store import ODDS_FILES
+
+    parser = argparse.ArgumentParser(description="Record odds snapshots and query line movement.")
+    parser.add_argument("command", choices=["record", "opening", "moves", "at"])
+    parser.add_argument("--category", default="Points", choices=list(ODDS_FILES))
+    parser.add_argument("--history", default=HISTORY_DIR)
+    parser.add_argument("--time", default=None, help="Unix seconds or ISO time (default: now / the files' mtime)")
+    parser.add_argument("--day", default=None, help="Day for 'opening' (YYYY-MM-DD, default: the latest)")
+    parser.add_argument("--minutes", type=int, default=60, help="Window for 'moves'")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    ts = parse_time(args.time)
+    with span(f"line_history:{args.command}", category=args.category):
+        if args.command == "record":
+            record_cleaned_files(ODDS_FILES, args.history, ts)
+        else:
+            history = LineHistory(args.history)
+            if args.command == "opening":
+                result = history.opening_vs_current(args.category, args.day, ts).head(args.top)
+            elif args.command == "moves":
+                result = history.largest_moves(args.category, args.minutes, ts, args.top)
+            else:
+                result = history.line_at(args.category, ts if ts is not None else time.time())
+            print(result.to_string(index=False))
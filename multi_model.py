@@ -0,0 +1,190 @@
+import argparse
+import os
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+from feature_store import FEATURE_FILE, join_keys, read_feature_table
+from forest_compile import forest_path, load_model, save_compiled
+from inference_service import CATEGORY_MODELS
+from instrumentation import current_span, span
+from train_models import FEATURES, new_model
+
+# One artifact predicting every category at once (the optional alternative to the AI_Model_<Category>.pkl files)
+MULTI_MODEL_FILE = "AI_Model_Multi.pkl"
+
+# Output columns of the model, in order, and its per-player input row (each category's features side by side)
+CATEGORIES = list(CATEGORY_MODELS)
+WIDE_FEATURES = [f"{feature}_{category}" for category in CATEGORIES for feature in FEATURES]
+
+def player_rows(df):
+    """ One row per player ID with each category's features side by side (NaN where the player has no line in it). """
+    df = df.dropna(subset=["player_id"])
+    player_ids, rows = np.unique(df["player_id"].to_numpy(dtype=np.int64), return_inverse=True)
+    codes = pd.Categorical(df["category"].astype(str), categories=CATEGORIES).codes
+    keep = codes >= 0
+
+    # (player, category, feature) cells, scattered in reverse so a player's first row in a category wins
+    cells = np.full((len(player_ids), len(CATEGORIES), len(FEATURES)), np.nan)
+    cells[rows[keep][::-1], codes[keep][::-1]] = df[FEATURES].to_numpy(dtype=float)[keep][::-1]
+    return pd.DataFrame(cells.reshape(len(player_ids), -1), index=pd.Index(player_ids, name="player_id"), columns=WIDE_FEATURES)
+
+def training_rows(df):
+    """ Players with every category's features, their targets (each L10 average nudged up, as in ai2025.py) and the test mask. """
+    wide = player_rows(df).dropna()
+    targets = pd.DataFrame({category: wide[f"average_{category}"] * 1.05 for category in CATEGORIES})
+
+    # 80/20 split by player ID, so the per-category models can be trained and scored on the same players
+    test = pd.util.hash_pandas_object(wide.index.to_series(), index=False).to_numpy() % 5 == 0
+    return wide, targets, test
+
+def train_multi_model(wide, targets, n_jobs=1):
+    """ Same scaler + forest as the category models, fitted on every category's target at once. """
+    model = new_model(n_jobs)
+    model.fit(wide[WIDE_FEATURES], targets[CATEGORIES])
+    model.categories_ = CATEGORIES
+    return model
+
+def train_category_models(df, players, n_jobs=1):
+    """ The three-model setup, each model fitted on its category's rows of the given players. """
+    models = {}
+    for category in CATEGORIES:
+        rows = df[(df["category"] == category) & df["player_id"].isin(players)].dropna(subset=FEATURES)
+        models[category] = new_model(n_jobs).fit(rows[FEATURES], rows["average"] * 1.05)
+    return models
+
+def predict_slate(model, slate, category_models=None):
+    """
+    Every prop's projection from one predict call over the slate's players, as a
+    Series keyed by feature_store.join_keys(category, player ID).
+
+    Players without a line in every category would reach the model with NaN
+    features it never saw in training: their props come from the category
+    models (model files, loaded only when needed) when given, else they're reported and left out.
+    """
+    wide = player_rows(slate)
+    complete = wide.notna().all(axis=1).to_numpy()
+    stage = current_span()
+    stage.count("multi_output_players", int(complete.sum()))
+
+    projections = []
+    if complete.any():
+        players = wide[complete]
+        predictions = np.asarray(model.predict(players[WIDE_FEATURES])).reshape(len(players), len(CATEGORIES))
+
+        # Category-major, to line up with predictions.T
+        keys = join_keys(np.repeat(CATEGORIES, len(players)), np.tile(players.index.to_numpy(), len(CATEGORIES)))
+        projections.append(pd.Series(predictions.T.ravel(), index=keys))
+
+    partial = wide.index[~complete]
+    if len(partial):
+        rows = slate[slate["player_id"].isin(partial)].dropna(subset=FEATURES).drop_duplicates(["player_id", "category"])
+        stage.count("multi_output_fallbacks", len(partial))
+
+        if category_models:
+            for category, group in rows.groupby(rows["category"].astype(str)):
+                if category in category_models:
+                    predicted = load_model(category_models[category]).predict(group[FEATURES])
+                    projections.append(pd.Series(predicted, index=join_keys(group["category"], group["player_id"])))
+            print(f"↪️ {len(partial)} players without a line in every category projected by the category models")
+        else:
+            names = sorted(slate.loc[slate["player_id"].isin(partial), "player"].astype(str).unique())
+            stage.note("multi_output_unprojected", names)
+            print(f"⚠️ {len(partial)} players without a line in every category aren't projected: {', '.join(names[:10])}"
+                  f"{f' (+{len(names) - 10} more)' if len(names) > 10 else ''}")
+
+    return pd.concat(projections) if projections else pd.Series(dtype=float)
+
+def save_model(model, model_file):
+    joblib.dump(model, model_file)
+    save_compiled(model, forest_path(model_file))
+
+def best_time(func, repeats=5):
+    """ Fastest of a few runs (ms), and the last result. """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), result
+
+def compare(input_file=FEATURE_FILE, n_jobs=1):
+    """
+    Multi-output model vs the three category models, trained on the same players:
+    load time (load_model, so the compiled forests), predict latency over the
+    whole slate (players the multi-output model can't take falling back to the
+    category models) and per-category MAE on the held-out players.
+    """
+    df = read_feature_table(input_file)
+    wide, targets, test = training_rows(df)
+    train_players, test_players = wide.index[~test], wide.index[test]
+
+    multi = train_multi_model(wide[~test], targets[~test], n_jobs)
+    singles = train_category_models(df, train_players, n_jobs)
+
+    with tempfile.TemporaryDirectory() as folder:
+        multi_file = os.path.join(folder, MULTI_MODEL_FILE)
+        single_files = {category: os.path.join(folder, os.path.basename(CATEGORY_MODELS[category])) for category in CATEGORIES}
+        save_model(multi, multi_file)
+        for category, model in singles.items():
+            save_model(model, single_files[category])
+
+        multi_load, multi = best_time(lambda: load_model(multi_file))
+        single_load, singles = best_time(lambda: {c: load_model(f) for c, f in single_files.items()})
+
+        # The whole slate, as AIPRun predicts it: one call per category vs one call for every player
+        slate = df.dropna(subset=FEATURES)
+        groups = {category: slate[slate["category"] == category][FEATURES] for category in CATEGORIES}
+        multi_predict, _ = best_time(lambda: predict_slate(multi, slate, single_files))
+        single_predict, _ = best_time(lambda: {c: singles[c].predict(rows) for c, rows in groups.items()})
+
+        # Held-out players' props: the multi-output model's column vs each category model
+        multi_test = predict_slate(multi, df[df["player_id"].isin(test_players)])
+        report = []
+        for setup, artifacts, load_ms, predict_ms in [
+            ("multi-output", 1, multi_load, multi_predict),
+            ("per-category", len(CATEGORIES), single_load, single_predict)
+        ]:
+            row = {"setup": setup, "artifacts": artifacts, "load_ms": load_ms, "predict_ms": predict_ms}
+            for category in CATEGORIES:
+                truth = targets.loc[test, category]
+                if setup == "multi-output":
+                    predicted = multi_test.reindex(join_keys([category] * len(truth), truth.index)).to_numpy()
+                else:
+                    predicted = singles[category].predict(wide.loc[test, [f"{f}_{category}" for f in FEATURES]].set_axis(FEATURES, axis=1))
+                row[f"mae_{category}"] = mean_absolute_error(truth, predicted)
+            report.append(row)
+
+    current_span().rows(rows_in=len(df), rows_out=len(wide))
+    return pd.DataFrame(report), len(wide) - int(test.sum()), int(test.sum())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the multi-output model (one forest for every category) or compare it to the category models.")
+    parser.add_argument("--data", default=FEATURE_FILE, help="Feature table with every category")
+    parser.add_argument("--output", default=MULTI_MODEL_FILE)
+    parser.add_argument("--compare", action="store_true", help="Report load time, predict latency and MAE against the three-model setup")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Threads per forest")
+    args = parser.parse_args()
+
+    if args.compare:
+        with span("multi_model:compare"):
+            report, n_train, n_test = compare(args.data, args.n_jobs)
+        print(f"\n⏱️ Multi-output vs per-category models ({n_train} training players, {n_test} held out):")
+        print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    else:
+        with span("multi_model:train") as stage:
+            wide, targets, test = training_rows(read_feature_table(args.data))
+
+            # Score on the held-out players, then refit on every player for the saved model
+            model = train_multi_model(wide[~test], targets[~test], args.n_jobs)
+            predicted = model.predict(wide.loc[test, WIDE_FEATURES]) if test.any() else np.empty((0, len(CATEGORIES)))
+            mae = {c: mean_absolute_error(targets.loc[test, c], predicted[:, i]) if test.any() else np.nan for i, c in enumerate(CATEGORIES)}
+
+            model = train_multi_model(wide, targets, args.n_jobs)
+            save_model(model, args.output)
+            stage.rows(rows_in=len(wide), rows_out=len(wide))
+
+        print(f"✅ Multi-output model trained and saved: {args.output} ({len(wide)} players; held-out MAE "
+              f"{', '.join(f'{c} {v:.3f}' for c, v in mae.items())} with {int(test.sum())} players left out)")
@@ -1,10 +1,13 @@
+import argparse
+import json
 import pandas as pd
 import requests
-from nba_api.stats.endpoints import playergamelog
-from nba_api.stats.static import players
-from datetime import datetime
+from datetime import date, datetime
 import time
-import unicodedata
+from gamelog_cache import CACHE_FILE, LEAGUE, GameLogCache
+from gamelog_fetcher import STATS_URL, GameLogFetcher
+from instrumentation import current_span, span
+from player_index import get_player_id
 
 # NBA Stats API headers to avoid getting blocked
 HEADERS = {
@@ -19,64 +22,185 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9"
 }
 
-def normalize_name(name):
-    """ Normalize player name to match API format (handles accents) """
-    return unicodedata.normalize('NFD', name).encode('ascii', 'ignore').decode('utf-8')
+def game_logs_to_frame(data):
+    """ Converts a playergamelogs response into a DataFrame with parsed game dates. """
+    if not data or "resultSets" not in data or not data["resultSets"][0]["rowSet"]:
+        return pd.DataFrame()
+
+    # Convert response to DataFrame
+    games_df = pd.DataFrame(data["resultSets"][0]["rowSet"], columns=data["resultSets"][0]["headers"])
+
+    # Convert GAME_DATE to datetime with proper handling
+    try:
+        games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'], errors='coerce')
+    except Exception:
+        games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'], infer_datetime_format=True, errors='coerce')
+
+    # Drop rows where GAME_DATE couldn't be parsed
+    return games_df.dropna(subset=['GAME_DATE'])
+
+def parse_game_logs(data, up_to_date, n_games=10):
+    """ Turns a playergamelogs response into the player's last N games up to the specified date. """
+    games_df = game_logs_to_frame(data)
+
+    if games_df.empty:
+        return games_df
+
+    # Filter games up to the specified date
+    games_df = games_df[games_df['GAME_DATE'] <= up_to_date]
+
+    # Sort by date and take the last N games
+    games_df = games_df.sort_values(by='GAME_DATE', ascending=False).head(n_games)
+
+    return games_df
+
+def build_game_log_table(data):
+    """ Turns a league-wide playergamelogs response into a PLAYER_ID-indexed table (newest games first). """
+    games_df = game_logs_to_frame(data)
+
+    if games_df.empty:
+        return games_df
 
-def get_player_id(player_name):
-    """ Fetches the player's ID from NBA Stats API. """
-    player_dict = players.get_players()
-    normalized_name = normalize_name(player_name)
+    # Sorting by player then date lets every lookup be a binary search on the index
+    games_df = games_df.sort_values(by=['PLAYER_ID', 'GAME_DATE'], ascending=[True, False])
+    return games_df.set_index('PLAYER_ID', drop=False)
+
+def last_n_games(game_table, player_id, up_to_date, n_games=10):
+    """ Serves a player's last N games up to the specified date from the league-wide table. """
+    if game_table.empty or player_id not in game_table.index:
+        return pd.DataFrame()
 
-    for player in player_dict:
-        if normalized_name.lower() == normalize_name(player['full_name']).lower():
-            return player['id']
-    
-    return None  # Player not found
+    games_df = game_table.loc[[player_id]]
+    return games_df[games_df['GAME_DATE'] <= up_to_date].head(n_games)
 
-def get_last_10_games(player_id, up_to_date):
+def get_last_10_games(player_id, up_to_date, season="2024-25", season_type="Regular Season"):
     """ Fetches the last 10 games of the player up to the specified date. """
     url = "https://stats.nba.com/stats/playergamelogs"
     params = {
         "PlayerID": player_id,
-        "Season": "2024-25",  # Adjust if necessary
-        "SeasonType": "Regular Season"
+        "Season": season,
+        "SeasonType": season_type
     }
 
+    stage = current_span()
+    stage.count("http_requests")
+    start = time.perf_counter()
     response = requests.get(url, headers=HEADERS, params=params)
+    stage.observe("http_latency_ms", (time.perf_counter() - start) * 1000)
+    stage.count(f"http_status_{response.status_code}")
 
     if response.status_code != 200:
+        stage.count("http_failures")
         print(f"⚠️ API Request Failed for Player {player_id}! Status Code: {response.status_code}")
         return pd.DataFrame()
 
-    data = response.json()
+    games_df = parse_game_logs(response.json(), up_to_date)
 
-    if "resultSets" not in data or not data["resultSets"][0]["rowSet"]:
+    if games_df.empty:
         print(f"⚠️ No game data returned for player ID {player_id}!")
-        return pd.DataFrame()
 
-    # Convert response to DataFrame
-    games_df = pd.DataFrame(data["resultSets"][0]["rowSet"], columns=data["resultSets"][0]["headers"])
+    return games_df
 
-    # Convert GAME_DATE to datetime with proper handling
-    try:
-        games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'], errors='coerce')
-    except Exception:
-        games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'], infer_datetime_format=True, errors='coerce')
+def build_stat_rows(player_name, games_df, stats_data):
+    """ Appends the player's L10 row (10 games + average) to each stat list. """
+    # Extract stats
+    stats = {
+        "points": "PTS",
+        "assists": "AST",
+        "rebounds": "REB"
+    }
 
-    # Drop rows where GAME_DATE couldn't be parsed
-    games_df = games_df.dropna(subset=['GAME_DATE'])
+    for stat_name, column in stats.items():
+        # Get the last 10 games' stats
+        values = games_df[column].tolist()
 
-    # Filter games up to the specified date
-    games_df = games_df[games_df['GAME_DATE'] <= up_to_date]
+        # Calculate average and round to 2 decimal places
+        average_value = round(sum(values) / len(values), 2) if values else 0
 
-    # Sort by date and take the last 10 games
-    games_df = games_df.sort_values(by='GAME_DATE', ascending=False).head(10)
+        # Ensure 10 columns even if fewer games available
+        while len(values) < 10:
+            values.append(None)
 
-    return games_df
+        # Append row to the respective stat list
+        stats_data[stat_name].append([player_name] + values + [average_value])
 
-def process_players(file_path):
-    """ Reads a list of player names from a file and processes them. """
+def save_stat_files(stats_data):
+    """ Saves each stat as a combined L10 CSV file. """
+    for stat_name, data in stats_data.items():
+        if data:  # Only save if there's data
+            df = pd.DataFrame(data, columns=["Player"] + [f"Game {i+1}" for i in range(10)] + ["Average"])
+            file_name = f"{stat_name}_L10.csv"
+            df.to_csv(file_name, index=False)
+            print(f"✅ Saved {file_name}")
+
+def load_league_logs(fetcher=None, season="2024-25", season_type="Regular Season",
+                     date_from=None, date_to=None, fixture=None, record=None):
+    """ Gets the league-wide game logs in one request (or from a recorded JSON fixture). """
+    if fixture:
+        with open(fixture, 'r') as file:
+            data = json.load(file)
+        print(f"📂 Loaded recorded game logs from: {fixture}")
+    else:
+        data = fetcher.fetch_league_logs(season, season_type, date_from, date_to)
+
+    if data and record:
+        with open(record, 'w') as file:
+            json.dump(data, file)
+        print(f"💾 Recorded game logs to: {record}")
+
+    return build_game_log_table(data)
+
+def cache_date_from(newest_game_date):
+    """ DateFrom for a delta fetch: the newest cached day (re-fetched so late games aren't missed). """
+    return newest_game_date.strftime("%m/%d/%Y") if newest_game_date is not None else None
+
+def refresh_league_cache(cache, fetcher, season="2024-25", season_type="Regular Season"):
+    """ Brings the cache up to date with one league-wide request for the games it doesn't have yet. """
+    fresh = cache.fetched_on(LEAGUE, season, season_type) == date.today().isoformat()
+    current_span().cache("gamelog_cache", fresh)
+    if fresh:
+        print("💾 League game logs already fetched today, using the cache")
+        return
+
+    # Only a previous league-wide pull guarantees every player's games up to the newest date
+    date_from = None
+    if cache.fetched_on(LEAGUE, season, season_type):
+        date_from = cache_date_from(cache.newest_game_date(season, season_type))
+
+    data = fetcher.fetch_league_logs(season, season_type, date_from)
+    if data is not None:
+        cache.store(game_logs_to_frame(data), season, season_type, [LEAGUE])
+
+def refresh_player_cache(cache, fetcher, player_ids, season="2024-25", season_type="Regular Season"):
+    """ Fetches only the games after each player's newest cached game; players fetched today are skipped. """
+    today = date.today().isoformat()
+    stale = [player_id for player_id in player_ids if cache.fetched_on(player_id, season, season_type) != today]
+    stale_ids = set(stale)
+    for player_id in player_ids:
+        current_span().cache("gamelog_cache", player_id not in stale_ids)
+    print(f"💾 {len(player_ids) - len(stale)} players up to date in the cache, fetching {len(stale)}...")
+
+    if not stale:
+        return
+
+    date_from = {player_id: cache_date_from(cache.newest_game_date(season, season_type, player_id)) for player_id in stale}
+    responses = fetcher.fetch_player_logs(stale, season, season_type, date_from)
+
+    fetched = [player_id for player_id, data in responses.items() if data is not None]
+    frames = [game_logs_to_frame(responses[player_id]) for player_id in fetched]
+    frames = [df for df in frames if not df.empty]
+
+    cache.store(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(), season, season_type, fetched)
+
+def process_players(file_path, fetcher=None, game_table=None, season="2024-25", season_type="Regular Season", cache=None):
+    """
+    Reads a list of player names from a file and processes them.
+
+    With a league-wide game table every player is served from it; with a
+    game-log cache only new games are fetched and players are served from
+    the cache; with a GameLogFetcher all game logs are fetched concurrently
+    first; otherwise players are fetched one at a time with a fixed delay.
+    """
     up_to_date = datetime.today()  # Always fetch up to today's date
 
     # Read player names from file
@@ -90,53 +214,84 @@ def process_players(file_path):
         "rebounds": []
     }
 
+    # Resolve all player IDs up front
+    resolved = []
     for player_name in players_list:
-        print(f"🚀 Processing {player_name}...")
         player_id = get_player_id(player_name)
 
         if not player_id:
+            current_span().count("players_not_found")
             print(f"❌ Player '{player_name}' not found! (Check spelling or try using full name)")
             continue
 
-        games_df = get_last_10_games(player_id, up_to_date)
+        resolved.append((player_name, player_id))
+
+    if game_table is None and cache is not None:
+        refresh_player_cache(cache, fetcher, list(dict.fromkeys(player_id for _, player_id in resolved)), season, season_type)
+        game_table = cache.game_table(season, season_type)
+    elif game_table is None and fetcher is not None:
+        print(f"🚀 Fetching {len(resolved)} players with {fetcher.workers} workers...")
+        responses = fetcher.fetch_player_logs({player_id for _, player_id in resolved}, season, season_type)
+
+    for player_name, player_id in resolved:
+        print(f"🚀 Processing {player_name}...")
+
+        if game_table is not None:
+            games_df = last_n_games(game_table, player_id, up_to_date)
+        elif fetcher is not None:
+            games_df = parse_game_logs(responses.get(player_id), up_to_date)
+        else:
+            games_df = get_last_10_games(player_id, up_to_date, season, season_type)
+
+            # Small delay to prevent API rate limits
+            time.sleep(2)
 
         if games_df.empty:
+            current_span().count("players_without_games")
             print(f"⚠️ No game data found for {player_name}! Skipping...")
             continue
 
-        # Extract stats
-        stats = {
-            "points": "PTS",
-            "assists": "AST",
-            "rebounds": "REB"
-        }
+        build_stat_rows(player_name, games_df, stats_data)
 
-        for stat_name, column in stats.items():
-            # Get the last 10 games' stats
-            values = games_df[column].tolist()
+    save_stat_files(stats_data)
+    current_span().rows(rows_in=len(players_list), rows_out=len(stats_data["points"]))
 
-            # Calculate average and round to 2 decimal places
-            average_value = round(sum(values) / len(values), 2) if values else 0
-
-            # Ensure 10 columns even if fewer games available
-            while len(values) < 10:
-                values.append(None)
+    print("✅ All players processed successfully!")
 
-            # Append row to the respective stat list
-            stats_data[stat_name].append([player_name] + values + [average_value])
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the L10 stat files from the NBA Stats API.")
+    parser.add_argument("players_file", nargs="?", default="players.txt")
+    parser.add_argument("--season", default="2024-25", help="Season, e.g. 2024-25")
+    parser.add_argument("--season-type", default="Regular Season", help="Regular Season, Playoffs, ...")
+    parser.add_argument("--bulk", action="store_true", help="Pull the whole league's logs in one request")
+    parser.add_argument("--date-from", default=None, help="Bulk mode: only games from this date (MM/DD/YYYY)")
+    parser.add_argument("--date-to", default=None, help="Bulk mode: only games up to this date (MM/DD/YYYY)")
+    parser.add_argument("--fixture", default=None, help="Bulk mode: read the league logs from a recorded JSON file")
+    parser.add_argument("--record", default=None, help="Bulk mode: save the league logs response to a JSON file")
+    parser.add_argument("--cache", nargs="?", const=CACHE_FILE, default=None,
+                        help=f"Keep game logs in a local cache and only fetch new games (default file: {CACHE_FILE})")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent requests (1 = one player at a time)")
+    parser.add_argument("--rate", type=float, default=5.0, help="Max requests per second")
+    parser.add_argument("--burst", type=int, default=None, help="Max burst of requests (defaults to the rate)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=4, help="Retries on 429/5xx responses")
+    parser.add_argument("--base-url", default=STATS_URL, help="Stats API base URL (e.g. a local stub server)")
+    args = parser.parse_args()
 
-        # Small delay to prevent API rate limits
-        time.sleep(2)
+    cache = GameLogCache(args.cache) if args.cache and not args.fixture else None
 
-    # Save each stat as a combined CSV file
-    for stat_name, data in stats_data.items():
-        if data:  # Only save if there's data
-            df = pd.DataFrame(data, columns=["Player"] + [f"Game {i+1}" for i in range(10)] + ["Average"])
-            file_name = f"{stat_name}_L10.csv"
-            df.to_csv(file_name, index=False)
-            print(f"✅ Saved {file_name}")
+    fetcher = None
+    if args.workers > 1 or (args.bulk and not args.fixture) or cache is not None:
+        fetcher = GameLogFetcher(HEADERS, base_url=args.base_url, workers=args.workers, rate=args.rate,
+                                 burst=args.burst, timeout=args.timeout, max_retries=args.retries)
 
-    print("✅ All players processed successfully!")
+    with span("fetch_l10", season=args.season, season_type=args.season_type, workers=args.workers):
+        game_table = None
+        if cache is not None and args.bulk:
+            refresh_league_cache(cache, fetcher, args.season, args.season_type)
+            game_table = cache.game_table(args.season, args.season_type)
+        elif args.bulk or args.fixture:
+            game_table = load_league_logs(fetcher, args.season, args.season_type, args.date_from, args.date_to,
+                                          args.fixture, args.record)
 
-if __name__ == "__main__":
-    process_players("players.txt")
\ No newline at end of file
+        process_players(args.players_file, fetcher, game_table, args.season, args.season_type, cache)
@@ -0,0 +1,214 @@
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from instrumentation import span
+
+# Quiet time after the last write to a dump before its category is re-run (bursts of writes become one run)
+DEBOUNCE = 0.2
+
+# How often the polling watcher stats the dumps (when inotify isn't available)
+POLL_INTERVAL = 0.25
+
+# inotify event flags (linux/inotify.h): a file opened for writing was closed / a file was moved in
+IN_CLOSE_WRITE = 0x08
+IN_MOVED_TO = 0x80
+IN_NONBLOCK = os.O_NONBLOCK
+
+class InotifyWatcher:
+    """ Names of the files closed after writing (or moved) into a directory, straight from inotify via libc. """
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0 or libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify unavailable for {directory}")
+
+    def read(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+
+        buffer, names, offset = os.read(self.fd, 64 * 1024), [], 0
+        while offset < len(buffer):
+            _, _, _, length = struct.unpack_from("iIII", buffer, offset)
+            names.append(os.fsdecode(buffer[offset + 16:offset + 16 + length].rstrip(b"\0")))
+            offset += 16 + length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """ Fallback for systems without inotify: reports the watched files whose mtime or size changed. """
+
+    def __init__(self, directory, names):
+        self.paths = {name: os.path.join(directory, name) for name in names}
+        self.stamps = {name: self._stamp(path) for name, path in self.paths.items()}
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def read(self, timeout):
+        time.sleep(min(timeout, POLL_INTERVAL))
+        changed = []
+        for name, path in self.paths.items():
+            stamp = self._stamp(path)
+            if stamp != self.stamps[name]:
+                self.stamps[name] = stamp
+                changed.append(name)
+        return changed
+
+    def close(self):
+        pass
+
+def make_watcher(directory, names, polling=False):
+    """ inotify on Linux, polling anywhere else (or when asked). """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except OSError as e:
+            print(f"⚠️ {e}, polling instead")
+    return PollingWatcher(directory, names)
+
+class ProjectionDaemon:
+    """
+    Re-projects a category as soon as its odds dump is rewritten: clean -> merge ->
+    predict in this process, with the models and L10 histories kept in memory
+    (reloaded only when their files change), then publishes AI_Projections.arrow.
+    """
+
+    def __init__(self, watch_dir=".", categories=None, polling=False, debounce=DEBOUNCE):
+        from line_history import LineHistory
+        from pipeline import CATEGORY_INPUTS
+
+        self.watch_dir = watch_dir
+        self.inputs = {c: CATEGORY_INPUTS[c] for c in (categories or CATEGORY_INPUTS)}
+        self.debounce = debounce
+        self.history = LineHistory()
+        self.models = {}
+        self.histories = {}
+
+        # File name -> category, for the dumps (re-run the category) and the L10 files (reload, then re-run)
+        self.watched = {}
+        for category, (odds_dump, l10_file) in self.inputs.items():
+            self.watched[odds_dump] = category
+            self.watched[os.path.basename(l10_file)] = category
+        self.watcher = make_watcher(watch_dir, list(self.watched), polling)
+
+        for category in self.inputs:
+            self._model(category)
+            self._history(category)
+
+    def _model(self, category):
+        """ The category's model, reloaded when its pickle (or compiled forest) changes. """
+        from forest_compile import forest_path, load_model
+        from inference_service import CATEGORY_MODELS
+
+        model_file = CATEGORY_MODELS[category]
+        stamp = max(os.path.getmtime(path) for path in [model_file, forest_path(model_file)] if os.path.exists(path))
+        if self.models.get(category, (None,))[0] != stamp:
+            self.models[category] = (stamp, load_model(model_file))
+            print(f"✅ Model loaded: {model_file}")
+        return self.models[category][1]
+
+    def _history(self, category):
+        """ The category's L10 history as arrays, reloaded when the L10 file changes. """
+        from feature_store import CATEGORY_STATS, GameHistory
+
+        l10_file = os.path.join(self.watch_dir, self.inputs[category][1])
+        stamp = os.path.getmtime(l10_file)
+        if self.histories.get(category, (None,))[0] != stamp:
+            self.histories[category] = (stamp, GameHistory.from_l10_files({CATEGORY_STATS[category]: l10_file}))
+        return self.histories[category][1]
+
+    def process(self, category, event_time):
+        """ clean -> merge -> predict for one category, then publish. Returns the seconds from the file event. """
+        from AIPRun import generate_projections
+        from best_odds import clean_odds_file
+        from feature_store import build_feature_table, write_feature_table
+        from inference_service import CATEGORY_MODELS
+        from projection_store import PROJECTION_FILES, build_projections, write_projections
+        from table_schema import parquet_path, read_table
+
+        cleaned_file = f"Cleaned_Best_Odds_{category}.parquet"
+        merged_file = f"Merged_{category}.parquet"
+
+        with span("daemon:event", category=category) as event:
+            stage_start = time.perf_counter()
+            timings = {}
+
+            clean_odds_file(os.path.join(self.watch_dir, self.inputs[category][0]), cleaned_file)
+            try:
+                self.history.append(category, read_table(cleaned_file, "cleaned_odds"))
+            except ValueError as e:
+                event.count("line_history_skipped")
+                print(f"⚠️ Line history not updated: {e}")
+            timings["clean"] = time.perf_counter() - stage_start
+
+            write_feature_table(build_feature_table(self._history(category), {category: cleaned_file}), merged_file)
+            timings["merge"] = time.perf_counter() - stage_start - sum(timings.values())
+
+            generate_projections(merged_file, CATEGORY_MODELS[category], f"AI_Projections_{category}.parquet",
+                                 category, model=self._model(category))
+            timings["predict"] = time.perf_counter() - stage_start - sum(timings.values())
+
+            # Every category that has projections goes into the app's file, swapped in atomically
+            write_projections(build_projections([f for f in PROJECTION_FILES if os.path.exists(parquet_path(f))]))
+            timings["publish"] = time.perf_counter() - stage_start - sum(timings.values())
+
+            latency = time.time() - event_time
+            for stage, seconds in timings.items():
+                event.observe(f"stage:{stage}", seconds * 1000)
+            event.observe("event_to_publish", latency * 1000)
+            event.fields["latency_ms"] = round(latency * 1000, 1)
+
+        print(f"⚡ {category} re-projected in {sum(timings.values()):.2f}s "
+              f"({', '.join(f'{k} {v:.2f}s' for k, v in timings.items())}), {latency:.2f}s after the file closed")
+        return latency
+
+    def run(self, stop=None):
+        """ Watches until stop() is true (or forever), running each category once its writes have settled. """
+        pending = {}  # category -> (first event time, last event time)
+        print(f"👀 Watching {os.path.abspath(self.watch_dir)} for {', '.join(self.watched)}")
+
+        try:
+            while stop is None or not stop():
+                now = time.time()
+                timeout = min([last + self.debounce - now for _, last in pending.values()] + [1.0])
+                for name in self.watcher.read(max(timeout, 0)):
+                    category = self.watched.get(name)
+                    if category:
+                        first = pending.get(category, (time.time(), None))[0]
+                        pending[category] = (first, time.time())
+
+                now = time.time()
+                for category, (first, last) in list(pending.items()):
+                    if now - last >= self.debounce:
+                        del pending[category]
+                        try:
+                            self.process(category, last)
+                        except Exception as e:
+                            # Keep watching: a half-written or bad drop shouldn't take the daemon down
+                            # (its daemon:event span is already written with the error)
+                            print(f"❌ {category}: {type(e).__name__}: {e}")
+        finally:
+            self.watcher.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-project a category whenever its odds dump is rewritten.")
+    parser.add_argument("--dir", default=".", help="Folder the odds dumps (and L10 files) are dropped into")
+    parser.add_argument("--categories", nargs="+", default=None)
+    parser.add_argument("--polling", action="store_true", help="Poll the files instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE, help="Seconds of quiet before a category runs")
+    args = parser.parse_args()
+
+    ProjectionDaemon(args.dir, args.categories, args.polling, args.debounce).run()
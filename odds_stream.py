@@ -0,0 +1,229 @@
+import argparse
+import csv
+import heapq
+import io
+import math
+import os
+import time
+from itertools import count
+import pandas as pd
+from best_odds import ODDS_COLUMNS, add_player_ids, format_best_odds
+from instrumentation import current_span, span
+from table_schema import parquet_path, write_table
+
+# Raw dump behind each category's cleaned odds file
+CATEGORY_DUMPS = {
+    "Rebounds": "NBA STATS - REBOUNDS.csv",
+    "Assists": "NBA STATS - ASSISTS.csv",
+    "Points": "NBA STATS - POINTS.csv"
+}
+
+# Seconds between checks of a followed file for new lines
+POLL_INTERVAL = 1.0
+
+BEST_COLUMNS = ["Player", "Best_Over_Odds", "Best_Under_Odds", "Best_Point"]
+
+def _same(a, b):
+    return a == b or (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b))
+
+class _PlayerLines:
+    """
+    The live lines of one player, with lazy-deletion heaps for the best Over
+    (lowest price), the best Under (price closest to 0, earliest first on ties)
+    and the earliest row (whose point is the player's line).
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.over = []
+        self.under = []
+        self.first = []
+
+    def add(self, key, seq, label, price, point):
+        self.rows[key] = (seq, label, price, point)
+        heapq.heappush(self.first, (seq, key))
+        if not math.isnan(price):
+            if label == "Over":
+                heapq.heappush(self.over, (price, seq, key))
+            elif label == "Under":
+                heapq.heappush(self.under, (abs(price), seq, key))
+
+    def remove(self, key):
+        self.rows.pop(key, None)
+
+        # Stale heap entries are skipped when read; rebuild once they pile up
+        if len(self.first) > 2 * len(self.rows) + 16:
+            self.first = [entry for entry in self.first if self._live(entry[-1], entry[0])]
+            self.over = [entry for entry in self.over if self._live(entry[-1], entry[1])]
+            self.under = [entry for entry in self.under if self._live(entry[-1], entry[1])]
+            for heap in (self.first, self.over, self.under):
+                heapq.heapify(heap)
+
+    def _live(self, key, seq):
+        row = self.rows.get(key)
+        return row is not None and row[0] == seq
+
+    def _top(self, heap, seq_index):
+        while heap and not self._live(heap[0][-1], heap[0][seq_index]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def best(self):
+        """ (best Over price, best Under price, line) like get_best_odds; NaN where there's none. """
+        over, under, first = self._top(self.over, 1), self._top(self.under, 1), self._top(self.first, 0)
+        return (
+            self.rows[over[-1]][2] if over else math.nan,
+            self.rows[under[-1]][2] if under else math.nan,
+            self.rows[first[-1]][3] if first else math.nan
+        )
+
+class OddsTracker:
+    """
+    Incremental best-line state for one category's odds feed.
+
+    Rows have the raw dump's columns (label, description, price, point) and
+    optionally a "book" column. With a book, a row replaces that book's
+    previous line for the same player and label, and a row with neither
+    price nor point means the book pulled the line. Without a book every
+    row is a separate line (an appending raw dump).
+
+    At any point best_odds() equals get_best_odds() run on the live rows in
+    the order they arrived (snapshot_rows()).
+    """
+
+    def __init__(self):
+        self.players = {}
+        self.seq = count()
+
+    def _apply(self, label, player, price, point, book=None):
+        """ Applies one row. Returns the player it touched (or None). """
+        if not isinstance(player, str):
+            return None
+
+        seq = next(self.seq)
+        key = (book, label, player) if book is not None else seq
+        lines = self.players.setdefault(player, _PlayerLines())
+
+        if key in lines.rows:
+            lines.remove(key)
+
+        if book is not None and math.isnan(price) and math.isnan(point):
+            if not lines.rows:
+                del self.players[player]
+            return player
+
+        lines.add(key, seq, label, price, point)
+        return player
+
+    def best(self, player):
+        lines = self.players.get(player)
+        return lines.best() if lines else None
+
+    def ingest(self, chunk):
+        """
+        Applies a chunk of rows and returns the best odds of only the players whose
+        best Over, best Under or line changed. A player with no lines left gets a row
+        of NaN odds and point, so consumers learn their best line is gone.
+        """
+        chunk = chunk.copy()
+        chunk.columns = chunk.columns.str.strip().str.lower()
+        chunk = chunk[chunk["label"] != "label"]  # Header lines repeated mid-dump, as in clean_odds_file
+        price = pd.to_numeric(chunk["price"], errors="coerce").to_numpy(dtype=float)
+        point = pd.to_numeric(chunk["point"], errors="coerce").to_numpy(dtype=float)
+        books = chunk["book"].where(chunk["book"].notna(), None).to_numpy() if "book" in chunk.columns else [None] * len(chunk)
+
+        touched = {}
+        for label, player, row_price, row_point, book in zip(chunk["label"].to_numpy(), chunk["description"].to_numpy(),
+                                                             price, point, books):
+            if isinstance(player, str) and player not in touched:
+                touched[player] = self.best(player)
+            self._apply(label, player, row_price, row_point, book)
+
+        changed = []
+        for player, before in touched.items():
+            after = self.best(player)
+            if before is None and after is None:
+                continue  # Pulled again after its lines were already gone
+            if before is None or after is None or not all(_same(a, b) for a, b in zip(before, after)):
+                changed.append((player, after))
+
+        current_span().rows(rows_in=len(chunk), rows_out=len(changed))
+        rows = [(player, *(after if after is not None else (math.nan,) * 3)) for player, after in sorted(changed)]
+        return pd.DataFrame(rows, columns=BEST_COLUMNS)
+
+    def best_odds(self):
+        """ Every player's best odds, sorted by name (same frame as get_best_odds). """
+        rows = [(player, *self.players[player].best()) for player in sorted(self.players)]
+        return pd.DataFrame(rows, columns=BEST_COLUMNS)
+
+    def snapshot_rows(self):
+        """ The live rows in arrival order, as a raw-dump frame (for checking against the batch run). """
+        rows = []
+        for player, lines in self.players.items():
+            for seq, label, price, point in lines.rows.values():
+                rows.append((seq, label, player, price, point))
+
+        rows.sort()
+        return pd.DataFrame([row[1:] for row in rows], columns=ODDS_COLUMNS)
+
+def read_chunks(file_path, chunk_size=10_000, names=ODDS_COLUMNS):
+    """ Reads a raw dump (no header) in chunks. """
+    yield from pd.read_csv(file_path, names=names, header=None, chunksize=chunk_size)
+
+def follow(file_path, names=ODDS_COLUMNS, poll_interval=POLL_INTERVAL, stop=None):
+    """
+    Yields chunks of the complete lines appended to a file since the last read
+    (starting with what's already there), like `tail -f`. Stops when stop() is true.
+    """
+    position, partial = 0, ""
+    while True:
+        if os.path.exists(file_path):
+            # The feed was truncated or replaced: start over from its beginning
+            if os.path.getsize(file_path) < position:
+                position, partial = 0, ""
+
+            with open(file_path, "r", newline="") as file:
+                file.seek(position)
+                data = file.read()
+                position = file.tell()
+
+            # Hold back a trailing partial line until its newline arrives
+            text = partial + data
+            complete, _, partial = text.rpartition("\n")
+            if complete:
+                rows = list(csv.reader(io.StringIO(complete)))
+                yield pd.DataFrame([row + [None] * (len(names) - len(row)) for row in rows if row], columns=names)
+
+        if stop is not None and stop():
+            return
+        time.sleep(poll_interval)
+
+def write_cleaned(tracker, output_file):
+    """ Rewrites the cleaned odds file from the tracker's state (same files as clean_odds_file). """
+    write_table(add_player_ids(tracker.best_odds(), output_file), output_file, "cleaned_odds", csv_format=format_best_odds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track the best Over/Under lines of a live odds feed incrementally.")
+    parser.add_argument("category", choices=list(CATEGORY_DUMPS))
+    parser.add_argument("--input", default=None, help="Raw odds feed (default: the category's NBA STATS dump)")
+    parser.add_argument("--with-book", action="store_true", help="Feed rows have a 5th column naming the book")
+    parser.add_argument("--follow", action="store_true", help="Keep reading lines appended to the feed")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--output", default=None, help="Cleaned odds file kept up to date (default: Cleaned_Best_Odds_<Category>.csv)")
+    args = parser.parse_args()
+
+    input_file = args.input or CATEGORY_DUMPS[args.category]
+    output_file = args.output or f"Cleaned_Best_Odds_{args.category}.csv"
+    names = ODDS_COLUMNS + ["book"] if args.with_book else ODDS_COLUMNS
+    chunks = follow(input_file, names) if args.follow else read_chunks(input_file, args.chunk_size, names)
+
+    tracker = OddsTracker()
+    for chunk in chunks:
+        with span(f"odds_stream:{args.category}"):
+            changed = tracker.ingest(chunk)
+            if not changed.empty:
+                write_cleaned(tracker, output_file)
+                print(f"📈 {len(changed)} players changed: {', '.join(changed['Player'].head(5))}"
+                      f"{'...' if len(changed) > 5 else ''}")
+
+    print(f"✅ Cleaned file saved as: {parquet_path(output_file)} ({len(tracker.players)} players)")
@@ -0,0 +1,155 @@
+import heapq
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+from ranked_views import THRESHOLDS
+
+# Parlay sizes the engine searches
+MIN_LEGS = 2
+MAX_LEGS = 6
+
+def american_to_decimal(odds):
+    """ American odds -> decimal payout per unit staked (-120 -> 1.833, +150 -> 2.5); NaN for invalid odds. """
+    odds = np.asarray(odds, dtype=float)
+    valid = np.abs(odds) >= 100
+    safe = np.where(valid, odds, 100)
+    return np.where(valid, np.where(safe > 0, 1 + safe / 100, 1 + 100 / np.abs(safe)), np.nan)
+
+def implied_probability(odds):
+    """ Break-even probability of a price (includes the book's vig). """
+    return 1 / american_to_decimal(odds)
+
+def no_vig_probability(over_odds, under_odds):
+    """ Book's over probability with the vig removed from the two sides. """
+    over, under = implied_probability(over_odds), implied_probability(under_odds)
+    return over / (over + under)
+
+def over_probability(projection, line):
+    """
+    Model probability of going over the line: the stat is taken as normal
+    around the AI projection with a Poisson-like spread (sd = sqrt(line)).
+    """
+    projection, line = np.asarray(projection, dtype=float), np.asarray(line, dtype=float)
+    return ndtr((projection - line) / np.sqrt(np.maximum(line, 1)))
+
+def build_legs(df, thresholds=THRESHOLDS):
+    """ Turns every prop into an over leg and an under leg with payout, probability and log-EV. """
+    df = df[df["best_point"] >= df["category"].map(thresholds).fillna(0)]
+
+    # Simulated probabilities when the projections have them (prop_probability), else the normal approximation
+    if "AI_P_Over" in df.columns:
+        p_over, p_under = df["AI_P_Over"].to_numpy(dtype=float), df["AI_P_Under"].to_numpy(dtype=float)
+    else:
+        p_over = over_probability(df["AI_Projection"], df["best_point"])
+        p_under = 1 - p_over
+
+    sides = []
+    for side, odds_column, probability in [("Over", "best_over_odds", p_over), ("Under", "best_under_odds", p_under)]:
+        sides.append(pd.DataFrame({
+            "player": df["player"].to_numpy(),
+            "category": df["category"].to_numpy(),
+            "side": side,
+            "line": df["best_point"].to_numpy(dtype=float),
+            "odds": df[odds_column].to_numpy(dtype=float),
+            "decimal": american_to_decimal(df[odds_column]),
+            "implied": implied_probability(df[odds_column]),
+            "probability": probability
+        }))
+
+    legs = pd.concat(sides, ignore_index=True).dropna(subset=["decimal", "probability"])
+
+    # Log of each leg's expected return; a parlay's expected return is the product over its legs
+    legs["value"] = np.log(np.clip(legs["probability"] * legs["decimal"], 1e-12, None))
+    return legs.sort_values("value", ascending=False, kind="stable").reset_index(drop=True)
+
+def search_parlays(legs, n_legs, top_n=10, min_categories=2, max_per_category=None):
+    """
+    Branch-and-bound search for the top-N parlays of exactly n_legs legs.
+
+    Legs are sorted by value, so the best any partial parlay can still reach
+    is its value plus the next few legs' values; a branch is cut as soon as
+    that can't beat the current N-th best. The last leg is scored for every
+    candidate at once with NumPy. Constraints: one leg per player, at least
+    min_categories categories, at most max_per_category legs per category.
+    Returns [(log value, leg indexes)] best first.
+    """
+    value = legs["value"].to_numpy(dtype=float)
+    player = pd.factorize(legs["player"])[0]
+    category = pd.factorize(legs["category"])[0]
+    n_categories = category.max() + 1 if len(category) else 0
+    max_per_category = max_per_category or n_legs
+
+    # best_run[i, r] = sum of value[i:i + r] (the most r legs from i onwards can add)
+    padded = np.concatenate([value, np.full(n_legs, -np.inf)])
+    cumulative = np.concatenate([[0], np.cumsum(padded)])
+    best_run = np.stack([cumulative[np.arange(len(value) + 1) + r] - cumulative[:len(value) + 1] for r in range(n_legs + 1)], axis=1)
+
+    heap = []
+    used_players = np.zeros(player.max() + 1 if len(player) else 0, dtype=bool)
+    category_counts = np.zeros(n_categories, dtype=np.int64)
+
+    def worst():
+        return heap[0][0] if len(heap) == top_n else -np.inf
+
+    def extend(start, total, chosen):
+        remaining = n_legs - len(chosen)
+        distinct = np.count_nonzero(category_counts)
+
+        if remaining == 1:
+            # Vectorized last leg: every candidate after `start` at once
+            if total + best_run[start, 1] <= worst():
+                return
+            candidates = np.arange(start, len(value))
+            ok = ~used_players[player[candidates]] & (category_counts[category[candidates]] < max_per_category)
+            ok &= distinct + (category_counts[category[candidates]] == 0) >= min_categories
+            ok &= total + value[candidates] > worst()
+
+            # Candidates are sorted by value, so the first top_n that pass are the only ones that can enter
+            for leg in candidates[ok][:top_n]:
+                entry = (total + value[leg], tuple(chosen) + (int(leg),))
+                if len(heap) < top_n:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+            return
+
+        for leg in range(start, len(value) - remaining + 1):
+            # Bound: this leg plus the best legs after it; it only gets worse further down the list
+            if total + best_run[leg, remaining] <= worst():
+                break
+            if used_players[player[leg]] or category_counts[category[leg]] >= max_per_category:
+                continue
+            if distinct + (category_counts[category[leg]] == 0) + remaining - 1 < min_categories:
+                continue
+
+            used_players[player[leg]] = True
+            category_counts[category[leg]] += 1
+            extend(leg + 1, total + value[leg], chosen + [leg])
+            used_players[player[leg]] = False
+            category_counts[category[leg]] -= 1
+
+    if len(value) >= n_legs:
+        extend(0, 0.0, [])
+
+    return sorted(heap, reverse=True)
+
+def best_parlays(df, min_legs=MIN_LEGS, max_legs=MAX_LEGS, top_n=10, thresholds=THRESHOLDS,
+                 min_categories=2, max_per_category=None):
+    """ Top-N parlays of each size from min_legs to max_legs, as one table ranked by expected value. """
+    legs = build_legs(df, thresholds)
+
+    rows = []
+    for n_legs in range(min_legs, max_legs + 1):
+        for log_value, indexes in search_parlays(legs, n_legs, top_n, min_categories, max_per_category):
+            parlay = legs.iloc[list(indexes)]
+            rows.append({
+                "legs": n_legs,
+                "parlay": " + ".join(f"{r.player} {r.side} {r.line:g} {r.category}" for r in parlay.itertuples()),
+                "hit_probability": parlay["probability"].prod(),
+                "implied_probability": parlay["implied"].prod(),
+                "payout": parlay["decimal"].prod(),
+                "ev": np.exp(log_value) - 1
+            })
+
+    columns = ["legs", "parlay", "hit_probability", "implied_probability", "payout", "ev"]
+    return pd.DataFrame(rows, columns=columns).sort_values("ev", ascending=False, kind="stable").reset_index(drop=True)
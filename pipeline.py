@@ -0,0 +1,200 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from forest_compile import forest_path
+from instrumentation import current_span, span
+
+# Fingerprints of the last successful run of every stage
+STATE_FILE = ".pipeline_state.json"
+
+# Raw odds dump and L10 stat file behind each category
+CATEGORY_INPUTS = {
+    "Rebounds": ("NBA STATS - REBOUNDS.csv", "rebounds_L10.csv"),
+    "Assists": ("NBA STATS - ASSISTS.csv", "assists_L10.csv"),
+    "Points": ("NBA STATS - POINTS.csv", "points_L10.csv")
+}
+
+# --- Stage functions (each one reads its inputs and writes its outputs) ---
+
+def clean_stage(inputs, outputs, category):
+    from best_odds import clean_odds_file
+    from line_history import LineHistory
+    from table_schema import read_table
+    clean_odds_file(inputs[0], outputs[0])
+
+    # The cleaned file is overwritten every run; keep its lines in the movement history
+    # (an out-of-order snapshot, from clock skew or an archived dump, is reported rather than failing the run)
+    try:
+        LineHistory().append(category, read_table(outputs[0], "cleaned_odds"))
+    except ValueError as e:
+        current_span().count("line_history_skipped")
+        print(f"⚠️ Line history not updated: {e}")
+
+def merge_stage(inputs, outputs, category):
+    from feature_store import CATEGORY_STATS, GameHistory, build_feature_table, write_feature_table
+    cleaned_file, l10_file = inputs
+    history = GameHistory.from_l10_files({CATEGORY_STATS[category]: l10_file})
+    write_feature_table(build_feature_table(history, {category: cleaned_file}), outputs[0])
+
+def predict_stage(inputs, outputs):
+    from AIPRun import generate_projections
+    merged_file, model_file = inputs
+    generate_projections(merged_file, model_file, outputs[0])
+
+def features_stage(inputs, outputs):
+    from feature_store import read_feature_table, write_feature_table
+    write_feature_table(pd.concat([read_feature_table(f) for f in inputs], ignore_index=True), outputs[0])
+
+def projections_stage(inputs, outputs):
+    from projection_store import build_projections, write_projections
+    write_projections(build_projections(inputs), outputs[0])
+
+def category_stages(category):
+    """ The clean -> merge -> predict branch of one category. """
+    odds_dump, l10_file = CATEGORY_INPUTS[category]
+    cleaned_file = f"Cleaned_Best_Odds_{category}.parquet"
+    merged_file = f"Merged_{category}.parquet"
+    model_file = f"AI_Model_{category}.pkl"
+
+    return [
+        {"name": f"clean:{category}", "func": clean_stage, "inputs": [odds_dump], "outputs": [cleaned_file],
+         "params": {"category": category}},
+        {"name": f"merge:{category}", "func": merge_stage, "inputs": [cleaned_file, l10_file],
+         "outputs": [merged_file], "params": {"category": category}},
+        # load_model prefers the compiled forest next to the pickle, so it's fingerprinted too (when there is one)
+        {"name": f"predict:{category}", "func": predict_stage, "inputs": [merged_file, model_file],
+         "optional_inputs": [forest_path(model_file)], "outputs": [f"AI_Projections_{category}.parquet"]}
+    ]
+
+def join_stages():
+    """ Stages that need every category's branch (the training feature table, the app's projections file). """
+    return [
+        {"name": "features", "func": features_stage, "inputs": [f"Merged_{c}.parquet" for c in CATEGORY_INPUTS],
+         "outputs": ["AI_Model_Data.parquet"]},
+        # Same row order the app has always used: Points, Rebounds, Assists
+        {"name": "projections", "func": projections_stage,
+         "inputs": [f"AI_Projections_{c}.parquet" for c in ["Points", "Rebounds", "Assists"]],
+         "outputs": ["AI_Projections.arrow"]}
+    ]
+
+# --- Fingerprinting ---
+
+def file_hash(path):
+    """ SHA-256 of a file's contents (None when it doesn't exist). """
+    if not os.path.exists(path):
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def fingerprint(stage):
+    """
+    Hash of everything a stage's output depends on: its function, parameters and input file
+    contents (optional inputs hash as None while they don't exist, so adding one reruns the stage).
+    """
+    payload = {
+        "func": f"{stage['func'].__module__}.{stage['func'].__name__}",
+        "params": stage.get("params", {}),
+        "inputs": {path: file_hash(path) for path in stage["inputs"] + stage.get("optional_inputs", [])}
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def is_up_to_date(stage, state, key):
+    """ A stage can be skipped when its fingerprint is unchanged and its outputs are the ones it wrote. """
+    previous = state.get(stage["name"])
+    if not previous or previous["fingerprint"] != key:
+        return False
+
+    return all(file_hash(path) == previous["outputs"].get(path) for path in stage["outputs"])
+
+def run_stages(stages, state, force=False):
+    """ Runs stages in order, skipping up-to-date ones. Returns (new state entries, timings). """
+    updates, timings = {}, []
+
+    for stage in stages:
+        key = fingerprint(stage)
+
+        up_to_date = not force and is_up_to_date(stage, {**state, **updates}, key)
+        current_span().cache("pipeline_stages", up_to_date)
+        if up_to_date:
+            timings.append((stage["name"], None))
+            continue
+
+        missing = [path for path in stage["inputs"] if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"{stage['name']} is missing inputs: {', '.join(missing)}")
+
+        start = time.perf_counter()
+        with span(stage["name"]):
+            stage["func"](stage["inputs"], stage["outputs"], **stage.get("params", {}))
+        timings.append((stage["name"], time.perf_counter() - start))
+
+        updates[stage["name"]] = {
+            "fingerprint": key,
+            "outputs": {path: file_hash(path) for path in stage["outputs"]}
+        }
+
+    return updates, timings
+
+def _run_branch(category, state, force):
+    with span(f"branch:{category}"):
+        return run_stages(category_stages(category), state, force)
+
+def load_state(state_file=STATE_FILE):
+    if not os.path.exists(state_file):
+        return {}
+
+    with open(state_file, "r") as file:
+        return json.load(file)
+
+def save_state(state, state_file=STATE_FILE):
+    with open(state_file, "w") as file:
+        json.dump(state, file, indent=2)
+
+def run_pipeline(categories=tuple(CATEGORY_INPUTS), workers=3, force=False, state_file=STATE_FILE):
+    """ Runs the clean -> merge -> predict branches (in parallel processes), then the join stages. """
+    with span("pipeline", categories=list(categories), force=force):
+        return _run_pipeline(categories, workers, force, state_file)
+
+def _run_pipeline(categories, workers, force, state_file):
+    state = load_state(state_file)
+    timings = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(categories)))) as pool:
+        futures = [pool.submit(_run_branch, category, state, force) for category in categories]
+        for future in futures:
+            updates, branch_timings = future.result()
+            state.update(updates)
+            timings += branch_timings
+
+    # Save after the branches so a failing join stage doesn't redo them next time
+    save_state(state, state_file)
+
+    updates, join_timings = run_stages(join_stages(), state, force)
+    state.update(updates)
+    timings += join_timings
+    save_state(state, state_file)
+
+    print("\n⏱️ Stage timings:")
+    for name, seconds in timings:
+        print(f"  {name:<20} {'skipped (up to date)' if seconds is None else f'{seconds:.2f}s'}")
+    print(f"✅ Pipeline finished in {time.perf_counter() - start:.2f}s")
+
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the clean -> merge -> predict pipeline, skipping up-to-date stages.")
+    parser.add_argument("--categories", nargs="+", default=list(CATEGORY_INPUTS), choices=list(CATEGORY_INPUTS))
+    parser.add_argument("--workers", type=int, default=3, help="Parallel category branches")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    args = parser.parse_args()
+
+    run_pipeline(args.categories, args.workers, args.force)
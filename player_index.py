@@ -0,0 +1,179 @@
+import csv
+import difflib
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+import pandas as pd
+from instrumentation import current_span
+
+# Bump when the normalization rules change so old index files get rebuilt
+INDEX_VERSION = 1
+INDEX_FILE = "player_index.json"
+
+# Book-specific spellings that normalization alone can't fix (alias,full_name)
+ALIASES_FILE = "player_aliases.csv"
+
+# Name suffixes that books add or drop at will
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Minimum similarity for the fuzzy fallback
+FUZZY_CUTOFF = 0.85
+
+_index = None
+
+def normalize_name(name):
+    """ Normalize player name to match API format (handles accents) """
+    return unicodedata.normalize('NFD', name).encode('ascii', 'ignore').decode('utf-8')
+
+def exact_key(name):
+    """ Accent-free, lowercase name (the old get_player_id comparison). """
+    return normalize_name(str(name)).lower().strip()
+
+def loose_key(name):
+    """ Name key that ignores punctuation and suffixes: "A.J. Green Jr." -> "aj green". """
+    key = exact_key(name).replace("-", " ")
+    key = re.sub(r"[^a-z0-9 ]", "", key)
+    words = [word for word in key.split() if word not in SUFFIXES]
+    return " ".join(words)
+
+def _stamp():
+    """ Version stamp saved with the index: rule version + nba_api version. """
+    try:
+        api_version = version("nba_api")
+    except PackageNotFoundError:
+        api_version = "unknown"
+
+    return {"index_version": INDEX_VERSION, "nba_api": api_version}
+
+def _load_aliases(aliases_file):
+    if not os.path.exists(aliases_file):
+        return {}
+
+    with open(aliases_file, newline="") as file:
+        return {row["alias"]: row["full_name"] for row in csv.DictReader(file)}
+
+def build_index():
+    """ Builds the name -> ID lookup tables from the nba_api roster (active players win key clashes). """
+    from nba_api.stats.static import players
+
+    exact, loose, names = {}, {}, {}
+
+    # Inactive first so active players overwrite them on a shared key
+    for player in sorted(players.get_players(), key=lambda p: p["is_active"]):
+        exact[exact_key(player["full_name"])] = player["id"]
+        loose[loose_key(player["full_name"])] = player["id"]
+        names[str(player["id"])] = player["full_name"]
+
+    return {"stamp": _stamp(), "exact": exact, "loose": loose, "names": names}
+
+def load_index(index_file=INDEX_FILE, aliases_file=ALIASES_FILE):
+    """ Returns the per-process index, reading it from disk or rebuilding it when stale. """
+    global _index
+
+    if _index is not None:
+        return _index
+
+    index = None
+    if os.path.exists(index_file):
+        with open(index_file, "r") as file:
+            index = json.load(file)
+
+        if index.get("stamp") != _stamp():
+            print(f"♻️ {index_file} is out of date, rebuilding...")
+            index = None
+
+    if index is None:
+        index = build_index()
+
+        # Pipeline workers may all rebuild on a cold start: each writes its own temp file
+        # and swaps it in, so no process ever reads a half-written index
+        temp_file = f"{index_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as file:
+            json.dump(index, file)
+        os.replace(temp_file, index_file)
+
+    # Aliases resolve through the loose keys of their full names
+    for alias, full_name in _load_aliases(aliases_file).items():
+        player_id = index["loose"].get(loose_key(full_name))
+        if player_id:
+            index["loose"][loose_key(alias)] = player_id
+
+    _index = index
+    _resolve.cache_clear()
+    return _index
+
+@lru_cache(maxsize=None)
+def _resolve(name):
+    index = _index
+
+    player_id = index["exact"].get(exact_key(name))
+    if player_id:
+        return player_id
+
+    key = loose_key(name)
+    player_id = index["loose"].get(key)
+    if player_id:
+        return player_id
+
+    # Fuzzy fallback for misspellings, only on the rare misses
+    match = difflib.get_close_matches(key, index["loose"].keys(), n=1, cutoff=FUZZY_CUTOFF)
+    return index["loose"][match[0]] if match else None
+
+def get_player_id(player_name):
+    """ Resolves a player name (any book's spelling) to its NBA Stats ID, or None. """
+    if not isinstance(player_name, str) or not player_name.strip():
+        return None
+
+    load_index()
+    return _resolve(player_name)
+
+def get_player_name(player_id):
+    """ Returns the official full name for an NBA Stats ID, or None. """
+    return load_index()["names"].get(str(player_id))
+
+def resolve_ids(names):
+    """
+    Player IDs (Int64, <NA> where a name doesn't resolve) for a column of names,
+    resolving each distinct name once. Tables get these at ingestion and join on them.
+    """
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    ids = pd.array([get_player_id(name) for name in uniques] + [None], dtype="Int64")
+    return pd.Series(ids[codes], index=names.index if isinstance(names, pd.Series) else None)
+
+def report_unmatched(names, player_ids, source):
+    """ Prints the names that didn't resolve and records them on the current span. Returns them. """
+    names = pd.Series(names, dtype=object).reset_index(drop=True)
+    missing = sorted(set(names[pd.isna(pd.Series(player_ids)).to_numpy()].dropna().astype(str)))
+    if missing:
+        shown = ", ".join(missing[:10]) + (f" (+{len(missing) - 10} more)" if len(missing) > 10 else "")
+        print(f"⚠️ {len(missing)} unmatched names in {source}: {shown}")
+
+        stage = current_span()
+        stage.count("unmatched_players", len(missing))
+        stage.note("unmatched_players", [f"{source}: {name}" for name in missing])
+    return missing
+
+def player_key(player_name):
+    """ Join key for a name: the resolved player ID, or the loose name key when it can't be resolved. """
+    player_id = get_player_id(player_name)
+    return str(player_id) if player_id else loose_key(player_name)
+
+if __name__ == "__main__":
+    import argparse
+    from instrumentation import METRICS_FILE, read_metrics
+
+    parser = argparse.ArgumentParser(description="Report the player names a run couldn't match to an ID.")
+    parser.add_argument("metrics_file", nargs="?", default=METRICS_FILE or "metrics.jsonl")
+    parser.add_argument("--run", default=None, help="Only this run ID (default: the latest run)")
+    args = parser.parse_args()
+
+    records = read_metrics(args.metrics_file)
+    run_id = args.run or records[-1]["run_id"]
+    unmatched = sorted({name for r in records if r["run_id"] == run_id for name in r.get("unmatched_players", [])})
+
+    print(f"🔍 Run {run_id}: {len(unmatched)} unmatched names")
+    for name in unmatched:
+        print(f"  {name}")
@@ -0,0 +1,89 @@
+from bisect import bisect_left
+from collections import Counter
+import numpy as np
+from player_index import loose_key
+
+# Minimum share of the query's trigrams a name must contain to be a fuzzy match
+TRIGRAM_CUTOFF = 0.5
+
+def trigrams(key):
+    """ Character trigrams of a key, padded so short names and word starts still count: "ab" -> {"  a", " ab", "ab "}. """
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerSearch:
+    """
+    Search index over the player names of a table, built once per data version.
+
+    A sorted table of name keys (one entry per word start, so "jok" finds
+    "Nikola Jokic") answers prefix queries with a binary search; a trigram
+    index ranks fuzzy matches for misspellings ("jokick"). Accents and
+    punctuation are ignored on both sides ("Doncic" finds "Dončić").
+    """
+
+    def __init__(self, names):
+        # Distinct players and the table rows of each one (every category, book and day)
+        self.names, inverse = np.unique(np.asarray(names, dtype=object).astype(str), return_inverse=True)
+        self.keys = [loose_key(name) for name in self.names]
+        order = np.argsort(inverse, kind="stable")
+        self.rows = np.split(order, np.cumsum(np.bincount(inverse, minlength=len(self.names)))[:-1])
+
+        # Prefix table: (key from each word start, name position), sorted
+        self.prefixes = sorted(
+            (key[start:], i)
+            for i, key in enumerate(self.keys)
+            for start in [0] + [j + 1 for j, char in enumerate(key) if char == " "]
+        )
+        self.prefix_keys = [prefix for prefix, _ in self.prefixes]
+
+        # Trigram -> positions of the names containing it
+        self.trigram_index = {}
+        self.trigram_counts = np.zeros(len(self.names), dtype=np.int64)
+        for i, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.trigram_counts[i] = len(grams)
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(i)
+
+    def _prefix_matches(self, key):
+        matches = []
+        for position in range(bisect_left(self.prefix_keys, key), len(self.prefix_keys)):
+            if not self.prefix_keys[position].startswith(key):
+                break
+            matches.append(self.prefixes[position][1])
+
+        # Whole-name prefixes before later-word ones, then shorter names first
+        return sorted(dict.fromkeys(matches), key=lambda i: (not self.keys[i].startswith(key), len(self.keys[i]), self.keys[i]))
+
+    def _fuzzy_matches(self, key, exclude):
+        grams = trigrams(key)
+        shared = Counter(i for gram in grams for i in self.trigram_index.get(gram, ()))
+
+        # Rank by how much of the query a name covers (so one word of a long name still matches),
+        # then by overall similarity (Dice coefficient)
+        scored = []
+        for i, count in shared.items():
+            coverage = count / len(grams)
+            if coverage >= TRIGRAM_CUTOFF and i not in exclude:
+                dice = 2 * count / (len(grams) + self.trigram_counts[i])
+                scored.append((-coverage, -dice, self.keys[i], i))
+
+        return [i for *_, i in sorted(scored)]
+
+    def search(self, query, limit=10):
+        """ Ranked player names for a query: prefix matches first, then fuzzy ones. """
+        key = loose_key(query) if isinstance(query, str) else ""
+        if not key:
+            return []
+
+        matches = self._prefix_matches(key)
+        if len(matches) < limit:
+            matches += self._fuzzy_matches(key, set(matches))
+
+        return [str(self.names[i]) for i in matches[:limit]]
+
+    def row_positions(self, names):
+        """ Table row positions of the given players, in the order they're listed. """
+        positions = np.searchsorted(self.names, names)
+        rows = [self.rows[i] for i, name in zip(positions, names) if i < len(self.names) and self.names[i] == name]
+        return np.concatenate(rows) if rows else np.array([], dtype=np.int64)
@@ -0,0 +1,283 @@
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from instrumentation import span
+
+# Local address of the API (Streamlit uses 8501, the inference service 8502)
+HOST = "127.0.0.1"
+PORT = 8503
+
+# Row fields served (the ones the app shows plus the odds, probabilities and EV)
+ROW_COLUMNS = [
+    "player", "player_id", "category", "best_point", "best_over_odds", "best_under_odds", "average",
+    "AI_Projection", "Edge", "AI_P_Over", "AI_P_Under", "EV_Over", "EV_Under"
+]
+
+# Page size when none is asked for, and the most rows one page can hold
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Responses kept per data version (the default pages are serialized up front, others on first request)
+CACHE_SIZE = 1024
+
+# Bodies smaller than this aren't worth gzipping
+GZIP_MIN_BYTES = 512
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class Response:
+    """ A serialized response body, its gzipped copy and its ETag. """
+
+    def __init__(self, payload, version_tag):
+        self.body = payload
+        self.gzipped = gzip.compress(payload, 6) if len(payload) >= GZIP_MIN_BYTES else None
+        self.etag = f'"{version_tag}-{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+class Snapshot:
+    """
+    One data version of the projections: the table, its search index and ranked
+    views, every row pre-serialized as JSON, and the responses built from them.
+    """
+
+    def __init__(self, version, previous=None):
+        from player_search import PlayerSearch
+        from projection_store import load_projections
+        from ranked_views import RankedViews
+
+        self.version = version
+        self.tag = hashlib.blake2b(repr(version).encode(), digest_size=6).hexdigest()
+
+        with span("api:snapshot") as stage:
+            self.df = load_projections()
+            self.search = PlayerSearch(self.df["player"].to_numpy())
+            self.views = RankedViews(self.df, previous=previous.views if previous else None)
+            self.categories = list(self.views.categories)
+
+            # Each row's JSON once; a page is then just a join of its rows
+            columns = [col for col in ROW_COLUMNS if col in self.df.columns]
+            lines = self.df[columns].to_json(orient="records", lines=True, double_precision=4)
+            self.rows = np.array([line.encode() for line in lines.splitlines()], dtype=object)
+
+            self.responses = OrderedDict()
+            self.lock = threading.Lock()
+            stage.rows(rows_out=len(self.df))
+
+    def response(self, key, build):
+        """ The cached response for a normalized request, built (and serialized) on first use. """
+        with self.lock:
+            cached = self.responses.get(key)
+            if cached is not None:
+                self.responses.move_to_end(key)
+                return cached
+
+        cached = Response(serialize(build()), self.tag)
+        with self.lock:
+            self.responses[key] = cached
+            while len(self.responses) > CACHE_SIZE:
+                self.responses.popitem(last=False)
+        return cached
+
+def serialize(body):
+    """ Compact JSON of a response; "items" given as bytes are already-serialized rows and are spliced in as-is. """
+    items = body.get("items")
+    if not isinstance(items, bytes):
+        return json.dumps(body, separators=(",", ":")).encode()
+
+    head = json.dumps({k: v for k, v in body.items() if k != "items"}, separators=(",", ":")).encode()
+    return head[:-1] + (b',"items":' if len(head) > 2 else b'"items":') + items + b"}"
+
+class ProjectionAPI:
+    """
+    Read-only JSON API over the projections the app shows.
+
+    Routes (GET): /categories, /players?q=&category=, /top?category=&threshold=,
+    /hot and /cold (?category=&threshold=&k=), /health. Lists are paginated with
+    ?page=&per_page=. Responses are cached per data version (AI_Projections.arrow's
+    mtime and size), carry an ETag (If-None-Match -> 304) and are gzipped when the
+    client accepts it.
+    """
+
+    def __init__(self):
+        self.snapshot = None
+        self.lock = threading.Lock()
+        self.routes = {
+            "/categories": self._categories,
+            "/players": self._players,
+            "/top": lambda snapshot, params: self._ranked(snapshot, params, "top"),
+            "/hot": lambda snapshot, params: self._ranked(snapshot, params, "hot"),
+            "/cold": lambda snapshot, params: self._ranked(snapshot, params, "cold"),
+            "/health": lambda snapshot, params: {"status": "ok", "version": snapshot.tag, "rows": len(snapshot.df)}
+        }
+
+    def current(self):
+        """ The snapshot of the data on disk now, rebuilt (once, under a lock) when the artifact changes. """
+        from projection_store import artifact_version
+
+        version = artifact_version()
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != version:
+            with self.lock:
+                if self.snapshot is None or self.snapshot.version != version:
+                    self.snapshot = Snapshot(version, previous=self.snapshot)
+                    self._warm(self.snapshot)
+                snapshot = self.snapshot
+        return snapshot
+
+    def _warm(self, snapshot):
+        """ Serializes the default pages of every route right after a new version is loaded. """
+        for path in ["/categories", "/players", "/top", "/hot", "/cold"]:
+            self.get(path, snapshot=snapshot)
+        for category in snapshot.categories:
+            for path in ["/top", "/hot", "/cold"]:
+                self.get(f"{path}?category={category}", snapshot=snapshot)
+
+    def get(self, target, headers=None, snapshot=None):
+        """ Answers one GET request: returns (status, headers, body). Usable without a server (in-process client). """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        url = urlparse(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        route = self.routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return self._error(404, f"Unknown path: {url.path}")
+
+        snapshot = snapshot or self.current()
+        key = (url.path.rstrip("/"), tuple(sorted(params.items())))
+        try:
+            response = snapshot.response(key, lambda: route(snapshot, params))
+        except APIError as e:
+            return self._error(e.status, str(e))
+
+        response_headers = {"ETag": response.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if response.etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            return 304, response_headers, b""
+
+        response_headers["Content-Type"] = "application/json"
+        if response.gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+            response_headers["Content-Encoding"] = "gzip"
+            return 200, response_headers, response.gzipped
+        return 200, response_headers, response.body
+
+    @staticmethod
+    def _error(status, message):
+        return status, {"Content-Type": "application/json"}, json.dumps({"error": message}).encode()
+
+    # --- Routes (each returns the response as a dict, with a page's rows as pre-serialized bytes) ---
+
+    @staticmethod
+    def _number(params, name, default, cast=int):
+        try:
+            return cast(params[name]) if name in params else default
+        except ValueError:
+            raise APIError(400, f"{name} must be a number")
+
+    def _page(self, snapshot, positions, params):
+        page = self._number(params, "page", 1)
+        per_page = self._number(params, "per_page", PAGE_SIZE)
+        if page < 1 or not 1 <= per_page <= MAX_PAGE_SIZE:
+            raise APIError(400, f"page must be >= 1 and per_page between 1 and {MAX_PAGE_SIZE}")
+
+        chunk = positions[(page - 1) * per_page:page * per_page]
+        rows = b"[" + b",".join(snapshot.rows[chunk]) + b"]"
+        return {
+            "version": snapshot.tag, "page": page, "per_page": per_page, "total": len(positions),
+            "pages": -(-len(positions) // per_page), "items": rows
+        }
+
+    def _category(self, snapshot, params):
+        category = params.get("category")
+        if category is not None and category not in snapshot.categories:
+            raise APIError(404, f"Unknown category: {category} (one of {', '.join(snapshot.categories)})")
+        return category
+
+    def _categories(self, snapshot, params):
+        from ranked_views import THRESHOLDS
+
+        return {
+            "version": snapshot.tag,
+            "items": [
+                {"category": category, "rows": len(snapshot.views.positions[category]), "threshold": THRESHOLDS.get(category)}
+                for category in snapshot.categories
+            ]
+        }
+
+    def _players(self, snapshot, params):
+        category = self._category(snapshot, params)
+        if params.get("q"):
+            positions = snapshot.search.row_positions(snapshot.search.search(params["q"]))
+        else:
+            positions = np.arange(len(snapshot.df))
+
+        if category is not None:
+            positions = positions[np.isin(positions, snapshot.views.positions[category])]
+        return self._page(snapshot, positions, params)
+
+    def _ranked(self, snapshot, params, kind):
+        """
+        Rows ranked by Edge ("top": all of them by default) or the Hot/Cold lists (k best, 2 by default
+        like the app) of one or every category, over the app's line thresholds unless one is given.
+        """
+        from ranked_views import THRESHOLDS
+
+        category = self._category(snapshot, params)
+        k = self._number(params, "k", None if kind == "top" else 2)
+        threshold = self._number(params, "threshold", None, float)
+
+        if category is not None:
+            positions = snapshot.views.ranked(category, kind, THRESHOLDS.get(category, 0) if threshold is None else threshold, k)
+        else:
+            thresholds = THRESHOLDS if threshold is None else {c: threshold for c in snapshot.categories}
+            positions = snapshot.views.across(kind, thresholds, k=len(snapshot.df) if k is None else k)
+        return self._page(snapshot, positions, params)
+
+def make_handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so clients don't reconnect per request
+        disable_nagle_algorithm = True  # Headers and body go out as separate writes; don't hold the body back
+
+        def do_GET(self):
+            try:
+                status, headers, body = api.get(self.path, self.headers)
+            except Exception as e:
+                status, headers, body = api._error(500, f"{type(e).__name__}: {e}")
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet
+
+    return Handler
+
+def serve(host=HOST, port=PORT):
+    api = ProjectionAPI()
+    api.current()
+
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    print(f"🚀 Projections API running at http://{host}:{port} (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the projections as a read-only JSON API.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+
+    serve(args.host, args.port)
@@ -0,0 +1,67 @@
+import argparse
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from instrumentation import current_span, span
+from table_schema import parquet_path, read_table
+
+# One columnar file with every category's projections, read by app.py
+PROJECTIONS_FILE = "AI_Projections.arrow"
+
+# Per-category outputs of AIPRun.generate_projections
+PROJECTION_FILES = ["AI_Projections_Points.csv", "AI_Projections_Rebounds.csv", "AI_Projections_Assists.csv"]
+
+def build_projections(projection_files=PROJECTION_FILES):
+    """ Concatenates the category projections and precomputes the display columns (rounded values, Edge). """
+    df = pd.concat([read_table(f, "projections") for f in projection_files], ignore_index=True)
+    current_span().rows(rows_in=len(df))
+
+    # Convert columns to numeric and round to 1 decimal place
+    df["AI_Projection"] = pd.to_numeric(df["AI_Projection"], errors="coerce").round(1)
+    df["best_point"] = pd.to_numeric(df["best_point"], errors="coerce").round(1)
+
+    # Calculate Edge column (AI Projection - Line)
+    df["Edge"] = (df["AI_Projection"] - df["best_point"]).round(1)
+
+    return df
+
+def write_projections(df, output_file=PROJECTIONS_FILE):
+    """ Writes the table as an uncompressed Arrow file (memory-mappable), replacing the old one atomically. """
+    temp_file = f"{output_file}.tmp"
+    feather.write_feather(df, temp_file, compression="uncompressed")
+
+    # Readers never see a half-written file
+    os.replace(temp_file, output_file)
+    current_span().rows(rows_out=len(df))
+    print(f"✅ Projections saved as: {output_file} ({len(df)} rows)")
+
+def read_projections(file_path=PROJECTIONS_FILE):
+    """
+    Memory-maps the Arrow file into a DataFrame.
+
+    Numeric columns without missing values are read-only views onto the
+    mapped file, so one frame can be shared between sessions without copies.
+    """
+    # The mapping stays open for as long as the frame references it
+    table = pa.ipc.open_file(pa.memory_map(file_path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+def artifact_version(file_path=PROJECTIONS_FILE, projection_files=PROJECTION_FILES):
+    """ Cheap change stamp for caching: the artifact's mtime and size, or the projection files' when there's no artifact yet. """
+    paths = [file_path] if os.path.exists(file_path) else projection_files + [parquet_path(f) for f in projection_files]
+    return tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths if os.path.exists(path))
+
+def load_projections(file_path=PROJECTIONS_FILE, projection_files=PROJECTION_FILES):
+    """ Reads the artifact, or builds the table from the CSVs when the pipeline hasn't written one yet. """
+    if os.path.exists(file_path):
+        return read_projections(file_path)
+    return build_projections(projection_files)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the columnar projections file read by the app.")
+    parser.add_argument("--output", default=PROJECTIONS_FILE)
+    args = parser.parse_args()
+
+    with span("projections"):
+        write_projections(build_projections(), args.output)
@@ -0,0 +1,124 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from instrumentation import current_span, span
+from parlay import american_to_decimal, no_vig_probability
+from table_schema import GAME_COLUMNS
+
+# Simulated games per prop and the seed they're drawn with (same slate in, same probabilities out)
+N_SIMULATIONS = 10_000
+SEED = 42
+
+# Most draws held in memory at once (props per chunk = MAX_DRAWS // simulations)
+MAX_DRAWS = 2_000_000
+
+METHODS = ("negbin", "bootstrap")
+
+# Columns added to the projection output
+PROBABILITY_COLUMNS = ["AI_P_Over", "AI_P_Under", "Market_P_Over", "Market_P_Under", "EV_Over", "EV_Under"]
+
+def _simulate_negbin(projection, games, n_simulations, rng):
+    """
+    Counting-stat draws around the projection: negative binomial (gamma-Poisson)
+    with the dispersion (variance / mean) of the player's games, Poisson when
+    the games aren't overdispersed.
+    """
+    valid = (~np.isnan(games)).sum(axis=1)
+    mean = np.nanmean(np.where(valid[:, None] > 0, games, 0), axis=1)
+    var = np.where(valid > 1, np.nanvar(np.where(valid[:, None] > 1, games, 0), axis=1, ddof=1), mean)
+    dispersion = np.where(mean > 0, var / np.where(mean > 0, mean, 1), 1)
+
+    # Negative binomial with mean m and variance d * m: gamma shape m / (d - 1), scale d - 1
+    rate = np.broadcast_to(np.maximum(projection, 0)[:, None], (len(projection), n_simulations)).copy()
+    over = dispersion > 1
+    if over.any():
+        shape = rate[over, :1] / (dispersion[over, None] - 1)
+        rate[over] = rng.gamma(np.maximum(shape, 1e-9), dispersion[over, None] - 1, (over.sum(), n_simulations))
+    return rng.poisson(rate).astype(np.float32)
+
+def _simulate_bootstrap(projection, games, n_simulations, rng):
+    """ Resampled games, shifted so each player's games average to the projection. """
+    games = np.sort(games, axis=1)  # Missing games last
+    valid = (~np.isnan(games)).sum(axis=1)
+    residuals = games - np.nanmean(np.where(valid[:, None] > 0, games, 0), axis=1)[:, None]
+
+    picks = (rng.random((len(projection), n_simulations)) * np.maximum(valid, 1)[:, None]).astype(np.int64)
+    draws = np.take_along_axis(np.nan_to_num(residuals), picks, axis=1)
+    return (np.maximum(projection[:, None] + draws, 0)).astype(np.float32)
+
+def simulate_probabilities(projection, line, games, n_simulations=N_SIMULATIONS, method="negbin", seed=SEED):
+    """
+    P(over), P(under) (and P(push) on whole-number lines) of every prop, from
+    n_simulations simulated games each, drawn in chunks of props so memory
+    stays under MAX_DRAWS draws. Props without a projection or line get NaN.
+    """
+    simulate = {"negbin": _simulate_negbin, "bootstrap": _simulate_bootstrap}[method]
+    projection = np.asarray(projection, dtype=float)
+    line = np.asarray(line, dtype=float)
+    games = np.asarray(games, dtype=float).reshape(len(projection), -1)
+
+    p_over = np.full(len(projection), np.nan)
+    p_under = np.full(len(projection), np.nan)
+    rows = np.flatnonzero(~np.isnan(projection) & ~np.isnan(line))
+
+    rng = np.random.default_rng(seed)
+    chunk_size = max(1, MAX_DRAWS // n_simulations)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        draws = simulate(projection[chunk], games[chunk], n_simulations, rng)
+        p_over[chunk] = (draws > line[chunk, None]).mean(axis=1)
+        p_under[chunk] = (draws < line[chunk, None]).mean(axis=1)
+
+    current_span().count("simulated_props", len(rows))
+    return p_over, p_under, 1 - p_over - p_under
+
+def expected_value(p_win, p_push, odds):
+    """ Expected profit per unit staked at an American price (pushes refunded). """
+    return p_win * (american_to_decimal(odds) - 1) - (1 - p_win - p_push)
+
+def add_probabilities(df, n_simulations=N_SIMULATIONS, method="negbin", seed=SEED):
+    """
+    Adds the simulated over/under probabilities, the book's vig-free ones and
+    the EV of each side to a projection table (needs AI_Projection, best_point,
+    best_over_odds, best_under_odds and the game columns).
+    """
+    games = df.reindex(columns=GAME_COLUMNS).to_numpy(dtype=float)
+    p_over, p_under, p_push = simulate_probabilities(df["AI_Projection"], df["best_point"], games,
+                                                     n_simulations, method, seed)
+
+    over_odds = df["best_over_odds"].to_numpy(dtype=float)
+    under_odds = df["best_under_odds"].to_numpy(dtype=float)
+    market_over = no_vig_probability(over_odds, under_odds)
+
+    df = df.copy()
+    df["AI_P_Over"] = p_over
+    df["AI_P_Under"] = p_under
+    df["Market_P_Over"] = market_over
+    df["Market_P_Under"] = 1 - market_over
+    df["EV_Over"] = expected_value(p_over, p_push, over_odds)
+    df["EV_Under"] = expected_value(p_under, p_push, under_odds)
+    return df
+
+if __name__ == "__main__":
+    from projection_store import load_projections
+
+    parser = argparse.ArgumentParser(description="Simulate over/under probabilities and EV for every prop on the slate.")
+    parser.add_argument("--simulations", type=int, default=N_SIMULATIONS)
+    parser.add_argument("--method", default="negbin", choices=METHODS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with span("probabilities", method=args.method, simulations=args.simulations):
+        start = time.perf_counter()
+        df = add_probabilities(load_projections(), args.simulations, args.method, args.seed)
+        print(f"🎲 {len(df)} props x {args.simulations:,} simulations in {time.perf_counter() - start:.2f}s")
+
+    # Best side of every prop, by EV
+    sides = pd.concat([
+        df.assign(side="Over", p=df["AI_P_Over"], market=df["Market_P_Over"], ev=df["EV_Over"]),
+        df.assign(side="Under", p=df["AI_P_Under"], market=df["Market_P_Under"], ev=df["EV_Under"])
+    ])
+    top = sides.sort_values("ev", ascending=False).head(args.top)
+    print(top[["player", "category", "side", "best_point", "AI_Projection", "p", "market", "ev"]].round(3).to_string(index=False))
@@ -0,0 +1,99 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Minimum line per category for the Hot/Cold and AI Props pages
+THRESHOLDS = {"Points": 15, "Rebounds": 4, "Assists": 4}
+
+# Columns the rankings depend on (a category is only re-ranked when these change)
+RANK_COLUMNS = ["player", "best_point", "AI_Projection", "Edge"]
+
+class CategoryViews:
+    """
+    One category's rows ranked by Edge, as sorted index arrays.
+
+    Indexes are local to the category (0 = its first row in the table), so
+    the views stay valid when other categories' rows move. Filtered views
+    ("top", "hot", "cold") are built once per threshold and then sliced.
+    """
+
+    def __init__(self, rows):
+        self.fingerprint = category_fingerprint(rows)
+
+        edge = rows["Edge"].to_numpy(dtype=float)
+        self.line = rows["best_point"].to_numpy(dtype=float)
+        projection = rows["AI_Projection"].to_numpy(dtype=float)
+
+        # Ties keep table order (like nlargest/nsmallest keep="first"); missing edges are never ranked
+        local = np.flatnonzero(~np.isnan(edge))
+        self.descending = local[np.lexsort((local, -edge[local]))]
+        self.ascending = local[np.lexsort((local, edge[local]))]
+        self.over = projection > self.line
+        self.under = projection < self.line
+
+        self.views = {}
+
+    def view(self, kind, threshold):
+        """ Local indexes, best first: "top" by Edge, "hot" (projection over the line) or "cold" (under, lowest Edge first). """
+        key = (kind, threshold)
+        if key not in self.views:
+            order = self.ascending if kind == "cold" else self.descending
+            keep = self.line[order] >= threshold
+            if kind == "hot":
+                keep &= self.over[order]
+            elif kind == "cold":
+                keep &= self.under[order]
+            self.views[key] = order[keep]
+
+        return self.views[key]
+
+def category_fingerprint(rows):
+    """ Hash of the rows a category's rankings are built from. """
+    hashes = pd.util.hash_pandas_object(rows[RANK_COLUMNS], index=False).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+class RankedViews:
+    """
+    Ranked views of every category of the projections table, built once per data version.
+
+    Pass the previous version's RankedViews to reuse the rankings of every
+    category whose rows didn't change.
+    """
+
+    def __init__(self, df, previous=None, thresholds=THRESHOLDS):
+        self.positions, self.categories = {}, {}
+        self.edge = df["Edge"].to_numpy(dtype=float)
+
+        for category, positions in df.groupby("category", observed=True, sort=False).indices.items():
+            rows = df.iloc[positions]
+            reused = previous.categories.get(category) if previous else None
+
+            if reused is not None and reused.fingerprint == category_fingerprint(rows):
+                self.categories[category] = reused
+            else:
+                self.categories[category] = CategoryViews(rows)
+            self.positions[category] = positions
+
+        # Materialize the pages' default views up front
+        for category, threshold in thresholds.items():
+            if category in self.categories:
+                for kind in ("top", "hot", "cold"):
+                    self.categories[category].view(kind, threshold)
+
+    def ranked(self, category, kind="top", threshold=0, k=None):
+        """ Table row positions of one category's ranked view (the first k). """
+        if category not in self.categories:
+            return np.array([], dtype=np.int64)
+
+        return self.positions[category][self.categories[category].view(kind, threshold)[:k]]
+
+    def across(self, kind, thresholds=THRESHOLDS, k=2):
+        """ The k best rows over every category (each with its own threshold), best first. """
+        candidates = np.concatenate(
+            [self.ranked(category, kind, threshold, k) for category, threshold in thresholds.items()] +
+            [np.array([], dtype=np.int64)]
+        )
+
+        edge = self.edge[candidates]
+        order = np.lexsort((candidates, edge if kind == "cold" else -edge))
+        return candidates[order][:k]
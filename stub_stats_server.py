@@ -0,0 +1,121 @@
+import argparse
+import json
+import random
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Columns of the playergamelogs result set that the pipeline reads
+GAME_LOG_HEADERS = ["SEASON_YEAR", "PLAYER_ID", "PLAYER_NAME", "GAME_ID", "GAME_DATE", "MATCHUP", "MIN", "PTS", "AST", "REB"]
+
+def make_game_logs(player_id, season="2024-25", n_games=30):
+    """ Builds a deterministic fake season of game logs for one player. """
+    rng = random.Random(int(player_id))
+    start = date(int(season[:4]), 10, 22)
+
+    rows = []
+    for i in range(n_games):
+        game_date = start + timedelta(days=2 * i)
+        rows.append([
+            season, int(player_id), f"Player {player_id}", f"002{int(player_id) % 100000:05d}{i:03d}",
+            game_date.strftime("%Y-%m-%dT00:00:00"), "AAA vs. BBB", rng.randint(10, 40),
+            rng.randint(0, 40), rng.randint(0, 12), rng.randint(0, 15)
+        ])
+
+    return rows
+
+def game_logs_response(rows):
+    """ Wraps rows in the same JSON shape as the stats.nba.com playergamelogs endpoint. """
+    return {
+        "resource": "playergamelogs",
+        "parameters": {},
+        "resultSets": [{"name": "PlayerGameLogs", "headers": GAME_LOG_HEADERS, "rowSet": rows}]
+    }
+
+def in_date_range(game_date, date_from=None, date_to=None):
+    """ Applies the endpoint's DateFrom/DateTo (MM/DD/YYYY) filters. """
+    game_date = datetime.strptime(game_date[:10], "%Y-%m-%d")
+
+    if date_from and game_date < datetime.strptime(date_from, "%m/%d/%Y"):
+        return False
+    if date_to and game_date > datetime.strptime(date_to, "%m/%d/%Y"):
+        return False
+
+    return True
+
+class StubHandler(BaseHTTPRequestHandler):
+    """ Answers /stats/playergamelogs like the NBA Stats API, failing a share of requests on purpose. """
+
+    fail_rate = 0.0
+    delay = 0.0
+    league_ids = []
+    request_count = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            type(self).request_count += 1
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if not url.path.endswith("/playergamelogs"):
+            return self._send(404, {"message": "not found"})
+
+        if self.delay:
+            threading.Event().wait(self.delay)
+
+        if random.random() < self.fail_rate:
+            return self._send(random.choice([429, 500, 503]), {"message": "try again"})
+
+        season = params.get("Season", "2024-25")
+
+        # Without a PlayerID the real endpoint returns the whole league's logs
+        if "PlayerID" in params:
+            rows = make_game_logs(params["PlayerID"], season)
+        else:
+            rows = [row for player_id in self.league_ids for row in make_game_logs(player_id, season)]
+
+        rows = [row for row in rows if in_date_range(row[4], params.get("DateFrom"), params.get("DateTo"))]
+        return self._send(200, game_logs_response(rows))
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet
+
+def start_stub_server(port=0, fail_rate=0.0, delay=0.0, league_ids=None):
+    """ Starts the stub server in a background thread. Returns (server, base_url). """
+    if league_ids is None:
+        # League-wide requests cover every active player, like the real endpoint
+        from nba_api.stats.static import players
+        league_ids = [player["id"] for player in players.get_active_players()]
+
+    handler = type("Handler", (StubHandler,), {
+        "fail_rate": fail_rate, "delay": delay, "league_ids": league_ids, "request_count": 0
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/stats"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the NBA Stats playergamelogs endpoint.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.1, help="Share of requests answered with 429/5xx")
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds of latency per request")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.fail_rate, args.delay)
+    print(f"🧪 Stub stats server running at {base_url} (Ctrl+C to stop)")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
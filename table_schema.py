@@ -0,0 +1,123 @@
+import argparse
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from instrumentation import current_span
+
+# Also write the CSV next to each Parquet file, for reading by eye / spreadsheets (off by default)
+WRITE_CSV = os.environ.get("NBA_WRITE_CSV", "") not in ("", "0")
+
+# --- Columns ---
+
+GAME_COLUMNS = [f"game {i}" for i in range(1, 11)]
+ODDS_COLUMNS = ["best_over_odds", "best_under_odds", "best_point"]
+
+# Rolling windows (in games) of the feature table; add a window here and it's one more column, not another pass
+WINDOWS = (5, 10, 20)
+FEATURE_COLUMNS = ["projection", "recent_form", "edge"] + [f"l{n}" for n in WINDOWS] + ["ewma", "std", "per36"]
+
+# --- Schemas (column -> dtype) of every intermediate file; columns not listed keep the type they have ---
+
+# Cleaned_Best_Odds_<Category>: best lines per player (best_odds.clean_odds_file)
+CLEANED_ODDS_SCHEMA = {
+    "Player": "category",
+    "player_id": "Int64",
+    "Best_Over_Odds": "float32",
+    "Best_Under_Odds": "float32",
+    "Best_Point": "float32"
+}
+
+# Merged_<Category> and AI_Model_Data: odds joined to the game history and features (feature_store)
+FEATURE_SCHEMA = {
+    "player": "category",
+    "category": "category",
+    "player_id": "Int64",
+    **{col: "float32" for col in ODDS_COLUMNS + GAME_COLUMNS},
+    **{col: "float64" for col in ["average"] + FEATURE_COLUMNS}
+}
+
+# AI_Projections_<Category>: the feature rows plus the model's output and the simulated probabilities / EV
+PROJECTION_SCHEMA = {
+    **FEATURE_SCHEMA,
+    "AI_Projection": "float64",
+    "AI_Edge": "float64",
+    **{col: "float64" for col in ["AI_P_Over", "AI_P_Under", "Market_P_Over", "Market_P_Under", "EV_Over", "EV_Under"]}
+}
+
+SCHEMAS = {"cleaned_odds": CLEANED_ODDS_SCHEMA, "features": FEATURE_SCHEMA, "projections": PROJECTION_SCHEMA}
+
+def parquet_path(path):
+    """ The Parquet file behind an intermediate, from either of its names ("Merged_Points.csv" or ".parquet"). """
+    return f"{os.path.splitext(path)[0]}.parquet"
+
+def csv_path(path):
+    return f"{os.path.splitext(path)[0]}.csv"
+
+def apply_schema(df, schema):
+    """ Casts the schema's columns (numbers parsed leniently, like pd.to_numeric(errors="coerce")). A schema is a name in SCHEMAS or a dict. """
+    schema = SCHEMAS[schema] if isinstance(schema, str) else schema
+    df = df.copy()
+    for col, dtype in schema.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if dtype == "category":
+            df[col] = df[col].astype("category")
+        else:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    return df
+
+def write_table(df, path, schema, csv=None, csv_format=None):
+    """
+    Writes an intermediate as typed Parquet (atomically), plus the CSV side output when
+    asked (csv=True, or NBA_WRITE_CSV=1), formatted by csv_format if given. Returns the typed frame.
+    """
+    df = apply_schema(df, schema)
+    output_file = parquet_path(path)
+
+    # CSV first, so the Parquet file is the newer one and stays the one read_table picks
+    if WRITE_CSV if csv is None else csv:
+        (csv_format(df) if csv_format else df).to_csv(csv_path(path), index=False)
+
+    temp_file = f"{output_file}.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file)
+    os.replace(temp_file, output_file)
+
+    current_span().rows(rows_out=len(df))
+    return df
+
+def read_table(path, schema=None, columns=None):
+    """
+    Reads an intermediate by either of its names: the Parquet file when there is one at least
+    as new as the CSV (as written by write_table), else the CSV with the schema's types applied.
+    """
+    table_file, text_file = parquet_path(path), csv_path(path)
+    use_parquet = os.path.exists(table_file) and (
+        not os.path.exists(text_file) or os.path.getmtime(table_file) >= os.path.getmtime(text_file)
+    )
+    current_span().cache("parquet", use_parquet)
+
+    if use_parquet:
+        return pd.read_parquet(table_file, columns=columns)
+
+    if not os.path.exists(text_file):
+        raise FileNotFoundError(f"Neither {table_file} nor {text_file} exists")
+
+    df = pd.read_csv(text_file, usecols=columns)
+    return apply_schema(df, schema) if schema else df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export intermediate Parquet files as CSV (or convert CSVs to Parquet).")
+    parser.add_argument("files", nargs="+", help="Intermediate files, by either name")
+    parser.add_argument("--schema", default=None, choices=list(SCHEMAS), help="Types for --to-parquet")
+    parser.add_argument("--to-parquet", action="store_true", help="Convert the CSVs to typed Parquet instead")
+    args = parser.parse_args()
+
+    for file in args.files:
+        if args.to_parquet:
+            write_table(pd.read_csv(csv_path(file)), file, args.schema or {}, csv=False)
+            print(f"✅ {parquet_path(file)} written")
+        else:
+            pd.read_parquet(parquet_path(file)).to_csv(csv_path(file), index=False)
+            os.utime(csv_path(file), ns=(os.stat(parquet_path(file)).st_atime_ns, os.stat(parquet_path(file)).st_mtime_ns))
+            print(f"✅ {csv_path(file)} written")
@@ -0,0 +1,140 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from forest_compile import forest_path, save_compiled
+from inference_service import CATEGORY_MODELS
+from instrumentation import current_span, traced
+from table_schema import read_table
+
+# Same features and target as ai2025.py
+FEATURES = ["average", "best_point", "best_over_odds", "best_under_odds"]
+TARGET = "AI_Projection"
+
+# Training data behind each category model
+CATEGORY_DATA = {category: f"Merged_{category}.csv" for category in CATEGORY_MODELS}
+
+N_ESTIMATORS = 100
+
+def load_training_data(input_file, category=None):
+    """ Rows with every feature present, plus the target (the L10 average nudged up, as in ai2025.py). """
+    df = read_table(input_file, "features")
+    if category and "category" in df.columns and df["category"].nunique() > 1:
+        df = df[df["category"] == category]
+
+    df = df.dropna(subset=FEATURES).reset_index(drop=True)
+    df[TARGET] = df["average"] * 1.05
+    return df
+
+def row_hashes(df):
+    """ One hash per training row, to tell already-seen rows from new ones. """
+    return pd.util.hash_pandas_object(df[FEATURES + [TARGET]], index=False).to_numpy()
+
+def split_rows(df):
+    """
+    Train/test split (80/20) decided by each row's hash, so a row stays on
+    the same side as new rows arrive and warm starts never train on old test rows.
+    """
+    test = row_hashes(df) % 5 == 0
+    return df[~test], df[test]
+
+def new_model(n_jobs):
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("regressor", RandomForestRegressor(n_estimators=N_ESTIMATORS, random_state=42, n_jobs=n_jobs))
+    ])
+
+def train_category(category, input_file, model_file, n_jobs=1, warm_start=False, new_trees=20):
+    """
+    Trains (or warm-starts) one category model, saves it and returns a report row.
+
+    A warm start keeps the existing trees and the fitted scaler, and fits
+    new_trees more trees on the training rows the model hasn't seen yet.
+    """
+    start = time.perf_counter()
+    df = load_training_data(input_file, category)
+    train, test = split_rows(df)
+
+    model, mode = None, "full"
+    if warm_start and os.path.exists(model_file):
+        model = joblib.load(model_file)
+        if not hasattr(model, "trained_rows_"):
+            model, mode = None, "full (no row history)"
+
+    if model is None:
+        model = new_model(n_jobs)
+        model.fit(train[FEATURES], train[TARGET])
+        model.trained_rows_ = np.unique(row_hashes(train))
+    else:
+        hashes = row_hashes(train)
+        fresh = train[~np.isin(hashes, model.trained_rows_)]
+        if fresh.empty:
+            mode = "skipped (no new rows)"
+        else:
+            # The old trees split on the old scaler's output, so keep it and only grow the forest
+            scaler, regressor = model.named_steps["scaler"], model.named_steps["regressor"]
+            regressor.set_params(warm_start=True, n_jobs=n_jobs, n_estimators=len(regressor.estimators_) + new_trees)
+            regressor.fit(scaler.transform(fresh[FEATURES]), fresh[TARGET])
+            model.trained_rows_ = np.union1d(model.trained_rows_, hashes)
+            mode = f"warm (+{new_trees} trees on {len(fresh)} new rows)"
+
+    if not mode.startswith("skipped"):
+        joblib.dump(model, model_file)
+        save_compiled(model, forest_path(model_file))
+
+    stage = current_span()
+    stage.rows(rows_in=len(df), rows_out=len(train))
+    stage.cache("warm_start", mode.startswith("warm") or mode.startswith("skipped"))
+
+    return {
+        "category": category,
+        "mode": mode,
+        "rows": len(train),
+        "trees": len(model.named_steps["regressor"].estimators_),
+        "mae": mean_absolute_error(test[TARGET], model.predict(test[FEATURES])) if len(test) else np.nan,
+        "seconds": time.perf_counter() - start
+    }
+
+def train_all(categories=tuple(CATEGORY_MODELS), data=None, workers=None, n_jobs=None, warm_start=False, new_trees=20):
+    """
+    Trains every category model, each in its own process, with the cores
+    shared out between the forests (n_jobs trees in parallel per fit).
+    """
+    cores = os.cpu_count() or 1
+    workers = workers or len(categories)
+    n_jobs = n_jobs or max(1, cores // workers)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(traced, f"train:{category}", train_category, category, data or CATEGORY_DATA[category],
+                        CATEGORY_MODELS[category], n_jobs, warm_start, new_trees)
+            for category in categories
+        ]
+        report = pd.DataFrame([future.result() for future in futures])
+
+    wall = time.perf_counter() - start
+    print(f"\n⏱️ Training report ({workers} processes x {n_jobs} threads):")
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    print(f"✅ All models trained in {wall:.2f}s (sum of fits {report['seconds'].sum():.2f}s)")
+
+    return report, wall
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the per-category models in parallel, optionally warm-starting them.")
+    parser.add_argument("--categories", nargs="+", default=list(CATEGORY_MODELS), choices=list(CATEGORY_MODELS))
+    parser.add_argument("--data", default=None, help="One training file with a category column (default: Merged_<Category>.csv)")
+    parser.add_argument("--workers", type=int, default=None, help="Categories trained at once (default: all)")
+    parser.add_argument("--n-jobs", type=int, default=None, help="Threads per forest (default: cores / workers)")
+    parser.add_argument("--warm-start", action="store_true", help="Add trees fitted on new rows instead of retraining")
+    parser.add_argument("--new-trees", type=int, default=20, help="Trees added per warm start")
+    args = parser.parse_args()
+
+    train_all(args.categories, args.data, args.workers, args.n_jobs, args.warm_start, args.new_trees)